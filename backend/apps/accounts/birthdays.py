@@ -0,0 +1,66 @@
+"""
+Upcoming birthdays (``BirthdayListView``).
+
+Birthdays are matched in SQL on ``month * 100 + day`` of ``birth_date``
+(``BIRTHDAY_MONTH_DAY``, indexed on User), so only users inside the window
+are loaded. A window crossing New Year becomes two ranges joined by OR.
+
+People born on February 29 celebrate on March 1 in non-leap years: 0229
+falls between 0228 and 0301, so a window ending on February 28 leaves them
+out, and a window starting on March 1 is widened down to 0229.
+"""
+import calendar
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import ExtractDay, ExtractMonth
+from django.utils import timezone
+
+BIRTHDAY_MONTH_DAY = ExtractMonth('birth_date') * 100 + ExtractDay('birth_date')
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+
+def month_day(day):
+    return day.month * 100 + day.day
+
+
+def next_birthday(birth_date, today):
+    """Date of the next birthday on or after ``today``."""
+    for year in (today.year, today.year + 1):
+        if birth_date.month == 2 and birth_date.day == 29 and not calendar.isleap(year):
+            birthday = date(year, 3, 1)
+        else:
+            birthday = birth_date.replace(year=year)
+        if birthday >= today:
+            return birthday
+
+
+def upcoming_birthdays(queryset, today, days=DEFAULT_DAYS):
+    """
+    Users of ``queryset`` with a birthday within ``days`` days from ``today``
+    (inclusive), ordered by the date of the next birthday.
+    """
+    end = today + timedelta(days=days)
+    start_md, end_md = month_day(today), month_day(end)
+    if start_md == 301 and not calendar.isleap(today.year):
+        start_md = 229
+
+    queryset = queryset.filter(birth_date__isnull=False).annotate(birthday_md=BIRTHDAY_MONTH_DAY)
+    if end.year == today.year:
+        queryset = queryset.filter(birthday_md__gte=start_md, birthday_md__lte=end_md)
+    elif end_md < start_md:
+        queryset = queryset.filter(Q(birthday_md__gte=start_md) | Q(birthday_md__lte=end_md))
+    # Otherwise the window covers the whole year
+
+    return queryset.annotate(
+        # Dates after New Year come after the rest of this year
+        next_year=Case(When(birthday_md__lt=start_md, then=Value(1)), default=Value(0)),
+    ).order_by('next_year', 'birthday_md', 'last_name', 'first_name')
+
+
+def seconds_until_midnight():
+    now = timezone.localtime()
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min, tzinfo=now.tzinfo)
+    return max(int((midnight - now).total_seconds()), 1)
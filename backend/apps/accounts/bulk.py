@@ -0,0 +1,139 @@
+"""
+Bulk user lifecycle operations for the HR admin.
+
+Every operation works on chunks of user ids: per chunk one SELECT of the
+users that actually change, one UPDATE (or one INSERT for role links) and
+one ``bulk_create`` of audit entries. Archiving also blacklists all live
+refresh tokens of the archived users and closes their sessions in bulk.
+
+Small batches run inline; larger ones are executed by the
+``accounts.run_bulk_user_operation`` task as a ``core.BackgroundJob`` with
+progress reported after every chunk.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.audit.models import AuditLog
+from core.authentication import invalidate_cached_users
+
+from .models import User, UserSession
+
+OPERATIONS = ('archive', 'restore', 'set_department', 'set_position', 'assign_role')
+# Operations that need ``value`` (the department, position or role id)
+VALUE_OPERATIONS = {'set_department', 'set_position', 'assign_role'}
+
+JOB_KIND = 'accounts.bulk_users'
+
+
+def terminate_user_sessions(user_ids):
+    """Blacklist all live refresh tokens of the users and close their sessions."""
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    token_ids = OutstandingToken.objects.filter(
+        user_id__in=user_ids,
+        expires_at__gt=timezone.now(),
+        blacklistedtoken__isnull=True,
+    ).values_list('id', flat=True)
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+        ignore_conflicts=True,
+    )
+    return UserSession.objects.filter(user_id__in=user_ids, is_active=True).update(is_active=False)
+
+
+def _audit_entries(users, action, actor_id, ip_address, user_agent, **values):
+    return [
+        AuditLog(
+            user_id=actor_id,
+            action=action,
+            entity_type='User',
+            entity_id=user.id,
+            entity_repr=str(user)[:255],
+            ip_address=ip_address,
+            user_agent=user_agent,
+            **{key: value(user) if callable(value) else value for key, value in values.items()},
+        )
+        for user in users
+    ]
+
+
+def _apply_chunk(operation, user_ids, value, actor_id, ip_address, user_agent):
+    users = User.objects.filter(id__in=user_ids).only(
+        'id', 'email', 'first_name', 'last_name', 'patronymic', 'department', 'position',
+    )
+    if operation == 'archive':
+        users = list(users.filter(is_archived=False))
+        changes = {'is_archived': True, 'is_active': False, 'archived_at': timezone.now()}
+        entries = _audit_entries(users, AuditLog.Action.ARCHIVE, actor_id, ip_address, user_agent)
+    elif operation == 'restore':
+        users = list(users.filter(is_archived=True))
+        changes = {'is_archived': False, 'is_active': True, 'archived_at': None}
+        entries = _audit_entries(users, AuditLog.Action.RESTORE, actor_id, ip_address, user_agent)
+    elif operation in ('set_department', 'set_position'):
+        field = operation.removeprefix('set_')
+        users = list(users.exclude(**{f'{field}_id': value}))
+        changes = {f'{field}_id': value}
+        entries = _audit_entries(
+            users, AuditLog.Action.UPDATE, actor_id, ip_address, user_agent,
+            old_values=lambda user: {field: getattr(user, f'{field}_id')},
+            new_values={field: value},
+        )
+    elif operation == 'assign_role':
+        from apps.roles.models import Role
+
+        role = Role.objects.get(pk=value)
+        links = User.roles.through.objects
+        users = list(users.exclude(id__in=links.filter(role_id=value).values('user_id')))
+        links.bulk_create(
+            [User.roles.through(user_id=user.id, role_id=value) for user in users],
+            ignore_conflicts=True,
+        )
+        changes = None
+        entries = [
+            AuditLog(
+                user_id=actor_id,
+                action=AuditLog.Action.UPDATE,
+                entity_type='User',
+                entity_id=user.id,
+                entity_repr=f'Assigned role {role.name} to {user}'[:255],
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            for user in users
+        ]
+    else:
+        raise ValueError(f'Unknown bulk operation: {operation}')
+
+    changed_ids = [user.id for user in users]
+    if changes and changed_ids:
+        User.objects.filter(id__in=changed_ids).update(**changes)
+    AuditLog.objects.bulk_create(entries)
+    if operation == 'archive' and changed_ids:
+        terminate_user_sessions(changed_ids)
+    return len(changed_ids)
+
+
+def apply(operation, user_ids, value=None, actor_id=None, ip_address=None, user_agent='', progress=None):
+    """
+    Run a bulk operation over ``user_ids``. Returns the number of users changed.
+
+    ``progress(processed)`` is called after every chunk with the number of
+    ids handled so far.
+    """
+    from core.models import ModelVersion
+
+    chunk_size = settings.BULK_USER_CHUNK_SIZE
+    changed = 0
+    for start in range(0, len(user_ids), chunk_size):
+        with transaction.atomic():
+            changed += _apply_chunk(
+                operation, user_ids[start:start + chunk_size], value, actor_id, ip_address, user_agent,
+            )
+        if progress:
+            progress(min(start + chunk_size, len(user_ids)))
+    if changed:
+        # Queryset updates bypass the signals in core.signals and accounts.signals
+        ModelVersion.objects.bump('accounts.User')
+        invalidate_cached_users()
+    return changed
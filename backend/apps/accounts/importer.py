@@ -0,0 +1,314 @@
+"""
+Bulk employee import from CSV or XLSX files.
+
+Rows are streamed from the file (``csv`` reader / openpyxl read-only mode)
+and processed in chunks of ``USER_IMPORT_CHUNK_SIZE``. Per chunk there is one
+query for the emails that already exist, one ``bulk_create`` upsert
+(``update_conflicts`` on email) and one ``bulk_create`` of audit entries.
+Departments and positions are matched by name against lookup maps loaded
+once; managers are matched by email after all rows are imported, so a
+manager may appear later in the file than their subordinates.
+
+Only columns present in the file are written to existing users. New users
+get an unusable password and set one via password reset. Rows whose manager
+can't be found are imported without one and listed in the report.
+"""
+import csv
+import io
+import os
+from datetime import date, datetime
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from apps.audit.models import AuditLog
+from core.authentication import invalidate_cached_users
+
+from .models import User
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+JOB_KIND = 'accounts.import_users'
+
+# Column -> accepted header names (compared case-insensitively)
+COLUMNS = {
+    'email': ('email', 'e-mail', 'почта', 'электронная почта'),
+    'last_name': ('last_name', 'фамилия'),
+    'first_name': ('first_name', 'имя'),
+    'patronymic': ('patronymic', 'отчество'),
+    'phone_work': ('phone_work', 'рабочий телефон'),
+    'phone_personal': ('phone_personal', 'личный телефон'),
+    'telegram': ('telegram', 'телеграм'),
+    'birth_date': ('birth_date', 'дата рождения'),
+    'hire_date': ('hire_date', 'дата приема', 'дата приёма'),
+    'department': ('department', 'отдел', 'подразделение'),
+    'position': ('position', 'должность'),
+    'manager': ('manager', 'руководитель'),
+}
+HEADER_COLUMNS = {alias: column for column, aliases in COLUMNS.items() for alias in aliases}
+TEXT_COLUMNS = ('last_name', 'first_name', 'patronymic', 'phone_work', 'phone_personal', 'telegram')
+REQUIRED_COLUMNS = ('last_name', 'first_name')
+DATE_COLUMNS = ('birth_date', 'hire_date')
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y')
+
+
+class UserImportError(Exception):
+    """The file can't be imported at all (format, header)."""
+
+
+def open_rows(file, name):
+    """
+    Yield ``(row number, row dict keyed by column)`` from a CSV or XLSX file.
+
+    Blank rows and unknown columns are skipped. Raises UserImportError for unsupported files
+    or a header without an email column.
+    """
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.xlsx':
+        if not HAS_OPENPYXL:
+            raise UserImportError('XLSX import requires openpyxl.')
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    elif ext == '.csv':
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        rows = csv.reader(text, dialect)
+    else:
+        raise UserImportError('Only .csv and .xlsx files are supported.')
+
+    header = next(rows, None) or ()
+    columns = [HEADER_COLUMNS.get(str(cell or '').strip().lower()) for cell in header]
+    if 'email' not in columns:
+        raise UserImportError('The header must contain an email column.')
+    # Row 1 is the header
+    for line, values in enumerate(rows, start=2):
+        if any(value not in (None, '') for value in values):
+            yield line, {column: value for column, value in zip(columns, values) if column}
+
+
+def count_rows(file, name):
+    """Estimate the number of data rows (for progress), then rewind the file."""
+    if os.path.splitext(name)[1].lower() == '.xlsx' and HAS_OPENPYXL:
+        total = openpyxl.load_workbook(file, read_only=True).active.max_row or 1
+    else:
+        total = sum(chunk.count(b'\n') for chunk in iter(lambda: file.read(1 << 16), b'')) or 1
+    file.seek(0)
+    return max(total - 1, 0)
+
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError
+
+
+def name_lookup(model):
+    """``{casefolded name: id}``; names used more than once map to None."""
+    lookup = {}
+    for pk, name in model.objects.values_list('id', 'name'):
+        key = name.strip().casefold()
+        lookup[key] = None if key in lookup else pk
+    return lookup
+
+
+class UserImporter:
+    """
+    Validate and upsert employee rows chunk by chunk.
+
+    ``run(rows)`` takes ``(row number, row)`` pairs from ``open_rows`` and
+    returns a report: counts of created, updated and failed rows and per-row
+    errors (``{'row': line, 'email': ..., 'errors': {column: [...]}}``).
+    With ``dry_run`` rows are only validated.
+    """
+
+    def __init__(self, update_existing=True, dry_run=False, actor_id=None,
+                 ip_address=None, user_agent='', progress=None):
+        from apps.organization.models import Department, Position
+
+        self.update_existing = update_existing
+        self.dry_run = dry_run
+        self.actor_id = actor_id
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+        self.progress = progress
+        self.lookups = {'department': name_lookup(Department), 'position': name_lookup(Position)}
+        self.max_lengths = {column: User._meta.get_field(column).max_length for column in TEXT_COLUMNS}
+        # One unusable password for all new users - they set theirs via reset
+        self.password = make_password(None)
+        self.seen = {}
+        self.managers = []
+        self.report = {'total': 0, 'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+
+    def run(self, rows):
+        chunk = []
+        for line, row in rows:
+            chunk.append((line, row))
+            if len(chunk) >= settings.USER_IMPORT_CHUNK_SIZE:
+                self.process_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.process_chunk(chunk)
+        self.link_managers()
+        if not self.dry_run and self.report['created'] + self.report['updated']:
+            from core.models import ModelVersion
+
+            # bulk_create bypasses the signals in core.signals and accounts.signals
+            ModelVersion.objects.bump('accounts.User')
+            invalidate_cached_users()
+        return self.report
+
+    def add_error(self, line, email, errors):
+        self.report['failed'] += 1
+        self.report['errors'].append({'row': line, 'email': email, 'errors': errors})
+
+    def clean_row(self, line, row, existing):
+        """Return ``(email, values)`` or record the row's errors and return None."""
+        errors = {}
+        email = User.objects.normalize_email(str(row.get('email') or '').strip())
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = ['Enter a valid email address.']
+        else:
+            if email.lower() in self.seen:
+                errors['email'] = [f'Duplicate of row {self.seen[email.lower()]}.']
+            elif email in existing and not self.update_existing:
+                errors['email'] = ['User already exists.']
+
+        values = {}
+        for column, raw in row.items():
+            if column == 'email':
+                continue
+            value = raw.strip() if isinstance(raw, str) else raw
+            if column in TEXT_COLUMNS:
+                if isinstance(value, float) and value.is_integer():
+                    # Spreadsheet cells holding phone numbers
+                    value = int(value)
+                value = '' if value is None else str(value)
+                if len(value) > self.max_lengths[column]:
+                    errors[column] = [f'At most {self.max_lengths[column]} characters.']
+            elif column in DATE_COLUMNS:
+                if value in (None, ''):
+                    value = None
+                else:
+                    try:
+                        value = parse_date(value)
+                    except (TypeError, ValueError):
+                        errors[column] = ['Use YYYY-MM-DD or DD.MM.YYYY.']
+            elif column in self.lookups:
+                if value in (None, ''):
+                    value = None
+                else:
+                    key = str(value).casefold()
+                    if key not in self.lookups[column]:
+                        errors[column] = [f'Unknown {column} "{value}".']
+                    elif self.lookups[column][key] is None:
+                        errors[column] = [f'Ambiguous {column} "{value}".']
+                    value = self.lookups[column].get(key)
+            elif column == 'manager':
+                value = User.objects.normalize_email(str(value or '').strip())
+            values[column] = value
+
+        for column in REQUIRED_COLUMNS:
+            if (column in values or email not in existing) and not values.get(column):
+                errors[column] = ['This field is required.']
+
+        if errors:
+            self.add_error(line, email, errors)
+            return None
+        self.seen[email.lower()] = line
+        return email, values
+
+    def process_chunk(self, chunk):
+        emails = [User.objects.normalize_email(str(row.get('email') or '').strip()) for _, row in chunk]
+        existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        users, entries, columns = [], [], set()
+        for line, row in chunk:
+            self.report['total'] += 1
+            cleaned = self.clean_row(line, row, existing)
+            if cleaned is None:
+                continue
+            email, values = cleaned
+            manager = values.pop('manager', None)
+            if manager:
+                self.managers.append((line, email, manager))
+            columns.update(values)
+            created = email not in existing
+            self.report['created' if created else 'updated'] += 1
+            fields = {f'{column}_id' if column in self.lookups else column: value for column, value in values.items()}
+            users.append(User(email=email, password=self.password, **fields))
+            entries.append(AuditLog(
+                user_id=self.actor_id,
+                action=AuditLog.Action.CREATE if created else AuditLog.Action.UPDATE,
+                entity_type='User',
+                entity_repr=str(users[-1])[:255],
+                new_values={
+                    'email': email,
+                    **{key: value.isoformat() if isinstance(value, date) else value for key, value in values.items()},
+                },
+                ip_address=self.ip_address,
+                user_agent=self.user_agent,
+            ))
+
+        if users and not self.dry_run:
+            with transaction.atomic():
+                if columns:
+                    User.objects.bulk_create(
+                        users, update_conflicts=True, unique_fields=['email'], update_fields=sorted(columns),
+                    )
+                else:
+                    User.objects.bulk_create(users, ignore_conflicts=True)
+                ids = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'id'))
+                for user, entry in zip(users, entries):
+                    entry.entity_id = ids.get(user.email)
+                AuditLog.objects.bulk_create(entries)
+        if self.progress:
+            self.progress(self.report['total'])
+
+    def link_managers(self):
+        """Set managers by email once all rows are in."""
+        if not self.managers:
+            return
+        chunk_size = settings.USER_IMPORT_CHUNK_SIZE
+        for start in range(0, len(self.managers), chunk_size):
+            links = self.managers[start:start + chunk_size]
+            ids = dict(User.objects.filter(
+                email__in={email for _, email, _ in links} | {manager for _, _, manager in links},
+            ).values_list('email', 'id'))
+            subordinates = {}
+            for line, email, manager in links:
+                if manager not in ids and manager.lower() not in self.seen:
+                    self.report['errors'].append({'row': line, 'email': email, 'errors': {
+                        'manager': [f'Unknown manager "{manager}".'],
+                    }})
+                elif email in ids and manager in ids and manager != email:
+                    subordinates.setdefault(ids[manager], []).append(ids[email])
+            if not self.dry_run:
+                # One UPDATE per manager - teams are much fewer than people
+                for manager_id, user_ids in subordinates.items():
+                    User.objects.filter(id__in=user_ids).update(manager_id=manager_id)
+
+
+def import_file(file, name, **options):
+    """Import an open binary file; ``options`` are passed to UserImporter."""
+    return UserImporter(**options).run(open_rows(file, name))
@@ -0,0 +1,49 @@
+"""
+Management command importing employees from a CSV or XLSX file.
+
+The header row names the columns (see apps.accounts.importer.COLUMNS, e.g.
+``email;last_name;first_name;department;position;manager`` or the Russian
+``Почта;Фамилия;Имя;Отдел;Должность;Руководитель``). Existing users, matched
+by email, are updated with the columns present in the file.
+
+Usage:
+    python manage.py import_users employees.xlsx --dry-run
+    python manage.py import_users employees.csv
+    python manage.py import_users employees.csv --no-update
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.importer import UserImportError, import_file
+
+
+class Command(BaseCommand):
+    help = 'Create or update employees from a CSV/XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv or .xlsx file')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate rows')
+        parser.add_argument('--no-update', action='store_true', help='Report existing users as errors')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as file:
+                report = import_file(
+                    file, options['path'],
+                    dry_run=options['dry_run'],
+                    update_existing=not options['no_update'],
+                    progress=lambda processed: self.stdout.write(f'  {processed} rows'),
+                )
+        except (OSError, UserImportError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            details = '; '.join(f'{column}: {" ".join(messages)}' for column, messages in error['errors'].items())
+            self.stdout.write(self.style.WARNING(f'Row {error["row"]} ({error["email"]}): {details}'))
+        prefix = 'Validated (dry run)' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {report["total"]} rows in {time.perf_counter() - start:.2f}s: '
+            f'{report["created"]} created, {report["updated"]} updated, {report["failed"]} failed'
+        ))
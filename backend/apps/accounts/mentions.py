@@ -0,0 +1,102 @@
+"""
+@-mention resolution for comments, idea comments and wiki pages.
+
+Mentions are ``@handle`` (the local part of the user's email) or
+``@"Full Name"`` (``Фамилия Имя [Отчество]`` as in ``get_full_name()``, or
+``Имя Фамилия``). All mentions in a text are resolved with one query that
+matches the functional indexes on ``User`` (see ``User.Meta.indexes``).
+
+Names are matched on ``lower(last_name), lower(first_name)`` rather than on
+one concatenated string: ``CONCAT()`` is not IMMUTABLE on PostgreSQL and
+can't be indexed.
+"""
+import re
+
+from django.db.models import Q, Value
+from django.db.models.functions import Left, Lower, StrIndex
+
+MENTION_PATTERN = re.compile(r'@(\w+)|@"([^"]+)"')
+
+# Index expressions; annotations must use the same expressions to hit the indexes
+MENTION_HANDLE = Lower(Left('email', StrIndex('email', Value('@')) - 1))
+MENTION_LAST_NAME = Lower('last_name')
+MENTION_FIRST_NAME = Lower('first_name')
+
+
+def normalize_name(name):
+    return ' '.join(name.split()).lower()
+
+
+def extract_mentions(text):
+    """
+    Return ``(handles, names)`` mentioned in text, lowercased.
+
+    ``names`` maps each normalized ``"last first"`` candidate to the set of
+    patronymics given with it (``''`` when none was given).
+    """
+    handles = set()
+    names = {}
+    for handle, full_name in MENTION_PATTERN.findall(text or ''):
+        if handle:
+            handles.add(handle.lower())
+            continue
+        parts = normalize_name(full_name).split(' ')
+        if len(parts) < 2:
+            continue
+        patronymic = ' '.join(parts[2:])
+        names.setdefault(f'{parts[0]} {parts[1]}', set()).add(patronymic)
+        if not patronymic:
+            # "Имя Фамилия" order
+            names.setdefault(f'{parts[1]} {parts[0]}', set()).add('')
+    return handles, names
+
+
+def resolve_mentions(text, previous_text=''):
+    """
+    Return the active users mentioned in text, in one query.
+
+    A handle matches the email local part; a quoted name matches the first
+    user (by id) with that last and first name and, if given, patronymic.
+    Mentions already present in ``previous_text`` (an edited document's old
+    version) are skipped.
+    """
+    from apps.accounts.models import User
+
+    handles, names = extract_mentions(text)
+    if previous_text:
+        old_handles, old_names = extract_mentions(previous_text)
+        handles -= old_handles
+        names = {
+            name: patronymics - old_names.get(name, set())
+            for name, patronymics in names.items()
+            if patronymics - old_names.get(name, set())
+        }
+    if not handles and not names:
+        return []
+
+    condition = Q()
+    if handles:
+        condition |= Q(mention_handle__in=handles)
+    for name in names:
+        last_name, first_name = name.split(' ', 1)
+        condition |= Q(mention_last_name=last_name, mention_first_name=first_name)
+
+    candidates = User.objects.annotate(
+        mention_handle=MENTION_HANDLE,
+        mention_last_name=MENTION_LAST_NAME,
+        mention_first_name=MENTION_FIRST_NAME,
+    ).filter(condition, is_active=True).order_by('pk')
+
+    users = {}
+    matched = set()
+    for user in candidates:
+        if user.email.split('@')[0].lower() in handles:
+            users[user.pk] = user
+        name = normalize_name(f'{user.last_name} {user.first_name}')
+        for patronymic in names.get(name, ()):
+            if (name, patronymic) in matched:
+                continue
+            if not patronymic or normalize_name(user.patronymic or '') == patronymic:
+                users[user.pk] = user
+                matched.add((name, patronymic))
+    return list(users.values())
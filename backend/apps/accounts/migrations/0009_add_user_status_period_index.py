@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_add_user_birthday_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userstatus',
+            index=models.Index(fields=['user', 'start_date', 'end_date'], name='user_status_period_idx'),
+        ),
+    ]
@@ -1,11 +1,16 @@
 """
 User and UserStatus models.
 """
+from collections import namedtuple
+from functools import lru_cache
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from core.utils import avatar_upload_path
+from .birthdays import BIRTHDAY_MONTH_DAY
+from .mentions import MENTION_FIRST_NAME, MENTION_HANDLE, MENTION_LAST_NAME
 
 
 class UserManager(BaseUserManager):
@@ -120,6 +125,16 @@ class User(AbstractUser):
         verbose_name = _('user')
         verbose_name_plural = _('users')
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # @-mention lookups (apps.accounts.mentions.resolve_mentions)
+            models.Index(MENTION_HANDLE, name='user_mention_handle_idx'),
+            models.Index(MENTION_LAST_NAME, MENTION_FIRST_NAME, name='user_mention_name_idx'),
+            # Upcoming birthdays (apps.accounts.birthdays.upcoming_birthdays)
+            models.Index(
+                BIRTHDAY_MONTH_DAY, name='user_birthday_idx',
+                condition=models.Q(is_active=True, is_archived=False),
+            ),
+        ]
 
     def __str__(self):
         return self.get_full_name() or self.email
@@ -135,10 +150,22 @@ class User(AbstractUser):
         """Return the short name (first name + last initial)."""
         return f"{self.first_name} {self.last_name[0]}." if self.last_name else self.first_name
 
+    def load_permissions(self):
+        """
+        Load the codenames granted by the user's roles onto this instance, so
+        permission checks on it need no queries (cached auth snapshots).
+        """
+        from apps.roles.models import Permission
+        self._permission_codenames = frozenset(
+            Permission.objects.filter(roles__users=self).values_list('codename', flat=True)
+        )
+
     def has_permission(self, permission_codename):
         """Check if user has a specific permission through their roles."""
         if self.is_superuser:
             return True
+        if hasattr(self, '_permission_codenames'):
+            return permission_codename in self._permission_codenames
         return self.roles.filter(
             permissions__codename=permission_codename
         ).exists()
@@ -147,6 +174,8 @@ class User(AbstractUser):
         """Check if user has any of the specified permissions."""
         if self.is_superuser:
             return True
+        if hasattr(self, '_permission_codenames'):
+            return not self._permission_codenames.isdisjoint(permission_codenames)
         return self.roles.filter(
             permissions__codename__in=permission_codenames
         ).exists()
@@ -154,13 +183,10 @@ class User(AbstractUser):
     @property
     def current_status(self):
         """Get current active status (vacation, sick leave, etc.)."""
-        from django.utils import timezone
-        today = timezone.now().date()
-        return self.statuses.filter(
-            start_date__lte=today
-        ).filter(
-            models.Q(end_date__gte=today) | models.Q(end_date__isnull=True)
-        ).first()
+        if hasattr(self, 'current_statuses'):
+            # Prefetched with UserStatus.objects.prefetch_current()
+            return self.current_statuses[0] if self.current_statuses else None
+        return self.statuses.current().first()
 
     @property
     def role(self):
@@ -173,6 +199,25 @@ class User(AbstractUser):
         return self.roles.first()
 
 
+class UserStatusManager(models.Manager):
+
+    def current(self, day=None):
+        """Statuses in effect on ``day`` (default: today)."""
+        from django.utils import timezone
+        day = day or timezone.localdate()
+        return self.filter(start_date__lte=day).filter(
+            models.Q(end_date__gte=day) | models.Q(end_date__isnull=True)
+        )
+
+    def prefetch_current(self, lookup='statuses', day=None):
+        """
+        Prefetch of current statuses for a user queryset, read by
+        ``User.current_status`` - one query for the whole page. Pass
+        ``lookup`` to prefetch through a relation, e.g. ``'viewed_user__statuses'``.
+        """
+        return models.Prefetch(lookup, queryset=self.current(day), to_attr='current_statuses')
+
+
 class UserStatus(models.Model):
     """
     User status model for tracking vacation, sick leave, etc.
@@ -207,10 +252,15 @@ class UserStatus(models.Model):
     )
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
 
+    objects = UserStatusManager()
+
     class Meta:
         verbose_name = _('user status')
         verbose_name_plural = _('user statuses')
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['user', 'start_date', 'end_date'], name='user_status_period_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.get_status_display()}"
@@ -313,6 +363,36 @@ class TwoFactorSettings(models.Model):
         return len(self.backup_codes)
 
 
+Device = namedtuple('Device', ['device_type', 'device_name', 'browser', 'os'])
+
+
+@lru_cache(maxsize=512)
+def parse_device(user_agent_string):
+    """
+    Device info of a User-Agent string for UserSession.
+
+    Parsing runs dozens of regexes; employees log in from a handful of
+    browsers, so results are kept in a per-process LRU cache.
+    """
+    from user_agents import parse
+
+    user_agent = parse(user_agent_string)
+    if user_agent.is_mobile:
+        device_type = 'mobile'
+    elif user_agent.is_tablet:
+        device_type = 'tablet'
+    elif user_agent.is_pc:
+        device_type = 'desktop'
+    else:
+        device_type = 'other'
+    return Device(
+        device_type=device_type,
+        device_name=user_agent.device.family or '',
+        browser=f"{user_agent.browser.family} {user_agent.browser.version_string}".strip(),
+        os=f"{user_agent.os.family} {user_agent.os.version_string}".strip(),
+    )
+
+
 class UserSession(models.Model):
     """
     User session tracking for security management.
@@ -365,10 +445,7 @@ class UserSession(models.Model):
             request: HTTP request
             access_jti: Access token JTI (for session detection)
         """
-        from user_agents import parse
-
         user_agent_string = request.META.get('HTTP_USER_AGENT', '')
-        user_agent = parse(user_agent_string)
 
         # Get IP address
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -377,28 +454,23 @@ class UserSession(models.Model):
         else:
             ip_address = request.META.get('REMOTE_ADDR')
 
-        # Determine device type
-        if user_agent.is_mobile:
-            device_type = 'mobile'
-        elif user_agent.is_tablet:
-            device_type = 'tablet'
-        elif user_agent.is_pc:
-            device_type = 'desktop'
-        else:
-            device_type = 'other'
-
         return cls.objects.create(
             user=user,
             token_jti=token_jti,
             access_jti=access_jti,
-            device_type=device_type,
-            device_name=user_agent.device.family or '',
-            browser=f"{user_agent.browser.family} {user_agent.browser.version_string}".strip(),
-            os=f"{user_agent.os.family} {user_agent.os.version_string}".strip(),
             ip_address=ip_address,
-            user_agent=user_agent_string
+            user_agent=user_agent_string,
+            **parse_device(user_agent_string)._asdict()
         )
 
+    def matches_token(self, token):
+        """Whether the access ``token`` (``request.auth``) belongs to this session."""
+        from core.authentication import SESSION_CLAIM
+
+        if token is None:
+            return False
+        return token.get(SESSION_CLAIM) == self.token_jti or token.get('jti') == self.access_jti
+
     def terminate(self):
         """Terminate this session by blacklisting the token."""
         from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
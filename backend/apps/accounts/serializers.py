@@ -2,12 +2,17 @@
 Serializers for accounts app.
 """
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenObtainSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
 from apps.organization.serializers import DepartmentSerializer, PositionSerializer
+from core.authentication import SESSION_CLAIM
+from core.fields import SrcsetField
+from .bulk import OPERATIONS, VALUE_OPERATIONS
 from .models import User, UserStatus, TwoFactorSettings, UserSession
 
 
@@ -21,15 +26,49 @@ class RelativeImageField(serializers.ImageField):
         return value.url
 
 
+# Avatars are never displayed wider than the profile header
+AVATAR_MAX_WIDTH = 400
+
+
 # =============================================================================
 # Auth Serializers
 # =============================================================================
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    """Custom token serializer that includes user data."""
+    """
+    Custom token serializer that includes user data.
+
+    Credentials are checked once. Users with 2FA enabled get
+    ``requires_2fa`` instead of tokens; otherwise the issued tokens are kept
+    on ``refresh_token`` / ``access_token`` for the session record.
+    """
+    refresh_token = None
+    access_token = None
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Session key, carried over to access and rotated refresh tokens
+        token[SESSION_CLAIM] = token['jti']
+        return token
 
     def validate(self, attrs):
-        data = super().validate(attrs)
+        # Authenticate only (sets self.user); tokens are issued below
+        data = TokenObtainSerializer.validate(self, attrs)
+
+        if TwoFactorSettings.objects.filter(user=self.user, is_enabled=True).exists():
+            return {
+                'requires_2fa': True,
+                'user_id': self.user.id,
+                'message': 'Two-factor authentication required.'
+            }
+
+        self.refresh_token = self.get_token(self.user)
+        self.access_token = self.refresh_token.access_token
+        data['refresh'] = str(self.refresh_token)
+        data['access'] = str(self.access_token)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
 
         # Add user info to response (relative URLs work with frontend proxy)
         data['user'] = UserBasicSerializer(self.user).data
@@ -133,17 +172,19 @@ class UserBasicSerializer(serializers.ModelSerializer):
     """Basic user serializer for nested representations."""
     full_name = serializers.CharField(source='get_full_name', read_only=True)
     avatar = RelativeImageField(read_only=True)
+    avatar_srcset = SrcsetField(source='avatar', max_width=AVATAR_MAX_WIDTH)
 
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'patronymic',
-                  'full_name', 'avatar', 'is_superuser', 'has_completed_onboarding']
+                  'full_name', 'avatar', 'avatar_srcset', 'is_superuser', 'has_completed_onboarding']
 
 
 class UserListSerializer(serializers.ModelSerializer):
     """Serializer for user list view."""
     full_name = serializers.CharField(source='get_full_name', read_only=True)
     avatar = RelativeImageField(read_only=True)
+    avatar_srcset = SrcsetField(source='avatar', max_width=AVATAR_MAX_WIDTH)
     department = DepartmentSerializer(read_only=True)
     position = PositionSerializer(read_only=True)
     current_status = serializers.SerializerMethodField()
@@ -151,7 +192,7 @@ class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'patronymic',
-                  'full_name', 'avatar', 'department', 'position', 'current_status',
+                  'full_name', 'avatar', 'avatar_srcset', 'department', 'position', 'current_status',
                   'hire_date']
 
     def get_current_status(self, obj):
@@ -267,6 +308,30 @@ class UserAdminUpdateSerializer(serializers.ModelSerializer):
                   'manager', 'is_active']
 
 
+class BulkUserOperationSerializer(serializers.Serializer):
+    """Serializer for bulk user operations (HR/Admin)."""
+    operation = serializers.ChoiceField(choices=OPERATIONS)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    value = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        from apps.organization.models import Department, Position
+        from apps.roles.models import Role
+
+        # Keep order, drop duplicates
+        attrs['ids'] = list(dict.fromkeys(attrs['ids']))
+        operation = attrs['operation']
+        if operation not in VALUE_OPERATIONS:
+            attrs.pop('value', None)
+            return attrs
+        if 'value' not in attrs:
+            raise serializers.ValidationError({'value': _('This operation requires a value.')})
+        model = {'set_department': Department, 'set_position': Position, 'assign_role': Role}[operation]
+        if not model.objects.filter(pk=attrs['value']).exists():
+            raise serializers.ValidationError({'value': _('Object not found.')})
+        return attrs
+
+
 # =============================================================================
 # UserStatus Serializers
 # =============================================================================
@@ -307,10 +372,11 @@ class BirthdaySerializer(serializers.ModelSerializer):
     full_name = serializers.CharField(source='get_full_name', read_only=True)
     avatar = RelativeImageField(read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
+    days_until_birthday = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
-        fields = ['id', 'full_name', 'avatar', 'birth_date', 'department_name']
+        fields = ['id', 'full_name', 'avatar', 'birth_date', 'department_name', 'days_until_birthday']
 
 
 # =============================================================================
@@ -394,6 +460,4 @@ class UserSessionSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request:
             return False
-        current_jti = getattr(request, 'current_token_jti', None)
-        # Compare with access_jti (from access token in request header)
-        return obj.access_jti == current_jti
+        return obj.matches_token(request.auth)
@@ -1,13 +1,36 @@
 """
 Signals for accounts app.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from apps.roles.models import Permission, Role
+from core.authentication import invalidate_cached_users
+from .models import User
 
-# Signals will be implemented when models are created
-# Example:
-# @receiver(post_save, sender='accounts.User')
-# def create_notification_settings(sender, instance, created, **kwargs):
-#     if created:
-#         NotificationSettings.objects.create(user=instance)
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """Drop the cached auth snapshot (core.authentication) of a changed user."""
+    invalidate_cached_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_role_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """Role assignments changed - drop the snapshots of the affected users."""
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # role.users.add(...); pk_set is None after clear()
+        invalidate_cached_users(pk_set)
+    else:
+        invalidate_cached_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+@receiver([post_save, post_delete], sender=Role)
+@receiver([post_save, post_delete], sender=Permission)
+def invalidate_all_snapshots(sender, **kwargs):
+    """Role permissions changed - drop every cached snapshot."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidate_cached_users()
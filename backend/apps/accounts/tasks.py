@@ -0,0 +1,99 @@
+"""
+Celery tasks for accounts.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='accounts.run_bulk_user_operation')
+def run_bulk_user_operation(job_id: int):
+    """Execute a bulk user operation queued as a BackgroundJob by AdminUserViewSet."""
+    from apps.accounts.bulk import apply
+    from core.models import BackgroundJob
+
+    job = BackgroundJob.objects.get(pk=job_id)
+    result = job.run(lambda: {'count': apply(**job.params, progress=job.report_progress)})
+    logger.info(f"Bulk user operation {job.params['operation']} (job #{job_id}): {result['count']} users")
+    return result['count']
+
+
+@shared_task(name='accounts.import_users')
+def import_users(job_id: int):
+    """Import employees from a file uploaded to AdminUserViewSet.import_users."""
+    from django.core.files.storage import default_storage
+
+    from apps.accounts.importer import count_rows, import_file
+    from core.models import BackgroundJob
+
+    job = BackgroundJob.objects.get(pk=job_id)
+    params = dict(job.params)
+    path, name = params.pop('path'), params.pop('name')
+    try:
+        with default_storage.open(path, 'rb') as file:
+            job.total = count_rows(file, name)
+            job.save(update_fields=['total'])
+            report = job.run(lambda: import_file(file, name, progress=job.report_progress, **params))
+    finally:
+        default_storage.delete(path)
+    logger.info(
+        f"User import (job #{job_id}): {report['created']} created, "
+        f"{report['updated']} updated, {report['failed']} failed"
+    )
+    return report['failed']
+
+
+@shared_task(name='accounts.flush_expired_tokens')
+def flush_expired_tokens():
+    """
+    Delete expired refresh tokens from the simplejwt blacklist tables.
+    Runs daily. Blacklist entries go with their tokens.
+    """
+    import time
+
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    from core.maintenance import delete_in_chunks, report
+
+    started = time.monotonic()
+    deleted = delete_in_chunks(OutstandingToken.objects.filter(expires_at__lte=timezone.now()))
+    result = report(started, deleted=deleted)
+    logger.info(f"Flushed expired tokens: {deleted} rows in {result['seconds']}s")
+    return result
+
+
+@shared_task(name='accounts.expire_sessions')
+def expire_sessions():
+    """
+    Deactivate sessions whose refresh token has expired and delete inactive
+    sessions older than SESSION_RETENTION_DAYS. Runs daily.
+
+    Refresh tokens are rotated on use, so a session is alive as long as it
+    was active within REFRESH_TOKEN_LIFETIME.
+    """
+    import time
+    from datetime import timedelta
+
+    from django.conf import settings
+    from django.utils import timezone
+
+    from apps.accounts.models import UserSession
+    from core.maintenance import delete_in_chunks, report, update_in_chunks
+
+    started = time.monotonic()
+    now = timezone.now()
+    deactivated = update_in_chunks(
+        UserSession.objects.filter(
+            is_active=True, last_activity__lt=now - settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'],
+        ),
+        is_active=False,
+    )
+    deleted = delete_in_chunks(UserSession.objects.filter(
+        is_active=False, last_activity__lt=now - timedelta(days=settings.SESSION_RETENTION_DAYS),
+    ))
+    result = report(started, deactivated=deactivated, deleted=deleted)
+    logger.info(f"Expired sessions: {deactivated} deactivated, {deleted} deleted in {result['seconds']}s")
+    return result
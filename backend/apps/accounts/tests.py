@@ -153,6 +153,24 @@ class TestUserStatus:
         """Test current_status returns None when no active status."""
         assert user.current_status is None
 
+    def test_prefetched_current_status(self, user, django_assert_num_queries):
+        """Test current statuses are prefetched for a whole queryset in one query."""
+        from apps.accounts.models import UserStatus
+        other = User.objects.create_user(email='other@example.com', password='x', first_name='A', last_name='B')
+        UserStatus.objects.create(
+            user=user,
+            status=UserStatus.StatusType.VACATION,
+            start_date=date.today() - timedelta(days=10),
+            end_date=date.today() - timedelta(days=1),
+        )
+        UserStatus.objects.create(
+            user=user, status=UserStatus.StatusType.REMOTE, start_date=date.today(),
+        )
+        with django_assert_num_queries(2):
+            users = {u.email: u for u in User.objects.prefetch_related(UserStatus.objects.prefetch_current())}
+            assert users[user.email].current_status.status == UserStatus.StatusType.REMOTE
+            assert users[other.email].current_status is None
+
 
 @pytest.mark.django_db
 class TestAuthAPI:
@@ -184,6 +202,37 @@ class TestAuthAPI:
         })
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_login_checks_password_once(self, api_client, user, user_data, monkeypatch):
+        """Test login verifies the password once and records the session device."""
+        from apps.accounts.models import UserSession
+        calls = []
+        check_password = User.check_password
+        monkeypatch.setattr(User, 'check_password', lambda self, raw: calls.append(raw) or check_password(self, raw))
+
+        response = api_client.post('/api/v1/auth/login/', {
+            'email': user_data['email'],
+            'password': user_data['password'],
+        }, HTTP_USER_AGENT='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                           '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(calls) == 1
+        session = UserSession.objects.get(user=user)
+        assert session.device_type == 'desktop'
+        assert session.browser.startswith('Chrome')
+
+    def test_login_requires_2fa(self, api_client, user, user_data):
+        """Test users with 2FA get no tokens from the password step."""
+        from apps.accounts.models import TwoFactorSettings
+        TwoFactorSettings.objects.create(user=user, is_enabled=True)
+        response = api_client.post('/api/v1/auth/login/', {
+            'email': user_data['email'],
+            'password': user_data['password'],
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['requires_2fa'] is True
+        assert response.data['user_id'] == user.id
+        assert 'access' not in response.data
+
     def test_token_refresh(self, api_client, user, user_data):
         """Test token refresh."""
         # First login
@@ -275,3 +324,413 @@ class TestPasswordChange:
             'new_password_confirm': 'newpassword123',
         })
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBulkUserOperations:
+    """Tests for set-based bulk user operations and background jobs."""
+
+    @pytest.fixture
+    def admin_client(self, api_client, admin_user):
+        api_client.force_authenticate(user=admin_user)
+        return api_client
+
+    @pytest.fixture
+    def employees(self):
+        return [
+            User.objects.create_user(email=f'user{index}@example.com', password='testpass123',
+                                     first_name='User', last_name=f'N{index}')
+            for index in range(5)
+        ]
+
+    def test_bulk_archive(self, admin_client, admin_user, employees, django_assert_max_num_queries):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from apps.accounts.models import UserSession
+        from apps.audit.models import AuditLog
+
+        refresh = RefreshToken.for_user(employees[0])
+        UserSession.objects.create(user=employees[0], token_jti=refresh['jti'])
+        ids = [user.id for user in employees[:3]]
+
+        with django_assert_max_num_queries(14):
+            response = admin_client.post('/api/v1/users/admin/bulk-archive/', {'ids': ids + ids}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert set(User.objects.filter(is_archived=True, is_active=False).values_list('id', flat=True)) == set(ids)
+        assert AuditLog.objects.filter(action=AuditLog.Action.ARCHIVE, user=admin_user).count() == 3
+        assert BlacklistedToken.objects.filter(token__jti=refresh['jti']).exists()
+        assert not UserSession.objects.get(user=employees[0]).is_active
+
+        # Already archived users are skipped
+        response = admin_client.post('/api/v1/users/admin/bulk-archive/', {'ids': ids}, format='json')
+        assert response.data['count'] == 0
+
+        response = admin_client.post('/api/v1/users/admin/bulk-restore/', {'ids': ids[:2]}, format='json')
+        assert response.data['count'] == 2
+        assert User.objects.filter(is_archived=True).count() == 1
+
+    def test_bulk_department_and_role(self, admin_client, employees):
+        from apps.audit.models import AuditLog
+        from apps.organization.models import Department
+        from apps.roles.models import Role
+
+        department = Department.objects.create(name='IT')
+        employees[0].department = department
+        employees[0].save()
+        ids = [user.id for user in employees]
+
+        response = admin_client.post('/api/v1/users/admin/bulk/', {
+            'operation': 'set_department', 'ids': ids, 'value': department.id,
+        }, format='json')
+        assert response.data['count'] == 4
+        assert User.objects.filter(department=department).count() == 5
+        entry = AuditLog.objects.filter(action=AuditLog.Action.UPDATE, entity_id=employees[1].id).get()
+        assert entry.old_values == {'department': None}
+        assert entry.new_values == {'department': department.id}
+
+        role = Role.objects.create(name='Editors')
+        employees[0].roles.add(role)
+        response = admin_client.post('/api/v1/users/admin/bulk/', {
+            'operation': 'assign_role', 'ids': ids, 'value': role.id,
+        }, format='json')
+        assert response.data['count'] == 4
+        assert role.users.count() == 5
+
+        response = admin_client.post('/api/v1/users/admin/bulk/', {'operation': 'assign_role', 'ids': ids}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_assign_role_requires_roles_manage(self, api_client, employees):
+        """HR access without roles.manage can't grant roles in bulk."""
+        from apps.roles.models import Permission, Role
+
+        hr_role = Role.objects.create(name='HR')
+        hr_role.permissions.add(Permission.objects.get(codename='users.create'))
+        hr = employees[0]
+        hr.roles.add(hr_role)
+        admin_role = Role.objects.create(name='Admins')
+        admin_role.permissions.add(Permission.objects.get(codename='roles.manage'))
+
+        api_client.force_authenticate(user=hr)
+        response = api_client.post('/api/v1/users/admin/bulk/', {
+            'operation': 'assign_role', 'ids': [hr.id], 'value': admin_role.id,
+        }, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not hr.roles.filter(pk=admin_role.pk).exists()
+
+        # Other operations stay available to HR
+        response = api_client.post('/api/v1/users/admin/bulk/', {
+            'operation': 'archive', 'ids': [employees[1].id],
+        }, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_large_batch_runs_as_job(self, admin_client, employees, settings, django_capture_on_commit_callbacks):
+        settings.BULK_USER_SYNC_LIMIT = 2
+        settings.BULK_USER_CHUNK_SIZE = 2
+        ids = [user.id for user in employees]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post('/api/v1/users/admin/bulk-archive/', {'ids': ids}, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['job']['total'] == 5
+
+        response = admin_client.get(f'/api/v1/jobs/{response.data["job"]["id"]}/')
+        assert response.data['status'] == 'succeeded'
+        assert response.data['progress'] == 100
+        assert response.data['result'] == {'count': 5}
+        assert User.objects.filter(is_archived=True).count() == 5
+
+
+@pytest.mark.django_db
+class TestUserImport:
+    """Tests for the CSV/XLSX employee import."""
+
+    CSV = (
+        'Почта;Фамилия;Имя;Отдел;Должность;Дата рождения;Руководитель\n'
+        'boss@example.com;Boss;Big;IT;Lead;01.02.1980;\n'
+        'dev@example.com;Dev;Junior;it;;1995-03-04;boss@example.com\n'
+        '\n'
+        'broken;;Nobody;Sales;;31.02.1990;\n'
+        'test@example.com;Petrov;Ivan;IT;;;\n'
+        'dev@example.com;Dup;Dup;;;;\n'
+    )
+
+    @pytest.fixture
+    def lookups(self):
+        from apps.organization.models import Department, Position
+
+        return Department.objects.create(name='IT'), Position.objects.create(name='Lead')
+
+    def test_import_report(self, user, lookups, django_assert_max_num_queries):
+        from io import BytesIO
+        from apps.accounts.importer import import_file
+        from apps.audit.models import AuditLog
+
+        department, position = lookups
+        with django_assert_max_num_queries(12):
+            report = import_file(BytesIO(self.CSV.encode()), 'staff.csv')
+
+        assert (report['total'], report['created'], report['updated'], report['failed']) == (5, 2, 1, 2)
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        assert set(errors) == {5, 7}
+        assert set(errors[5]) == {'email', 'last_name', 'department', 'birth_date'}
+        assert errors[7] == {'email': ['Duplicate of row 3.']}
+
+        boss = User.objects.get(email='boss@example.com')
+        dev = User.objects.get(email='dev@example.com')
+        assert (boss.department, boss.position, boss.birth_date) == (department, position, date(1980, 2, 1))
+        assert dev.manager == boss and dev.department == department and not dev.has_usable_password()
+        user.refresh_from_db()
+        assert (user.last_name, user.department) == ('Petrov', department)
+        # Columns absent from the file are kept
+        assert user.check_password('testpass123')
+        assert AuditLog.objects.filter(entity_type='User', entity_id=boss.id, action=AuditLog.Action.CREATE).exists()
+
+    def test_import_xlsx_dry_run(self, lookups):
+        from io import BytesIO
+        from apps.accounts.importer import import_file
+
+        openpyxl = pytest.importorskip('openpyxl')
+
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['email', 'last_name', 'first_name', 'phone_work', 'hire_date'])
+        workbook.active.append(['new@example.com', 'New', 'Person', 79001234567, date(2024, 1, 15)])
+        buffer = BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+
+        report = import_file(buffer, 'staff.xlsx', dry_run=True)
+        assert (report['created'], report['failed']) == (1, 0)
+        assert not User.objects.filter(email='new@example.com').exists()
+
+        buffer.seek(0)
+        import_file(buffer, 'staff.xlsx')
+        new = User.objects.get(email='new@example.com')
+        assert (new.phone_work, new.hire_date) == ('79001234567', date(2024, 1, 15))
+
+    def test_import_endpoint_runs_job(self, api_client, admin_user, lookups, django_capture_on_commit_callbacks):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        api_client.force_authenticate(user=admin_user)
+        upload = SimpleUploadedFile('staff.csv', self.CSV.encode(), content_type='text/csv')
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post('/api/v1/users/admin/import/', {'file': upload}, format='multipart')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        response = api_client.get(f'/api/v1/jobs/{response.data["job"]["id"]}/')
+        assert response.data['status'] == 'succeeded'
+        assert response.data['result']['created'] == 3
+        assert response.data['result']['failed'] == 2
+
+        upload = SimpleUploadedFile('staff.txt', b'email\n', content_type='text/plain')
+        response = api_client.post('/api/v1/users/admin/import/', {'file': upload}, format='multipart')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBirthdays:
+    """Tests for the upcoming birthdays window."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        yield
+        cache.clear()
+
+    @staticmethod
+    def window(today, days):
+        from apps.accounts.birthdays import upcoming_birthdays
+
+        return [user.email for user in upcoming_birthdays(User.objects.all(), today, days)]
+
+    def test_year_wrap(self, user_factory):
+        user_factory(email='jan@example.com', birth_date=date(1990, 1, 5))
+        user_factory(email='dec@example.com', birth_date=date(1985, 12, 30))
+        user_factory(email='nov@example.com', birth_date=date(1992, 11, 1))
+        user_factory(email='none@example.com')
+
+        assert self.window(date(2026, 12, 20), 30) == ['dec@example.com', 'jan@example.com']
+        assert self.window(date(2026, 12, 20), 5) == []
+        assert self.window(date(2026, 10, 1), 366) == [
+            'nov@example.com', 'dec@example.com', 'jan@example.com',
+        ]
+
+    def test_leap_day(self, user_factory):
+        from apps.accounts.birthdays import next_birthday
+
+        user_factory(email='leap@example.com', birth_date=date(2000, 2, 29))
+        user_factory(email='march@example.com', birth_date=date(1990, 3, 1))
+
+        # Non-leap years: celebrated on March 1
+        assert self.window(date(2027, 2, 20), 8) == []
+        assert self.window(date(2027, 3, 1), 0) == ['leap@example.com', 'march@example.com']
+        assert self.window(date(2028, 2, 29), 0) == ['leap@example.com']
+        assert next_birthday(date(2000, 2, 29), date(2027, 2, 1)) == date(2027, 3, 1)
+        assert next_birthday(date(2000, 2, 29), date(2027, 3, 2)) == date(2028, 2, 29)
+
+    def test_endpoint(self, api_client, user_factory, django_assert_max_num_queries):
+        today = timezone.localdate()
+        viewer = user_factory(email='viewer@example.com')
+        user_factory(email='soon@example.com', birth_date=(today + timedelta(days=3)).replace(year=1988))
+        user_factory(email='later@example.com', birth_date=(today + timedelta(days=45)).replace(year=1988))
+        api_client.force_authenticate(user=viewer)
+
+        response = api_client.get('/api/v1/users/birthdays/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['days_until_birthday'] for item in response.data] == [3]
+
+        response = api_client.get('/api/v1/users/birthdays/', {'days': 60, 'page_size': 1})
+        assert response.data['count'] == 2
+        assert response.data['results'][0]['days_until_birthday'] == 3
+
+        # Cached for the day: only the users version is read
+        with django_assert_max_num_queries(2):
+            response = api_client.get('/api/v1/users/birthdays/', {'days': 60})
+        assert [item['days_until_birthday'] for item in response.data] == [3, 45]
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+    """Tests for cached JWT authentication and session activity."""
+
+    @pytest.fixture(autouse=True)
+    def buffered(self):
+        from django.core.cache import cache
+        from django.test import override_settings
+        from core import counters
+
+        cache.clear()
+        with override_settings(VIEW_COUNTER_BACKEND='local', VIEW_COUNTER_FLUSH_INTERVAL=3600):
+            counters.reset_backend()
+            yield
+        counters.reset_backend()
+        cache.clear()
+
+    @staticmethod
+    def authenticate(user, method='get'):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from rest_framework_simplejwt.tokens import AccessToken
+        from core.authentication import CachedJWTAuthentication
+
+        request = getattr(APIRequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return CachedJWTAuthentication().authenticate(Request(request))[0]
+
+    def test_snapshot_cached_until_roles_change(self, user, django_assert_num_queries):
+        from apps.roles.models import Permission, Role
+        permission = Permission.objects.get(codename='users.view_private')
+        role = Role.objects.create(name='HR')
+        role.permissions.add(permission)
+        user.roles.add(role)
+
+        # User row + permission codenames
+        with django_assert_num_queries(2):
+            assert self.authenticate(user).has_permission('users.view_private')
+        with django_assert_num_queries(0):
+            cached = self.authenticate(user)
+            assert cached.email == user.email
+            assert cached.has_any_permission(['users.view_private', 'news.pin'])
+            assert not cached.has_permission('news.pin')
+
+        role.permissions.remove(permission)
+        assert not self.authenticate(user).has_permission('users.view_private')
+
+        # Writes always load the row
+        with django_assert_num_queries(1):
+            self.authenticate(user, method='post')
+
+    def test_snapshot_keeps_password_out_of_cache(self, user, django_assert_num_queries):
+        from django.core.cache import cache
+        from core.authentication import snapshot_key
+
+        self.authenticate(user)
+        snapshot = cache.get(snapshot_key(user.pk))
+        assert 'password' not in snapshot['values']
+        assert user.password not in repr(snapshot)
+
+        with django_assert_num_queries(0):
+            cached = self.authenticate(user)
+            assert (cached.pk, cached.email, cached.get_full_name()) == (user.pk, user.email, user.get_full_name())
+            assert not cached.has_permission('users.view_private')
+        # Columns outside the snapshot are deferred, not blank
+        with django_assert_num_queries(1):
+            assert cached.check_password('testpass123')
+
+    def test_inactive_user_rejected(self, user):
+        from rest_framework.exceptions import AuthenticationFailed
+        self.authenticate(user)
+        user.is_active = False
+        user.save()
+        with pytest.raises(AuthenticationFailed):
+            self.authenticate(user)
+
+    def test_session_detected_after_refresh(self, api_client, user, user_data):
+        from core import counters
+        from apps.accounts.models import UserSession
+
+        response = api_client.post('/api/v1/auth/login/', {
+            'email': user_data['email'], 'password': user_data['password'],
+        })
+        session = UserSession.objects.get(user=user)
+        response = api_client.post('/api/v1/auth/token/refresh/', {'refresh': response.data['refresh']})
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+
+        UserSession.objects.filter(pk=session.pk).update(last_activity=timezone.now() - timedelta(days=1))
+        response = api_client.get('/api/v1/auth/sessions/')
+        assert [item['is_current'] for item in response.data] == [True]
+
+        assert counters.flush_view_counters()['session_activity'] == 1
+        session.refresh_from_db()
+        assert session.last_activity > timezone.now() - timedelta(minutes=1)
+
+        response = api_client.post('/api/v1/auth/sessions/terminate-all/')
+        assert response.status_code == status.HTTP_200_OK
+        assert UserSession.objects.filter(is_active=True).count() == 1
+
+
+@pytest.mark.django_db
+class TestMaintenanceTasks:
+    """Tests for token and session cleanup tasks."""
+
+    def test_flush_expired_tokens(self, user, settings):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from apps.accounts.tasks import flush_expired_tokens
+
+        settings.MAINTENANCE_CHUNK_SIZE = 2
+        tokens = [RefreshToken.for_user(user) for _ in range(5)]
+        tokens[0].blacklist()
+        OutstandingToken.objects.exclude(jti=tokens[4]['jti']).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        result = flush_expired_tokens()
+        assert result['deleted'] == 5  # four tokens and one blacklist entry
+        assert 'seconds' in result
+        assert list(OutstandingToken.objects.values_list('jti', flat=True)) == [tokens[4]['jti']]
+        assert not BlacklistedToken.objects.exists()
+
+    def test_expire_sessions(self, user, settings):
+        from apps.accounts.models import UserSession
+        from apps.accounts.tasks import expire_sessions
+
+        settings.MAINTENANCE_CHUNK_SIZE = 1
+        now = timezone.now()
+        lifetime = settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME']
+        sessions = {
+            'current': (True, now),
+            'expired': (True, now - lifetime - timedelta(hours=1)),
+            'expired_too': (True, now - lifetime - timedelta(days=1)),
+            'terminated': (False, now - timedelta(days=1)),
+            'old': (False, now - timedelta(days=settings.SESSION_RETENTION_DAYS + 1)),
+        }
+        for jti, (is_active, last_activity) in sessions.items():
+            session = UserSession.objects.create(user=user, token_jti=jti, is_active=is_active)
+            UserSession.objects.filter(pk=session.pk).update(last_activity=last_activity)
+
+        result = expire_sessions()
+        assert result['deactivated'] == 2
+        assert result['deleted'] == 1
+        assert dict(UserSession.objects.values_list('token_jti', 'is_active')) == {
+            'current': True, 'expired': False, 'expired_too': False, 'terminated': False,
+        }
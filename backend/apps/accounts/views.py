@@ -1,22 +1,40 @@
 """
 Views for accounts app.
 """
+import os
+import uuid
+
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status, generics, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, CreateModelMixin, DestroyModelMixin
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.audit.models import AuditLog
+from apps.roles.permissions import CanManageRoles
+from core.mixins import ReplicaReadMixin
+from core.models import BackgroundJob, ModelVersion
+from core.pagination import OptInPagination
+from core.serializers import BackgroundJobSerializer
+from core.renditions import schedule_renditions, delete_renditions
+from . import birthdays, bulk, importer
 from .models import User, UserStatus, TwoFactorSettings, UserSession
+from .tasks import import_users, run_bulk_user_operation
 from .serializers import (
+    BulkUserOperationSerializer,
     CustomTokenObtainPairSerializer,
     PasswordChangeSerializer,
     PasswordResetRequestSerializer,
@@ -52,69 +70,39 @@ class LoginView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
     def post(self, request, *args, **kwargs):
-        # First, validate credentials without generating tokens
-        email = request.data.get('email')
-        password = request.data.get('password')
-
+        serializer = self.get_serializer(data=request.data)
         try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            # Let parent handle the error
-            return super().post(request, *args, **kwargs)
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
 
-        # Check if user has 2FA enabled
-        try:
-            two_factor = user.two_factor_settings
-            if two_factor.is_enabled:
-                # Validate password first
-                if not user.check_password(password):
-                    return super().post(request, *args, **kwargs)
-
-                # Return 2FA required response
-                return Response({
-                    'requires_2fa': True,
-                    'user_id': user.id,
-                    'message': 'Two-factor authentication required.'
-                }, status=status.HTTP_200_OK)
-        except TwoFactorSettings.DoesNotExist:
-            pass
+        data = serializer.validated_data
+        if data.get('requires_2fa'):
+            return Response(data, status=status.HTTP_200_OK)
 
-        # Normal login flow
-        response = super().post(request, *args, **kwargs)
+        user = serializer.user
+        AuditLog.log(
+            user=user,
+            action=AuditLog.Action.LOGIN,
+            entity_type='User',
+            entity_id=user.id,
+            entity_repr=str(user),
+            ip_address=self.get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+        )
 
-        if response.status_code == 200:
-            # Log successful login
-            AuditLog.log(
+        # Create session record with both refresh (for blacklisting) and access (for detection) JTIs
+        try:
+            UserSession.create_from_request(
                 user=user,
-                action=AuditLog.Action.LOGIN,
-                entity_type='User',
-                entity_id=user.id,
-                entity_repr=str(user),
-                ip_address=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                token_jti=str(serializer.refresh_token['jti']),
+                request=request,
+                access_jti=str(serializer.access_token['jti'])
             )
+        except Exception:
+            pass  # Don't fail login if session creation fails
 
-            # Create session record with both refresh (for blacklisting) and access (for detection) JTIs
-            try:
-                from rest_framework_simplejwt.tokens import RefreshToken as RefreshTokenClass, AccessToken
-                refresh_token_str = response.data.get('refresh')
-                access_token_str = response.data.get('access')
-                if refresh_token_str:
-                    refresh_token = RefreshTokenClass(refresh_token_str)
-                    access_jti = ''
-                    if access_token_str:
-                        access_token = AccessToken(access_token_str)
-                        access_jti = str(access_token['jti'])
-                    UserSession.create_from_request(
-                        user=user,
-                        token_jti=str(refresh_token['jti']),
-                        request=request,
-                        access_jti=access_jti
-                    )
-            except Exception:
-                pass  # Don't fail login if session creation fails
-
-        return response
+        return Response(data, status=status.HTTP_200_OK)
 
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -257,11 +245,13 @@ class CurrentUserAvatarView(APIView):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        schedule_renditions([request.user.avatar.name])
         # Return relative URL - frontend Vite proxy will handle it
         return Response({'avatar': request.user.avatar.url})
 
     def delete(self, request):
         if request.user.avatar:
+            delete_renditions(request.user.avatar.name)
             request.user.avatar.delete()
             request.user.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -281,7 +271,7 @@ class UserListView(generics.ListAPIView):
         return User.objects.filter(
             is_active=True,
             is_archived=False
-        ).select_related('department', 'position').prefetch_related('user_skills')
+        ).select_related('department', 'position').prefetch_related(UserStatus.objects.prefetch_current())
 
 
 class UserDetailView(generics.RetrieveAPIView):
@@ -321,10 +311,12 @@ class UserSearchView(generics.ListAPIView):
             Q(email__icontains=query) |
             Q(department__name__icontains=query) |
             Q(position__name__icontains=query)
-        ).select_related('department', 'position').distinct()[:20]
+        ).select_related('department', 'position').prefetch_related(
+            UserStatus.objects.prefetch_current()
+        ).distinct()[:20]
 
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(ReplicaReadMixin, APIView):
     """Get dashboard statistics."""
     permission_classes = [IsAuthenticated]
 
@@ -344,32 +336,46 @@ class DashboardStatsView(APIView):
 
 
 class BirthdayListView(generics.ListAPIView):
-    """List upcoming birthdays."""
+    """
+    List upcoming birthdays within ``?days=`` days (default 30, at most 366).
+
+    The list is cached until midnight per window and users version; pass
+    ``page`` or ``page_size`` for a paginated response.
+    """
     serializer_class = BirthdaySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptInPagination
 
-    def get_queryset(self):
-        today = timezone.now().date()
-        # Get users with birthdays in next 30 days
-        users = User.objects.filter(
-            is_active=True,
-            is_archived=False,
-            birth_date__isnull=False
-        ).select_related('department')
+    def get_days(self):
+        try:
+            days = int(self.request.query_params.get('days', birthdays.DEFAULT_DAYS))
+        except ValueError:
+            days = birthdays.DEFAULT_DAYS
+        return min(max(days, 0), birthdays.MAX_DAYS)
 
-        # Filter by upcoming birthdays (considering year wrap)
-        upcoming = []
+    def get_queryset(self):
+        today = timezone.localdate()
+        users = birthdays.upcoming_birthdays(
+            User.objects.filter(is_active=True, is_archived=False).select_related('department'),
+            today,
+            self.get_days(),
+        )
         for user in users:
-            this_year_birthday = user.birth_date.replace(year=today.year)
-            if this_year_birthday < today:
-                this_year_birthday = this_year_birthday.replace(year=today.year + 1)
+            user.days_until_birthday = (birthdays.next_birthday(user.birth_date, today) - today).days
+        return users
 
-            days_until = (this_year_birthday - today).days
-            if days_until <= 30:
-                user.days_until_birthday = days_until
-                upcoming.append(user)
+    def list(self, request, *args, **kwargs):
+        version = ModelVersion.objects.get_versions(['accounts.User']).get('accounts.User', 0)
+        key = f'birthdays:{timezone.localdate()}:{self.get_days()}:{version}'
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_queryset(), many=True).data
+            cache.set(key, data, birthdays.seconds_until_midnight())
 
-        return sorted(upcoming, key=lambda u: u.days_until_birthday)
+        page = self.paginate_queryset(data)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(data)
 
 
 # =============================================================================
@@ -386,7 +392,9 @@ class AdminUserViewSet(ModelViewSet):
     ordering = ['last_name', 'first_name']
 
     def get_queryset(self):
-        return User.objects.all().select_related('department', 'position')
+        return User.objects.all().select_related('department', 'position').prefetch_related(
+            UserStatus.objects.prefetch_current()
+        )
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -460,71 +468,109 @@ class AdminUserViewSet(ModelViewSet):
     @action(detail=False, methods=['get'])
     def archived(self, request):
         """List archived users."""
-        users = User.objects.filter(is_archived=True)
+        users = User.objects.filter(is_archived=True).select_related('department', 'position').prefetch_related(
+            UserStatus.objects.prefetch_current()
+        )
         serializer = UserListSerializer(users, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Apply a lifecycle operation to many users at once.
+
+        Body: ``operation`` (archive, restore, set_department, set_position,
+        assign_role), ``ids`` and, except for archive/restore, ``value``.
+        """
+        serializer = BulkUserOperationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Same permission as RoleViewSet.assign - HR access alone doesn't grant roles
+        if serializer.validated_data['operation'] == 'assign_role' and not CanManageRoles().has_permission(request, self):
+            raise PermissionDenied('Assigning roles requires the roles.manage permission.')
+        return self.run_bulk(request, **serializer.validated_data)
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Import employees from a CSV/XLSX ``file`` as a background job.
+
+        Optional ``dry_run`` (validate only) and ``update_existing`` (default
+        true). The job result is the per-row report from apps.accounts.importer.
+        """
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'file': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
+        ext = os.path.splitext(upload.name)[1].lower()
+        if ext not in ('.csv', '.xlsx'):
+            return Response({'file': 'Only .csv and .xlsx files are supported.'}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.size > django_settings.USER_IMPORT_MAX_SIZE:
+            return Response({'file': 'File is too large.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        def flag(name, default):
+            return str(request.data.get(name, default)).lower() in ('true', '1', 'yes')
+
+        path = default_storage.save(f'imports/{uuid.uuid4().hex}{ext}', upload)
+        job = BackgroundJob.objects.create(
+            kind=importer.JOB_KIND,
+            params={
+                'path': path,
+                'name': upload.name,
+                'dry_run': flag('dry_run', False),
+                'update_existing': flag('update_existing', True),
+                'actor_id': request.user.id,
+                'ip_address': getattr(request, 'audit_ip', None),
+                'user_agent': getattr(request, 'audit_user_agent', ''),
+            },
+            created_by=request.user,
+        )
+        transaction.on_commit(lambda: import_users.delay(job.pk))
+        return Response(
+            {'detail': 'Import queued.', 'job': BackgroundJobSerializer(job).data},
+            status=status.HTTP_202_ACCEPTED
+        )
+
     @action(detail=False, methods=['post'], url_path='bulk-archive')
     def bulk_archive(self, request):
         """Archive multiple users at once."""
-        user_ids = request.data.get('ids', [])
-        if not user_ids:
-            return Response(
-                {'detail': 'No user IDs provided.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        users = User.objects.filter(id__in=user_ids, is_archived=False)
-        count = users.count()
-
-        for user in users:
-            user.is_archived = True
-            user.is_active = False
-            user.archived_at = timezone.now()
-            user.save()
-
-            AuditLog.log(
-                user=request.user,
-                action=AuditLog.Action.ARCHIVE,
-                entity_type='User',
-                entity_id=user.id,
-                entity_repr=str(user),
-                ip_address=getattr(request, 'audit_ip', None),
-                user_agent=getattr(request, 'audit_user_agent', '')
-            )
-
-        return Response({'detail': f'{count} users archived successfully.', 'count': count})
+        return self.bulk_lifecycle(request, 'archive')
 
     @action(detail=False, methods=['post'], url_path='bulk-restore')
     def bulk_restore(self, request):
         """Restore multiple users at once."""
-        user_ids = request.data.get('ids', [])
-        if not user_ids:
+        return self.bulk_lifecycle(request, 'restore')
+
+    def bulk_lifecycle(self, request, operation):
+        serializer = BulkUserOperationSerializer(data={'operation': operation, 'ids': request.data.get('ids', [])})
+        if not serializer.is_valid():
             return Response(
                 {'detail': 'No user IDs provided.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        users = User.objects.filter(id__in=user_ids, is_archived=True)
-        count = users.count()
-
-        for user in users:
-            user.is_archived = False
-            user.is_active = True
-            user.archived_at = None
-            user.save()
-
-            AuditLog.log(
-                user=request.user,
-                action=AuditLog.Action.RESTORE,
-                entity_type='User',
-                entity_id=user.id,
-                entity_repr=str(user),
-                ip_address=getattr(request, 'audit_ip', None),
-                user_agent=getattr(request, 'audit_user_agent', '')
+        return self.run_bulk(request, **serializer.validated_data)
+
+    def run_bulk(self, request, operation, ids, value=None):
+        """Run inline up to BULK_USER_SYNC_LIMIT users, otherwise as a background job."""
+        params = {
+            'operation': operation,
+            'user_ids': ids,
+            'value': value,
+            'actor_id': request.user.id,
+            'ip_address': getattr(request, 'audit_ip', None),
+            'user_agent': getattr(request, 'audit_user_agent', ''),
+        }
+        if len(ids) > django_settings.BULK_USER_SYNC_LIMIT:
+            job = BackgroundJob.objects.create(
+                kind=bulk.JOB_KIND, params=params, total=len(ids), created_by=request.user,
+            )
+            transaction.on_commit(lambda: run_bulk_user_operation.delay(job.pk))
+            return Response(
+                {'detail': f'Operation queued for {len(ids)} users.', 'job': BackgroundJobSerializer(job).data},
+                status=status.HTTP_202_ACCEPTED
             )
 
-        return Response({'detail': f'{count} users restored successfully.', 'count': count})
+        count = bulk.apply(**params)
+        verb = {'archive': 'archived', 'restore': 'restored'}.get(operation, 'updated')
+        return Response({'detail': f'{count} users {verb} successfully.', 'count': count})
 
 
 # =============================================================================
@@ -799,7 +845,8 @@ class TwoFactorAuthenticateView(APIView):
                 )
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        access = refresh.access_token
 
         # Create session record with both refresh and access JTIs
         try:
@@ -807,7 +854,7 @@ class TwoFactorAuthenticateView(APIView):
                 user=user,
                 token_jti=str(refresh['jti']),  # Refresh token JTI for blacklisting
                 request=request,
-                access_jti=str(refresh.access_token['jti'])  # Access token JTI for detection
+                access_jti=str(access['jti'])  # Access token JTI for detection
             )
         except Exception as e:
             import logging
@@ -828,7 +875,7 @@ class TwoFactorAuthenticateView(APIView):
 
         return Response({
             'refresh': str(refresh),
-            'access': str(refresh.access_token),
+            'access': str(access),
             'user': {
                 'id': user.id,
                 'email': user.email,
@@ -861,17 +908,6 @@ class UserSessionListView(APIView):
             is_active=True
         ).order_by('-last_activity')
 
-        # Get current token JTI
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        jwt_auth = JWTAuthentication()
-        try:
-            validated_token = jwt_auth.get_validated_token(
-                jwt_auth.get_raw_token(jwt_auth.get_header(request))
-            )
-            request.current_token_jti = validated_token['jti']
-        except Exception:
-            request.current_token_jti = None
-
         serializer = UserSessionSerializer(
             sessions,
             many=True,
@@ -897,19 +933,7 @@ class UserSessionTerminateView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Check if this is the current session by comparing access_jti
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        jwt_auth = JWTAuthentication()
-        is_current_session = False
-        try:
-            validated_token = jwt_auth.get_validated_token(
-                jwt_auth.get_raw_token(jwt_auth.get_header(request))
-            )
-            current_access_jti = validated_token['jti']
-            is_current_session = session.access_jti == current_access_jti
-        except Exception:
-            pass
-
+        is_current_session = session.matches_token(request.auth)
         session.terminate()
 
         # Log session termination
@@ -934,29 +958,16 @@ class UserSessionTerminateAllView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        # Get current access token JTI
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        jwt_auth = JWTAuthentication()
-        current_access_jti = None
-        try:
-            validated_token = jwt_auth.get_validated_token(
-                jwt_auth.get_raw_token(jwt_auth.get_header(request))
-            )
-            current_access_jti = validated_token['jti']
-        except Exception:
-            pass
-
-        # Get all active sessions except current (compare by access_jti)
+        # All active sessions except the one making this request
         sessions = UserSession.objects.filter(
             user=request.user,
             is_active=True
         )
 
-        if current_access_jti:
-            sessions = sessions.exclude(access_jti=current_access_jti)
-
         terminated_count = 0
         for session in sessions:
+            if session.matches_token(request.auth):
+                continue
             session.terminate()
             terminated_count += 1
 
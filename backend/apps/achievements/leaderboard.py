@@ -0,0 +1,136 @@
+"""
+Precomputed achievement leaderboards.
+
+Every award counts towards 5 periods × (all departments, the recipient's
+department) × (all categories, the achievement's category). The counts are
+stored in LeaderboardEntry rows:
+
+- ``refresh_user()`` recomputes one user's rows from their awards (a few
+  dozen rows at most) when an award is created or deleted;
+- ``rebuild()`` recomputes everything - periodically, because the rolling
+  periods move, and after bulk imports that bypass signals. It locks the
+  table first, so a concurrent refresh is neither overwritten with stale
+  rows nor inserted under the rebuild's unique keys.
+
+Reads are a single indexed query for the top of a scope plus one COUNT for
+a user's rank.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AchievementAward, LeaderboardEntry
+
+PERIOD_DAYS = {
+    LeaderboardEntry.Period.WEEK: 7,
+    LeaderboardEntry.Period.MONTH: 30,
+    LeaderboardEntry.Period.QUARTER: 90,
+    LeaderboardEntry.Period.YEAR: 365,
+    LeaderboardEntry.Period.ALL: None,
+}
+
+AWARD_FIELDS = ('id', 'recipient_id', 'recipient__department_id', 'achievement__category', 'awarded_at')
+
+
+def compute_entries(awards, now=None):
+    """Build unsaved LeaderboardEntry rows from ``AWARD_FIELDS`` tuples."""
+    now = now or timezone.now()
+    starts = {
+        period: now - timedelta(days=days) if days else None
+        for period, days in PERIOD_DAYS.items()
+    }
+    entries = {}
+    for award_id, user_id, department_id, category, awarded_at in awards:
+        for period, start in starts.items():
+            if start and awarded_at < start:
+                continue
+            for department_key in {0, department_id or 0}:
+                for category_key in ('', category):
+                    key = (period, department_key, category_key, user_id)
+                    entry = entries.get(key)
+                    if entry is None:
+                        entry = entries[key] = LeaderboardEntry(
+                            period=period,
+                            department_key=department_key,
+                            category=category_key,
+                            user_id=user_id,
+                            latest_award_at=awarded_at,
+                            latest_award_id=award_id,
+                        )
+                    entry.count += 1
+                    if (awarded_at, award_id) > (entry.latest_award_at, entry.latest_award_id):
+                        entry.latest_award_at = awarded_at
+                        entry.latest_award_id = award_id
+    return list(entries.values())
+
+
+def refresh_user(user_id):
+    """Recompute one user's leaderboard rows."""
+    from apps.accounts.models import User
+
+    with transaction.atomic():
+        # Serializes concurrent refreshes of the same user
+        if not User.objects.select_for_update().filter(pk=user_id).exists():
+            return 0
+        awards = AchievementAward.objects.filter(recipient_id=user_id).values_list(*AWARD_FIELDS)
+        entries = compute_entries(awards)
+        LeaderboardEntry.objects.filter(user_id=user_id).delete()
+        LeaderboardEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def rebuild(batch_size=2000):
+    """Recompute all leaderboard rows. Returns the number of rows."""
+    with transaction.atomic():
+        lock_entries()
+        # Awards are read after the lock, so refreshes committed before it are included
+        awards = AchievementAward.objects.values_list(*AWARD_FIELDS).iterator(chunk_size=batch_size)
+        entries = compute_entries(awards)
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
+
+
+def lock_entries():
+    """
+    Block ``refresh_user()`` until the transaction ends.
+
+    SHARE ROW EXCLUSIVE conflicts with the ROW EXCLUSIVE lock its DELETE
+    takes (and with itself), but not with reads. SQLite serializes writers
+    on its own.
+    """
+    connection = transaction.get_connection()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'LOCK TABLE {connection.ops.quote_name(LeaderboardEntry._meta.db_table)} IN SHARE ROW EXCLUSIVE MODE'
+            )
+
+
+def scope_entries(period, department_id=None, category=None):
+    return LeaderboardEntry.objects.filter(
+        period=period,
+        department_key=department_id or 0,
+        category=category or '',
+    )
+
+
+def get_top(period, department_id=None, category=None, limit=20):
+    """Top entries of a scope with user and latest achievement, in one query."""
+    return list(
+        scope_entries(period, department_id, category)
+        .select_related('user', 'latest_award__achievement')
+        .order_by('-count', '-latest_award_at', 'user_id')[:limit]
+    )
+
+
+def get_rank(entry):
+    """1-based position of an entry in its scope (same ordering as get_top)."""
+    ahead = scope_entries(entry.period, entry.department_key, entry.category).filter(
+        Q(count__gt=entry.count)
+        | Q(count=entry.count, latest_award_at__gt=entry.latest_award_at)
+        | Q(count=entry.count, latest_award_at=entry.latest_award_at, user_id__lt=entry.user_id)
+    )
+    return ahead.count() + 1
@@ -0,0 +1,25 @@
+"""
+Management command recomputing the precomputed achievement leaderboards.
+
+Run after deploying the leaderboard tables or after bulk-loading awards
+(bulk_create skips the signals that keep them current).
+
+Usage:
+    python manage.py rebuild_leaderboards
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.achievements.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute achievement leaderboards from all awards'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} leaderboard rows in {time.perf_counter() - start:.2f}s'
+        ))
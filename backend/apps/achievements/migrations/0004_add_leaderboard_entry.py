@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0003_add_automatic_achievements'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month'), ('quarter', 'Quarter'), ('year', 'Year'), ('all', 'All time')], max_length=10, verbose_name='period')),
+                ('department_key', models.PositiveIntegerField(default=0, verbose_name='department id')),
+                ('category', models.CharField(blank=True, default='', max_length=20, verbose_name='category')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='awards count')),
+                ('latest_award_at', models.DateTimeField(verbose_name='latest award at')),
+                ('latest_award', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='achievements.achievementaward', verbose_name='latest award')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'leaderboard entry',
+                'verbose_name_plural': 'leaderboard entries',
+                'indexes': [models.Index(fields=['period', 'department_key', 'category', '-count', '-latest_award_at'], name='leaderboard_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('period', 'department_key', 'category', 'user'), name='unique_leaderboard_entry'),
+        ),
+    ]
@@ -118,3 +118,58 @@ class AchievementAward(models.Model):
 
     def __str__(self):
         return f"{self.recipient} - {self.achievement}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Precomputed leaderboard row: a user's award count in one
+    period × department × category scope (see apps.achievements.leaderboard).
+
+    ``department_key`` 0 and ``category`` '' mean "all". Rebuilt per user
+    when their awards change and for everyone periodically, as rolling
+    periods move.
+    """
+    class Period(models.TextChoices):
+        WEEK = 'week', _('Week')
+        MONTH = 'month', _('Month')
+        QUARTER = 'quarter', _('Quarter')
+        YEAR = 'year', _('Year')
+        ALL = 'all', _('All time')
+
+    period = models.CharField(_('period'), max_length=10, choices=Period.choices)
+    department_key = models.PositiveIntegerField(_('department id'), default=0)
+    category = models.CharField(_('category'), max_length=20, blank=True, default='')
+    user = models.ForeignKey(
+        'accounts.User',
+        verbose_name=_('user'),
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries'
+    )
+    count = models.PositiveIntegerField(_('awards count'), default=0)
+    latest_award = models.ForeignKey(
+        AchievementAward,
+        verbose_name=_('latest award'),
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    latest_award_at = models.DateTimeField(_('latest award at'))
+
+    class Meta:
+        verbose_name = _('leaderboard entry')
+        verbose_name_plural = _('leaderboard entries')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period', 'department_key', 'category', 'user'],
+                name='unique_leaderboard_entry',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['period', 'department_key', 'category', '-count', '-latest_award_at'],
+                name='leaderboard_rank_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.period}/{self.department_key}/{self.category or '*'}: {self.count}"
@@ -1,7 +1,8 @@
 """
 Signal handlers for triggering automatic achievement checks.
 """
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from apps.achievements.services import check_automatic_achievements
@@ -64,3 +65,15 @@ def check_achievements_on_login(sender, instance, created, **kwargs):
     """Check for automatic achievements when user logs in."""
     if created and instance.action == 'LOGIN' and instance.user:
         check_automatic_achievements(instance.user)
+
+
+@receiver(post_save, sender='achievements.AchievementAward')
+@receiver(post_delete, sender='achievements.AchievementAward')
+def refresh_leaderboard_on_award(sender, instance, **kwargs):
+    """Recompute the recipient's leaderboard rows once the change is committed."""
+    if kwargs.get('created') is False:
+        return
+    from apps.achievements.tasks import refresh_user_leaderboard
+
+    user_id = instance.recipient_id
+    transaction.on_commit(lambda: refresh_user_leaderboard.delay(user_id))
@@ -0,0 +1,29 @@
+"""
+Celery tasks for achievements.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='achievements.refresh_user_leaderboard')
+def refresh_user_leaderboard(user_id: int):
+    """Recompute a user's leaderboard rows after their awards changed."""
+    from apps.achievements.leaderboard import refresh_user
+
+    return refresh_user(user_id)
+
+
+@shared_task(name='achievements.rebuild_leaderboards')
+def rebuild_leaderboards():
+    """
+    Recompute all leaderboards.
+    Runs hourly so awards leave the rolling week/month/quarter/year periods.
+    """
+    from apps.achievements.leaderboard import rebuild
+
+    rows = rebuild()
+    logger.info(f"Rebuilt leaderboards: {rows} rows")
+    return rows
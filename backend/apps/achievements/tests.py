@@ -231,3 +231,57 @@ class TestAchievementStats:
             )
         response = authenticated_client.get('/api/v1/achievements/stats/')
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    """Tests for precomputed leaderboards."""
+
+    @pytest.fixture
+    def awards(self, achievement, user, another_user, admin_user):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        # bulk_create: the award notification signal is not under test here
+        created = AchievementAward.objects.bulk_create([
+            AchievementAward(achievement=achievement, recipient=recipient, awarded_by=admin_user, comment='Тест')
+            for recipient in (user, user, another_user, another_user, another_user)
+        ])
+        # One of another_user's awards is outside the rolling week
+        AchievementAward.objects.filter(pk=created[-1].pk).update(awarded_at=timezone.now() - timedelta(days=10))
+        return created
+
+    def test_leaderboard_ranks(self, authenticated_client, awards, user, another_user, django_assert_max_num_queries):
+        """Rows come from the snapshot in one query, rolling periods respected."""
+        from apps.achievements.leaderboard import rebuild
+
+        rebuild()
+        with django_assert_max_num_queries(1):
+            response = authenticated_client.get('/api/v1/achievements/leaderboard/', {'period': 'all'})
+        assert [(row['user']['id'], row['count']) for row in response.data] == [(another_user.pk, 3), (user.pk, 2)]
+        assert response.data[0]['recent_achievement']['name'] == 'Инноватор'
+
+        response = authenticated_client.get('/api/v1/achievements/leaderboard/', {
+            'period': 'week', 'category': Achievement.Category.PROFESSIONAL,
+        })
+        assert [(row['rank'], row['count']) for row in response.data] == [(1, 2), (2, 2)]
+
+        response = authenticated_client.get('/api/v1/achievements/leaderboard/', {'category': 'social'})
+        assert response.data == []
+
+    def test_my_rank_after_refresh(self, authenticated_client, awards, user):
+        """refresh_user recomputes one user's rows; /me/ returns the position."""
+        from apps.achievements.leaderboard import rebuild, refresh_user
+
+        rebuild()
+        AchievementAward.objects.filter(recipient=user).first().delete()
+        refresh_user(user.pk)
+
+        response = authenticated_client.get('/api/v1/achievements/leaderboard/me/', {'period': 'all'})
+        assert response.data['rank'] == 2
+        assert response.data['count'] == 1
+
+        AchievementAward.objects.filter(recipient=user).delete()
+        refresh_user(user.pk)
+        response = authenticated_client.get('/api/v1/achievements/leaderboard/me/')
+        assert response.data == {'rank': None, 'count': 0, 'recent_achievement': None}
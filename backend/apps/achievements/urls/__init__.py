@@ -12,6 +12,7 @@ from apps.achievements.views import (
     MyAchievementsView,
     AchievementStatsView,
     AchievementLeaderboardView,
+    MyLeaderboardRankView,
     AchievementProgressView,
     TriggerTypesView,
 )
@@ -27,6 +28,7 @@ urlpatterns = [
     path('user/<int:user_id>/', UserAchievementsView.as_view(), name='user-achievements'),
     path('stats/', AchievementStatsView.as_view(), name='achievement-stats'),
     path('leaderboard/', AchievementLeaderboardView.as_view(), name='achievement-leaderboard'),
+    path('leaderboard/me/', MyLeaderboardRankView.as_view(), name='achievement-leaderboard-me'),
     path('progress/', AchievementProgressView.as_view(), name='achievement-progress'),
     path('progress/<int:user_id>/', AchievementProgressView.as_view(), name='user-achievement-progress'),
     path('trigger-types/', TriggerTypesView.as_view(), name='achievement-trigger-types'),
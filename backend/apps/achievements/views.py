@@ -11,7 +11,9 @@ from rest_framework.generics import ListAPIView
 
 from apps.audit.models import AuditLog
 from apps.notifications.models import Notification
-from .models import Achievement, AchievementAward
+from core.mixins import ReplicaReadMixin
+from . import leaderboard
+from .models import Achievement, AchievementAward, LeaderboardEntry
 from .serializers import (
     AchievementSerializer,
     AchievementCreateSerializer,
@@ -137,7 +139,7 @@ class MyAchievementsView(ListAPIView):
         ).select_related('achievement', 'awarded_by')
 
 
-class AchievementStatsView(APIView):
+class AchievementStatsView(ReplicaReadMixin, APIView):
     """Get achievement statistics."""
     permission_classes = [IsAuthenticated]
 
@@ -172,81 +174,65 @@ class AchievementStatsView(APIView):
         })
 
 
-class AchievementLeaderboardView(APIView):
-    """Get achievement leaderboard with filters."""
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Q, Prefetch
-
-        # Get query parameters
-        period = request.query_params.get('period', 'month')  # week, month, quarter, year, all
-        department_id = request.query_params.get('department')
-        category = request.query_params.get('category')
-        limit = int(request.query_params.get('limit', 20))
-
-        # Calculate date filter based on period
-        now = timezone.now()
-        date_filter = None
-
-        if period == 'week':
-            date_filter = now - timedelta(days=7)
-        elif period == 'month':
-            date_filter = now - timedelta(days=30)
-        elif period == 'quarter':
-            date_filter = now - timedelta(days=90)
-        elif period == 'year':
-            date_filter = now - timedelta(days=365)
-        # 'all' has no date filter
+class AchievementLeaderboardView(ReplicaReadMixin, APIView):
+    """
+    Get achievement leaderboard with filters.
 
-        # Build queryset
-        queryset = AchievementAward.objects.all()
+    Query params:
+        period: week, month, quarter, year or all (default month)
+        department: department id
+        category: achievement category
+        limit: number of rows (default 20, max 100)
 
-        if date_filter:
-            queryset = queryset.filter(awarded_at__gte=date_filter)
+    Served from precomputed LeaderboardEntry rows (see
+    apps.achievements.leaderboard) in one query.
+    """
+    permission_classes = [IsAuthenticated]
 
-        if department_id:
-            queryset = queryset.filter(recipient__department_id=department_id)
+    def get_scope(self, request):
+        period = request.query_params.get('period', 'month')
+        if period not in LeaderboardEntry.Period.values:
+            period = LeaderboardEntry.Period.ALL
+        try:
+            department_id = int(request.query_params.get('department') or 0)
+        except ValueError:
+            department_id = 0
+        return period, department_id, request.query_params.get('category') or ''
+
+    def serialize_entry(self, entry, rank):
+        from apps.accounts.serializers import UserBasicSerializer
 
-        if category:
-            queryset = queryset.filter(achievement__category=category)
+        recent_achievement = entry.latest_award.achievement if entry.latest_award else None
+        return {
+            'rank': rank,
+            'user': UserBasicSerializer(entry.user).data,
+            'count': entry.count,
+            'recent_achievement': AchievementSerializer(recent_achievement).data if recent_achievement else None
+        }
 
-        # Aggregate by recipient
-        from django.db.models import Count, Max
-        leaderboard = queryset.values(
-            'recipient__id',
-            'recipient__first_name',
-            'recipient__last_name',
-            'recipient__avatar',
-            'recipient__position__name',
-            'recipient__department__name',
-        ).annotate(
-            count=Count('id'),
-            latest_award=Max('awarded_at')
-        ).order_by('-count', '-latest_award')[:limit]
-
-        # Get User objects and their recent achievements
-        from apps.accounts.models import User
-        from apps.accounts.serializers import UserBasicSerializer
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
 
-        result = []
-        for rank, entry in enumerate(leaderboard, start=1):
-            user = User.objects.get(id=entry['recipient__id'])
+        entries = leaderboard.get_top(*self.get_scope(request), limit=limit)
+        return Response([
+            self.serialize_entry(entry, rank)
+            for rank, entry in enumerate(entries, start=1)
+        ])
 
-            # Get most recent achievement for this user
-            recent_award = queryset.filter(recipient=user).select_related('achievement').order_by('-awarded_at').first()
-            recent_achievement = recent_award.achievement if recent_award else None
 
-            result.append({
-                'rank': rank,
-                'user': UserBasicSerializer(user).data,
-                'count': entry['count'],
-                'recent_achievement': AchievementSerializer(recent_achievement).data if recent_achievement else None
-            })
+class MyLeaderboardRankView(AchievementLeaderboardView):
+    """Current user's leaderboard position; same filters as the leaderboard."""
 
-        return Response(result)
+    def get(self, request):
+        entry = leaderboard.scope_entries(*self.get_scope(request)).filter(
+            user=request.user
+        ).select_related('user', 'latest_award__achievement').first()
+        if entry is None:
+            return Response({'rank': None, 'count': 0, 'recent_achievement': None})
+        return Response(self.serialize_entry(entry, leaderboard.get_rank(entry)))
 
 
 class AchievementProgressView(APIView):
@@ -77,6 +77,8 @@ class AuditLog(models.Model):
             models.Index(fields=['entity_type', 'entity_id']),
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['action', 'created_at']),
+            # Keyset pagination (core.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='audit_created_id_idx'),
         ]
 
     def __str__(self):
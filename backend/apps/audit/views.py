@@ -10,12 +10,14 @@ from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.mixins import ReplicaReadMixin
+from core.pagination import FeedPagination
 from .models import AuditLog
 from .serializers import AuditLogSerializer, AuditLogListSerializer
 from .permissions import CanViewAudit, CanExportAudit
 
 
-class AuditLogListView(ListAPIView):
+class AuditLogListView(ReplicaReadMixin, ListAPIView):
     """List audit logs with filtering."""
     serializer_class = AuditLogListSerializer
     permission_classes = [IsAuthenticated, CanViewAudit]
@@ -23,6 +25,8 @@ class AuditLogListView(ListAPIView):
     filterset_fields = ['action', 'entity_type', 'user']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = FeedPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         return AuditLog.objects.select_related('user')
@@ -53,6 +57,8 @@ class UserAuditView(ListAPIView):
     """Get audit history for specific user's actions."""
     serializer_class = AuditLogListSerializer
     permission_classes = [IsAuthenticated, CanViewAudit]
+    pagination_class = FeedPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         user_id = self.kwargs.get('user_id')
@@ -61,7 +67,7 @@ class UserAuditView(ListAPIView):
         ).select_related('user')
 
 
-class AuditExportView(APIView):
+class AuditExportView(ReplicaReadMixin, APIView):
     """Export audit logs to CSV."""
     permission_classes = [IsAuthenticated, CanExportAudit]
 
@@ -7,6 +7,8 @@ from datetime import timedelta
 from celery import shared_task
 from django.utils import timezone
 
+from core.replicas import use_replica
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +66,7 @@ def send_booking_reminders():
 
 
 @shared_task(name='bookings.send_daily_bookings_summary')
+@use_replica()  # daily read-heavy scan; writes still go to the primary
 def send_daily_bookings_summary():
     """
     Send daily summary of today's bookings to users.
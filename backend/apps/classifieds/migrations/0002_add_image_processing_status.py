@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classifieds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classifiedimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20, verbose_name='processing status'),
+        ),
+        migrations.AddField(
+            model_name='classifiedimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='classifieds/thumbnails/', verbose_name='Миниатюра'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classifieds', '0003_add_content_addressed_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classifiedimage',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Начало обработки'),
+        ),
+        migrations.AlterField(
+            model_name='classifiedimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('processing', 'Обрабатывается'), ('ready', 'Готово'), ('failed', 'Ошибка обработки')], default='ready', max_length=20, verbose_name='Статус обработки'),
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from datetime import timedelta
 
+from core.mixins import ContentAddressedFileMixin, ImageProcessingMixin
+
 
 class ClassifiedCategory(models.Model):
     """Category for classifieds."""
@@ -112,8 +114,9 @@ class Classified(models.Model):
         self.save(update_fields=['expires_at', 'status', 'updated_at'])
 
 
-class ClassifiedImage(models.Model):
-    """Image for classified ad."""
+class ClassifiedImage(ContentAddressedFileMixin, ImageProcessingMixin, models.Model):
+    """Image for classified ad. Stored by content, thumbnail is generated in the background."""
+    blob_file_field = 'image'
 
     classified = models.ForeignKey(
         Classified,
@@ -122,6 +125,7 @@ class ClassifiedImage(models.Model):
         verbose_name=_('Объявление')
     )
     image = models.ImageField(_('Изображение'), upload_to='classifieds/')
+    thumbnail = models.ImageField(_('Миниатюра'), upload_to='classifieds/thumbnails/', blank=True, null=True)
     order = models.PositiveIntegerField(_('Порядок'), default=0)
     uploaded_at = models.DateTimeField(_('Загружено'), auto_now_add=True)
 
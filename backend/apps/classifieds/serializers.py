@@ -2,16 +2,21 @@
 Classifieds serializers.
 """
 from rest_framework import serializers
+
+from core.fields import SrcsetField
+from core.renditions import build_srcset
 from .models import ClassifiedCategory, Classified, ClassifiedImage
 
 
 class ClassifiedImageSerializer(serializers.ModelSerializer):
     """Serializer for classified image."""
 
+    srcset = SrcsetField(source='image')
+
     class Meta:
         model = ClassifiedImage
-        fields = ['id', 'image', 'order', 'uploaded_at']
-        read_only_fields = ['uploaded_at']
+        fields = ['id', 'image', 'thumbnail', 'srcset', 'processing_status', 'order', 'uploaded_at']
+        read_only_fields = ['thumbnail', 'processing_status', 'uploaded_at']
 
 
 class ClassifiedAuthorSerializer(serializers.Serializer):
@@ -59,6 +64,7 @@ class ClassifiedListSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     images_count = serializers.SerializerMethodField()
     first_image = serializers.SerializerMethodField()
+    first_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Classified
@@ -75,6 +81,7 @@ class ClassifiedListSerializer(serializers.ModelSerializer):
             'views_count',
             'images_count',
             'first_image',
+            'first_image_srcset',
             'expires_at',
             'created_at',
         ]
@@ -82,12 +89,23 @@ class ClassifiedListSerializer(serializers.ModelSerializer):
     def get_images_count(self, obj):
         return obj.images.count()
 
+    def _first_image(self, obj):
+        # Uses the prefetched images instead of a query per row
+        images = obj.images.all()
+        return images[0] if images else None
+
     def get_first_image(self, obj):
-        first_image = obj.images.first()
+        first_image = self._first_image(obj)
         if first_image:
             return first_image.image.url
         return None
 
+    def get_first_image_srcset(self, obj):
+        first_image = self._first_image(obj)
+        if first_image:
+            return build_srcset(first_image.image.name)
+        return None
+
 
 class ClassifiedDetailSerializer(serializers.ModelSerializer):
     """Serializer for classified detail."""
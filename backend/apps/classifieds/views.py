@@ -8,6 +8,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.db.models import Q
 
+from core.images import schedule_thumbnails
+
 from .models import ClassifiedCategory, Classified, ClassifiedImage
 from .serializers import (
     ClassifiedCategorySerializer,
@@ -156,8 +158,10 @@ class ClassifiedViewSet(viewsets.ModelViewSet):
         image = ClassifiedImage.objects.create(
             classified=classified,
             image=request.FILES['image'],
-            order=order
+            order=order,
+            processing_status=ClassifiedImage.ProcessingStatus.PENDING
         )
+        schedule_thumbnails([image])
         return Response(ClassifiedImageSerializer(image).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['delete'], url_path='images/(?P<image_id>[^/.]+)')
@@ -58,6 +58,7 @@ class FAQItem(models.Model):
         return self.question
 
     def increment_views(self):
-        """Increment views counter."""
+        """Increment views counter (buffered, flushed by core.flush_view_counters)."""
+        from core.counters import faq_item_views
+        faq_item_views.hit(self.pk)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
@@ -7,6 +7,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db.models import Q
 
+from core.mixins import ConditionalGetMixin
+
 from .models import FAQCategory, FAQItem
 from .serializers import (
     FAQCategorySerializer,
@@ -17,8 +19,10 @@ from .serializers import (
 )
 
 
-class FAQCategoryViewSet(viewsets.ModelViewSet):
+class FAQCategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for FAQ categories."""
+    conditional_models = ('faq.FAQCategory', 'faq.FAQItem', 'accounts.User')
+    conditional_actions = ('list', 'retrieve', 'with_items')
 
     queryset = FAQCategory.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
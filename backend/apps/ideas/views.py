@@ -9,6 +9,8 @@ from rest_framework.views import APIView
 from django.db.models import Count, Q
 
 from core.pagination import StandardPagination
+from apps.accounts.mentions import resolve_mentions
+from apps.notifications.tasks import create_notifications
 from .models import Idea, IdeaVote, IdeaComment
 from .serializers import (
     IdeaSerializer,
@@ -196,6 +198,20 @@ class IdeaViewSet(viewsets.ModelViewSet):
                 link='/ideas'
             )
 
+        mentioned = [
+            user for user in resolve_mentions(comment.text)
+            if user.pk not in (request.user.pk, idea.author_id)
+        ]
+        create_notifications(
+            mentioned,
+            'comment',
+            'Упоминание в комментарии',
+            f'{request.user.get_full_name()} упомянул вас в комментарии к идее "{idea.title[:50]}"',
+            link='/ideas',
+            related_object_type='IdeaComment',
+            related_object_id=comment.pk,
+        )
+
         return Response(
             IdeaCommentSerializer(comment).data,
             status=status.HTTP_201_CREATED
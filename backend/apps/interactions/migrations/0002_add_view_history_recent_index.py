@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='viewhistory',
+            index=models.Index(fields=['user', '-viewed_at'], name='view_history_user_recent_idx'),
+        ),
+    ]
@@ -58,6 +58,10 @@ class ViewHistory(models.Model):
         verbose_name_plural = 'История просмотров'
         unique_together = ['user', 'viewed_user']
         ordering = ['-viewed_at']
+        indexes = [
+            # Latest views per user (history list, interactions.prune_view_history)
+            models.Index(fields=['user', '-viewed_at'], name='view_history_user_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} просмотрел {self.viewed_user}"
@@ -83,8 +87,7 @@ class ProfileView(models.Model):
         return f"{self.user}: {self.view_count} просмотров"
 
     def increment(self):
-        """Increment view count."""
-        from django.utils import timezone
+        """Increment view count (buffered, flushed by core.flush_view_counters)."""
+        from core.counters import profile_views
+        profile_views.hit(self.user_id)
         self.view_count += 1
-        self.last_viewed_at = timezone.now()
-        self.save(update_fields=['view_count', 'last_viewed_at'])
@@ -0,0 +1,33 @@
+"""
+Celery tasks for interactions.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='interactions.prune_view_history')
+def prune_view_history():
+    """
+    Keep only the VIEW_HISTORY_KEEP most recent profile views per user.
+    Runs daily.
+    """
+    import time
+
+    from django.conf import settings
+    from django.db.models import F, Window
+    from django.db.models.functions import RowNumber
+
+    from apps.interactions.models import ViewHistory
+    from core.maintenance import delete_in_chunks, report
+
+    started = time.monotonic()
+    stale = ViewHistory.objects.annotate(
+        rank=Window(RowNumber(), partition_by=F('user_id'), order_by=[F('viewed_at').desc(), F('id').desc()]),
+    ).filter(rank__gt=settings.VIEW_HISTORY_KEEP)
+    deleted = delete_in_chunks(stale)
+    result = report(started, deleted=deleted)
+    logger.info(f"Pruned view history: {deleted} rows in {result['seconds']}s")
+    return result
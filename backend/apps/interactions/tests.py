@@ -1,3 +1,124 @@
-from django.test import TestCase
+"""
+Tests for interactions app.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.interactions.models import ProfileView
+from core import counters
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        email='viewer@example.com',
+        password='testpass123',
+        first_name='Иван',
+        last_name='Петров',
+    )
+
+
+@pytest.fixture
+def viewed_user():
+    return User.objects.create_user(
+        email='viewed@example.com',
+        password='testpass123',
+        first_name='Мария',
+        last_name='Иванова',
+    )
+
+
+@pytest.fixture
+def buffered_counters():
+    """Use an in-process buffer that is only flushed explicitly."""
+    with override_settings(VIEW_COUNTER_BACKEND='local', VIEW_COUNTER_FLUSH_INTERVAL=3600):
+        counters.reset_backend()
+        yield
+    counters.reset_backend()
+
+
+@pytest.mark.django_db
+class TestProfileViewCounter:
+    """Tests for write-behind profile view counting."""
+
+    def test_record_creates_stats_on_flush(self, api_client, user, viewed_user, buffered_counters):
+        """Views are buffered and the stats row is created by the flush."""
+        api_client.force_authenticate(user=user)
+        for _ in range(3):
+            response = api_client.post('/api/v1/view-history/record/', {'user_id': viewed_user.id})
+            assert response.data == {'recorded': True}
+
+        assert not ProfileView.objects.filter(user=viewed_user).exists()
+
+        assert counters.flush_view_counters()['profile'] == 3
+        stats = ProfileView.objects.get(user=viewed_user)
+        assert stats.view_count == 3
+        assert stats.last_viewed_at is not None
+
+    def test_flush_adds_to_existing_count(self, viewed_user, buffered_counters):
+        """Deltas are added to the stored value, not written over it."""
+        ProfileView.objects.create(user=viewed_user, view_count=10)
+        counters.profile_views.hit(viewed_user.id)
+        counters.profile_views.hit(viewed_user.id)
+
+        counters.flush_view_counters()
+
+        assert ProfileView.objects.get(user=viewed_user).view_count == 12
+
+    def test_flush_without_views_is_noop(self, buffered_counters, django_assert_num_queries):
+        """An empty buffer doesn't touch the database."""
+        with django_assert_num_queries(0):
+            assert counters.flush_view_counters()['profile'] == 0
+
+    def test_failed_inline_flush_counts_view_once(self, viewed_user, monkeypatch):
+        """A view buffered before a failing flush isn't also written through."""
+        def fail(deltas):
+            raise RuntimeError('database unavailable')
+
+        with override_settings(VIEW_COUNTER_BACKEND='local', VIEW_COUNTER_FLUSH_INTERVAL=0):
+            counters.reset_backend()
+            monkeypatch.setattr(counters.profile_views, 'apply', fail)
+            counters.profile_views.hit(viewed_user.id)
+            monkeypatch.undo()
+
+            assert counters.flush_view_counters()['profile'] == 1
+        counters.reset_backend()
+        assert ProfileView.objects.get(user=viewed_user).view_count == 1
+
+
+@pytest.mark.django_db
+def test_prune_view_history(user, viewed_user, settings):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from apps.interactions.models import ViewHistory
+    from apps.interactions.tasks import prune_view_history
+
+    settings.VIEW_HISTORY_KEEP = 2
+    settings.MAINTENANCE_CHUNK_SIZE = 2
+    now = timezone.now()
+    others = [
+        User.objects.create_user(email=f'other{index}@example.com', password='x', first_name='A', last_name='B')
+        for index in range(5)
+    ]
+    for index, other in enumerate(others):
+        view = ViewHistory.objects.create(user=user, viewed_user=other)
+        ViewHistory.objects.filter(pk=view.pk).update(viewed_at=now - timedelta(minutes=index))
+    ViewHistory.objects.create(user=viewed_user, viewed_user=user)
+
+    result = prune_view_history()
+    assert result['deleted'] == 3
+    assert list(user.view_history.order_by('-viewed_at').values_list('viewed_user', flat=True)) == [
+        others[0].pk, others[1].pk,
+    ]
+    assert viewed_user.view_history.count() == 1
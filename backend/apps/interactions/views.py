@@ -13,11 +13,13 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin, DestroyModelMixin
 
-from apps.accounts.models import User
+from apps.accounts.models import User, UserStatus
 from apps.news.models import News, Comment
 from apps.achievements.models import AchievementAward
 from apps.kudos.models import Kudos
 from apps.skills.models import UserSkill, SkillEndorsement
+from core.counters import profile_views
+from core.mixins import ReplicaReadMixin
 from .models import Bookmark, ViewHistory, ProfileView
 from .serializers import (
     BookmarkSerializer,
@@ -175,6 +177,8 @@ class ViewHistoryViewSet(ListModelMixin, GenericViewSet):
             'viewed_user',
             'viewed_user__department',
             'viewed_user__position'
+        ).prefetch_related(
+            UserStatus.objects.prefetch_current('viewed_user__statuses')
         )[:20]  # Limit to 20 most recent
 
     @action(detail=False, methods=['post'])
@@ -200,9 +204,8 @@ class ViewHistoryViewSet(ListModelMixin, GenericViewSet):
             defaults={'viewed_at': timezone.now()}
         )
 
-        # Update profile view stats
-        profile_view, _ = ProfileView.objects.get_or_create(user=viewed_user)
-        profile_view.increment()
+        # Update profile view stats (the stats row is created on flush if missing)
+        profile_views.hit(viewed_user.id)
 
         return Response({'recorded': True})
 
@@ -213,7 +216,7 @@ class ViewHistoryViewSet(ListModelMixin, GenericViewSet):
         return Response({'cleared': count})
 
 
-class ProfileStatsView(APIView):
+class ProfileStatsView(ReplicaReadMixin, APIView):
     """Get profile statistics for a user."""
     permission_classes = [IsAuthenticated]
 
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kudos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kudos',
+            index=models.Index(fields=['-created_at', '-id'], name='kudos_created_id_idx'),
+        ),
+    ]
@@ -52,6 +52,10 @@ class Kudos(models.Model):
         verbose_name = _('благодарность')
         verbose_name_plural = _('благодарности')
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination (core.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='kudos_created_id_idx'),
+        ]
 
     def __str__(self):
         return f'{self.sender} → {self.recipient}: {self.get_category_display()}'
@@ -8,7 +8,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db.models import Q
 
-from core.pagination import StandardPagination
+from core.mixins import ReplicaReadMixin
+from core.pagination import FeedPagination
 from .models import Kudos
 from .serializers import (
     KudosSerializer,
@@ -27,7 +28,8 @@ class KudosViewSet(viewsets.ModelViewSet):
     destroy: Delete own kudos
     """
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardPagination
+    pagination_class = FeedPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         queryset = Kudos.objects.select_related(
@@ -134,7 +136,7 @@ class UserKudosView(APIView):
         return Response(serializer.data)
 
 
-class KudosStatsView(APIView):
+class KudosStatsView(ReplicaReadMixin, APIView):
     """Get kudos statistics."""
     permission_classes = [IsAuthenticated]
 
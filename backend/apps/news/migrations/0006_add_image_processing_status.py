@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_add_drafts_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsattachment',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20, verbose_name='processing status'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_add_content_addressed_blobs'),
+        ('news', '0006_add_image_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsattachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.fileblob', verbose_name='blob'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_add_content_addressed_blobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['-is_pinned', '-created_at', '-id'], name='news_pinned_created_id_idx'),
+        ),
+    ]
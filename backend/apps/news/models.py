@@ -4,6 +4,7 @@ News models: News, NewsAttachment, Comment, Reaction, Tag.
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.mixins import ContentAddressedFileMixin, ImageProcessingMixin
 from core.utils import news_attachment_upload_path
 
 
@@ -74,6 +75,10 @@ class News(models.Model):
         verbose_name = _('news')
         verbose_name_plural = _('news')
         ordering = ['-is_pinned', '-created_at']
+        indexes = [
+            # Keyset pagination (core.pagination.KeysetPagination)
+            models.Index(fields=['-is_pinned', '-created_at', '-id'], name='news_pinned_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -118,9 +123,11 @@ class News(models.Model):
         ).order_by('order', 'uploaded_at')
 
 
-class NewsAttachment(models.Model):
+class NewsAttachment(ContentAddressedFileMixin, ImageProcessingMixin, models.Model):
     """
     File attachment for news posts.
+    Files are stored by content (see core.FileBlob); image thumbnails
+    are generated in the background (see core.images).
     """
     news = models.ForeignKey(
         News,
@@ -212,46 +219,9 @@ class Comment(models.Model):
         return self.parent is not None
 
     def get_mentioned_users(self):
-        """Extract mentioned usernames from content.
-
-        Mentions are in format @username or @full_name
-        Returns a list of User objects.
-        """
-        import re
-        from apps.accounts.models import User
-
-        # Pattern: @ followed by word characters or quoted name
-        # @username or @"Full Name"
-        pattern = r'@(\w+)|@"([^"]+)"'
-        matches = re.findall(pattern, self.content)
-
-        usernames = []
-        full_names = []
-        for username, full_name in matches:
-            if username:
-                usernames.append(username)
-            if full_name:
-                full_names.append(full_name)
-
-        # Find users by email prefix (username) or full name
-        users = []
-        if usernames:
-            # Try to match username as email prefix
-            for username in usernames:
-                user = User.objects.filter(
-                    email__istartswith=f'{username}@'
-                ).first()
-                if user and user not in users:
-                    users.append(user)
-
-        if full_names:
-            for name in full_names:
-                # Try exact match on full_name
-                user = User.objects.filter(full_name__iexact=name).first()
-                if user and user not in users:
-                    users.append(user)
-
-        return users
+        """Return users mentioned as @username or @"Full Name" (one query)."""
+        from apps.accounts.mentions import resolve_mentions
+        return resolve_mentions(self.content)
 
 
 class Reaction(models.Model):
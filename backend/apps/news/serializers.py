@@ -6,6 +6,8 @@ import json
 from rest_framework import serializers
 
 from apps.accounts.serializers import UserBasicSerializer
+from core.fields import SrcsetField
+from core.renditions import build_srcset
 from .models import News, NewsAttachment, Comment, Reaction, Tag
 
 
@@ -43,15 +45,16 @@ class TagCreateSerializer(serializers.ModelSerializer):
 class NewsAttachmentSerializer(serializers.ModelSerializer):
     """Serializer for news attachments."""
     is_image = serializers.BooleanField(read_only=True)
+    srcset = SrcsetField(source='file')
 
     class Meta:
         model = NewsAttachment
         fields = [
-            'id', 'file', 'thumbnail', 'file_name', 'file_type',
+            'id', 'file', 'thumbnail', 'srcset', 'processing_status', 'file_name', 'file_type',
             'file_size', 'order', 'is_cover', 'is_image', 'uploaded_at'
         ]
         read_only_fields = [
-            'file_name', 'file_type', 'file_size', 'thumbnail',
+            'file_name', 'file_type', 'file_size', 'thumbnail', 'processing_status',
             'is_image', 'uploaded_at'
         ]
 
@@ -78,12 +81,19 @@ class CommentSerializer(serializers.ModelSerializer):
                   'updated_at', 'replies', 'replies_count']
 
     def get_replies(self, obj):
-        if obj.parent is None:  # Only get replies for top-level comments
+        # Reply tree assembled in memory by CommentViewSet.list
+        replies = getattr(obj, 'thread_replies', None)
+        if replies is None:
+            if obj.parent_id is not None:
+                return []
             replies = obj.replies.select_related('author')[:5]
-            return CommentSerializer(replies, many=True).data
-        return []
+        return CommentSerializer(replies, many=True, context=self.context).data
 
     def get_replies_count(self, obj):
+        if getattr(obj, 'replies_count', None) is not None:
+            return obj.replies_count
+        if getattr(obj, 'thread_replies', None) is not None:
+            return len(obj.thread_replies)
         return obj.replies.count()
 
 
@@ -141,6 +151,7 @@ class NewsListSerializer(serializers.ModelSerializer):
                 'id': cover.id,
                 'file': request.build_absolute_uri(cover.file.url) if request else cover.file.url,
                 'thumbnail': request.build_absolute_uri(cover.thumbnail.url) if request and cover.thumbnail else None,
+                'srcset': build_srcset(cover.file.name),
             }
         return None
 
@@ -1,12 +1,16 @@
 """
 Tests for news app.
 """
+from io import BytesIO
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from apps.news.models import News, Comment, Reaction
+from apps.news.models import News, NewsAttachment, Comment, Reaction
 
 User = get_user_model()
 
@@ -119,6 +123,29 @@ class TestCommentModel:
         )
         assert child.parent == parent
 
+    def test_get_mentioned_users(self, news, user, another_user, django_assert_num_queries):
+        """Handles and quoted names are resolved with one query."""
+        # SQLite LOWER() only folds ASCII, so the quoted names are Latin here
+        john = User.objects.create_user(
+            email='john@example.com', password='testpass123', first_name='John', last_name='Smith',
+        )
+        namesake = User.objects.create_user(
+            email='john2@example.com', password='testpass123',
+            first_name='John', last_name='Smith', patronymic='Junior',
+        )
+        User.objects.create_user(
+            email='archived@example.com', password='testpass123',
+            first_name='Old', last_name='Account', is_active=False,
+        )
+        comment = Comment.objects.create(
+            news=news,
+            author=user,
+            content='@Another и @"smith  john", @"Smith John Junior", @archived, @nobody',
+        )
+        with django_assert_num_queries(1):
+            mentioned = comment.get_mentioned_users()
+        assert {u.pk for u in mentioned} == {another_user.pk, john.pk, namesake.pk}
+
 
 @pytest.mark.django_db
 class TestReactionModel:
@@ -234,6 +261,59 @@ class TestCommentsAPI:
         })
         assert response.status_code == status.HTTP_201_CREATED
 
+    def test_list_comments_tree(self, authenticated_client, news, user, another_user, django_assert_max_num_queries):
+        """Threads come with their whole reply tree in constant queries."""
+        thread = Comment.objects.create(news=news, author=user, content='Тред')
+        reply = Comment.objects.create(news=news, author=another_user, content='Ответ', parent=thread)
+        Comment.objects.create(news=news, author=user, content='Ответ на ответ', parent=reply)
+        Comment.objects.create(news=news, author=another_user, content='Второй ответ', parent=thread)
+        Comment.objects.create(news=news, author=user, content='Второй тред')
+
+        with django_assert_max_num_queries(4):
+            response = authenticated_client.get(f'/api/v1/news/{news.id}/comments/')
+        assert response.status_code == status.HTTP_200_OK
+        first, second = response.data
+        assert first['replies_count'] == 2 and second['replies_count'] == 0
+        assert [r['content'] for r in first['replies']] == ['Ответ', 'Второй ответ']
+        assert first['replies'][0]['replies_count'] == 1
+        assert first['replies'][0]['replies'][0]['content'] == 'Ответ на ответ'
+
+    def test_list_comments_paginated(self, authenticated_client, news, user):
+        """Top-level threads are paginated on request, with their own reply trees."""
+        for index in range(3):
+            thread = Comment.objects.create(news=news, author=user, content=f'Тред {index}')
+            Comment.objects.create(news=news, author=user, content=f'Ответ {index}', parent=thread)
+        reply = Comment.objects.get(content='Ответ 0')
+        Comment.objects.create(news=news, author=user, content='Ответ на ответ', parent=reply)
+
+        response = authenticated_client.get(f'/api/v1/news/{news.id}/comments/', {'page_size': 2})
+        assert response.data['count'] == 3
+        assert [c['content'] for c in response.data['results']] == ['Тред 0', 'Тред 1']
+        first, second = response.data['results']
+        assert [r['content'] for r in second['replies']] == ['Ответ 1']
+        assert first['replies'][0]['replies'][0]['content'] == 'Ответ на ответ'
+
+    def test_create_comment_notifies_mentioned(self, authenticated_client, news, user, another_user):
+        """Author and mentioned users get one notification each, the commenter none."""
+        from apps.notifications.models import Notification
+
+        news.author = another_user
+        news.save()
+        third = User.objects.create_user(
+            email='third@example.com', password='testpass123', first_name='Пётр', last_name='Сидоров',
+        )
+        response = authenticated_client.post(f'/api/v1/news/{news.id}/comments/', {
+            'content': '@another @third @test',
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        notified = set(
+            Notification.objects.filter(related_object_type='Comment').values_list('user_id', 'title')
+        )
+        assert (another_user.pk, 'Новый комментарий') in notified
+        assert (third.pk, 'Упоминание в комментарии') in notified
+        assert (another_user.pk, 'Упоминание в комментарии') not in notified
+        assert user.pk not in {user_id for user_id, _ in notified}
+
     def test_update_own_comment(self, authenticated_client, news, user):
         """Test updating own comment."""
         comment = Comment.objects.create(
@@ -293,3 +373,195 @@ class TestReactionsAPI:
         Reaction.objects.create(news=news, user=another_user, type='celebrate')
         response = authenticated_client.get(f'/api/v1/news/{news.id}/reactions/')
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.fixture
+def image_upload():
+    buffer = BytesIO()
+    Image.new('RGB', (1200, 900), 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile('photo.png', buffer.getvalue(), content_type='image/png')
+
+
+@pytest.mark.django_db
+class TestAttachmentProcessing:
+    """Tests for background thumbnail generation."""
+
+    def test_upload_returns_pending_then_thumbnail_is_generated(
+        self, authenticated_client, news, image_upload, settings, tmp_path,
+        django_capture_on_commit_callbacks
+    ):
+        """Upload responds before the thumbnail exists; the task fills it in."""
+        settings.MEDIA_ROOT = tmp_path
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = authenticated_client.post(
+                f'/api/v1/news/{news.id}/attachments/',
+                {'file': image_upload},
+                format='multipart',
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['processing_status'] == 'pending'
+        assert response.data['thumbnail'] is None
+
+        for callback in callbacks:
+            callback()
+
+        attachment = NewsAttachment.objects.get(pk=response.data['id'])
+        assert attachment.processing_status == NewsAttachment.ProcessingStatus.READY
+        assert attachment.thumbnail
+        with Image.open(attachment.thumbnail) as thumb:
+            assert thumb.width <= 400 and thumb.height <= 300
+
+    def test_image_stuck_in_processing_is_recovered(
+        self, authenticated_client, news, image_upload, settings, tmp_path,
+        django_capture_on_commit_callbacks
+    ):
+        """Rows left in processing past the timeout are re-queued; fresh ones are left alone."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from core.images import recover_stuck_images
+
+        settings.MEDIA_ROOT = tmp_path
+        with django_capture_on_commit_callbacks():
+            response = authenticated_client.post(
+                f'/api/v1/news/{news.id}/attachments/',
+                {'file': image_upload},
+                format='multipart',
+            )
+        stuck = NewsAttachment.objects.get(pk=response.data['id'])
+        fresh = NewsAttachment.objects.create(
+            news=news, file=stuck.file.name, file_name='fresh.png', file_type='image/png',
+            processing_status=NewsAttachment.ProcessingStatus.PROCESSING,
+            processing_started_at=timezone.now(),
+        )
+        NewsAttachment.objects.filter(pk=stuck.pk).update(
+            processing_status=NewsAttachment.ProcessingStatus.PROCESSING,
+            processing_started_at=timezone.now() - timedelta(seconds=settings.IMAGE_PROCESSING_TIMEOUT + 1),
+        )
+
+        assert recover_stuck_images() == 1
+
+        stuck.refresh_from_db()
+        fresh.refresh_from_db()
+        assert stuck.processing_status == NewsAttachment.ProcessingStatus.READY
+        assert stuck.thumbnail
+        assert fresh.processing_status == NewsAttachment.ProcessingStatus.PROCESSING
+
+    def test_srcset_variant_is_generated_on_first_request(
+        self, authenticated_client, api_client, news, image_upload, settings, tmp_path
+    ):
+        """Srcset URLs point at variants that are rendered lazily and redirected to."""
+        from django.core.cache import cache
+
+        settings.MEDIA_ROOT = tmp_path
+        cache.clear()
+        response = authenticated_client.post(
+            f'/api/v1/news/{news.id}/attachments/',
+            {'file': image_upload},
+            format='multipart',
+        )
+        srcset = response.data['srcset']
+        assert set(srcset) == {'webp', 'jpeg'}
+        url, descriptor = srcset['webp'].split(', ')[2].split(' ')
+        assert descriptor == '400w'
+
+        # Variants are public like /media/, no credentials needed
+        api_client.force_authenticate(user=None)
+        variant = api_client.get(url)
+        assert variant.status_code == status.HTTP_302_FOUND
+        stored = tmp_path / variant['Location'].removeprefix(settings.MEDIA_URL)
+        with Image.open(stored) as img:
+            assert img.format == 'WEBP'
+            assert img.width == 400
+
+    def test_rendition_rejects_paths_outside_uploads(self, api_client):
+        """Only known upload folders and configured widths can be rendered."""
+        assert api_client.get('/api/v1/images/400/webp/../settings.png').status_code == 404
+        assert api_client.get('/api/v1/images/333/webp/avatars/a.png').status_code == 404
+
+
+@pytest.mark.django_db
+class TestNewsConditionalGet:
+    """Tests for ETag validation of the news detail."""
+
+    def test_reorder_attachments_changes_etag(self, authenticated_client, news):
+        first = NewsAttachment.objects.create(news=news, file='news/a.pdf', order=0)
+        second = NewsAttachment.objects.create(news=news, file='news/b.pdf', order=1)
+        url = f'/api/v1/news/{news.id}/'
+        etag = authenticated_client.get(url)['ETag']
+        assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = authenticated_client.post(
+            f'{url}attachments/reorder/', {'order': [second.id, first.id]}, format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_loads_object_once(self, authenticated_client, news):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(f'/api/v1/news/{news.id}/')
+        assert response.status_code == status.HTTP_200_OK
+        lookups = [q['sql'] for q in queries if 'FROM "news_news"' in q['sql'] and f'= {news.id}' in q['sql']]
+        assert len(lookups) == 1
+
+
+@pytest.mark.django_db
+class TestAttachmentDeduplication:
+    """Tests for content-addressed attachment storage."""
+
+    def upload(self, client, news, content):
+        return client.post(
+            f'/api/v1/news/{news.id}/attachments/',
+            {'file': SimpleUploadedFile('doc.pdf', content, content_type='application/pdf')},
+            format='multipart',
+        )
+
+    def test_identical_uploads_share_one_blob(self, authenticated_client, news, settings, tmp_path):
+        """The same content is stored once and reference-counted."""
+        from core.models import FileBlob
+        from core.tasks import collect_orphan_blobs
+
+        settings.MEDIA_ROOT = tmp_path
+        first = self.upload(authenticated_client, news, b'%PDF-1.4 same content')
+        second = self.upload(authenticated_client, news, b'%PDF-1.4 same content')
+        assert first.data['file'] == second.data['file']
+
+        blob = FileBlob.objects.get()
+        assert blob.ref_count == 2
+        assert blob.verify()
+
+        authenticated_client.delete(f'/api/v1/news/{news.id}/attachments/{first.data["id"]}/')
+        blob.refresh_from_db()
+        assert blob.ref_count == 1
+        assert blob.file.storage.exists(blob.file.name)
+
+        authenticated_client.delete(f'/api/v1/news/{news.id}/attachments/{second.data["id"]}/')
+        assert collect_orphan_blobs(grace_hours=0) == 1
+        assert not FileBlob.objects.exists()
+        assert not blob.file.storage.exists(blob.file.name)
+
+    def test_failed_save_releases_blob(self, news, settings, tmp_path, monkeypatch):
+        """A row that fails to save doesn't keep a reference on the blob."""
+        from django.db import DatabaseError, models
+        from apps.news.models import NewsAttachment
+        from core.models import FileBlob
+
+        model_save = models.Model.save
+
+        def save(instance, *args, **kwargs):
+            if isinstance(instance, NewsAttachment):
+                raise DatabaseError
+            return model_save(instance, *args, **kwargs)
+
+        settings.MEDIA_ROOT = tmp_path
+        monkeypatch.setattr(models.Model, 'save', save)
+        attachment = NewsAttachment(news=news, file=SimpleUploadedFile('doc.pdf', b'%PDF-1.4 orphan'))
+        with pytest.raises(DatabaseError):
+            attachment.save()
+        assert FileBlob.objects.get().ref_count == 0
+        assert attachment.blob_id is None
@@ -2,6 +2,7 @@
 Views for news app.
 """
 import json
+from collections import defaultdict
 
 from django.db.models import Count, Max
 from django.db import models
@@ -16,7 +17,11 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from apps.audit.models import AuditLog
 from apps.notifications.models import Notification
-from core.utils import generate_thumbnail
+from core.images import schedule_thumbnails
+from core.mixins import ConditionalGetMixin
+from core.models import ModelVersion
+from core.pagination import FeedPagination, OptInPagination
+from core.renditions import delete_renditions
 from .models import News, NewsAttachment, Comment, Reaction, Tag
 from .serializers import (
     NewsListSerializer,
@@ -33,10 +38,15 @@ from .serializers import (
 from .permissions import CanEditNews, CanPinNews
 
 
-class NewsViewSet(ModelViewSet):
+class NewsViewSet(ConditionalGetMixin, ModelViewSet):
     """CRUD for news."""
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
+    pagination_class = FeedPagination
+    keyset_ordering = ('-is_pinned', '-created_at', '-id')
+    conditional_models = (
+        'news.News', 'news.Comment', 'news.Reaction', 'news.NewsAttachment', 'news.Tag', 'accounts.User',
+    )
 
     def get_queryset(self):
         queryset = News.objects.select_related('author').prefetch_related('tags').annotate(
@@ -85,6 +95,7 @@ class NewsViewSet(ModelViewSet):
 
         # Handle attachments
         attachments = self.request.FILES.getlist('attachments')
+        created = []
         for idx, file in enumerate(attachments):
             attachment = NewsAttachment(
                 news=news,
@@ -95,20 +106,16 @@ class NewsViewSet(ModelViewSet):
                 order=idx
             )
 
-            # Generate thumbnail for images
+            # Thumbnails for images are generated in the background
             if file.content_type.startswith('image/'):
-                thumbnail = generate_thumbnail(file)
-                if thumbnail:
-                    attachment.thumbnail.save(
-                        f'thumb_{file.name}.jpg',
-                        thumbnail,
-                        save=False
-                    )
+                attachment.processing_status = NewsAttachment.ProcessingStatus.PENDING
                 # Set first image as cover if none set
                 if idx == 0:
                     attachment.is_cover = True
 
             attachment.save()
+            created.append(attachment)
+        schedule_thumbnails(created)
 
         AuditLog.log(
             user=self.request.user,
@@ -130,6 +137,7 @@ class NewsViewSet(ModelViewSet):
             max_order=models.Max('order')
         )['max_order'] or 0
 
+        created = []
         for idx, file in enumerate(attachments):
             attachment = NewsAttachment(
                 news=news,
@@ -140,17 +148,13 @@ class NewsViewSet(ModelViewSet):
                 order=max_order + idx + 1
             )
 
-            # Generate thumbnail for images
+            # Thumbnails for images are generated in the background
             if file.content_type.startswith('image/'):
-                thumbnail = generate_thumbnail(file)
-                if thumbnail:
-                    attachment.thumbnail.save(
-                        f'thumb_{file.name}.jpg',
-                        thumbnail,
-                        save=False
-                    )
+                attachment.processing_status = NewsAttachment.ProcessingStatus.PENDING
 
             attachment.save()
+            created.append(attachment)
+        schedule_thumbnails(created)
 
         # Handle deleted attachments
         delete_attachments = self.request.data.get('delete_attachments')
@@ -310,6 +314,8 @@ class NewsViewSet(ModelViewSet):
 
         for idx, attachment_id in enumerate(order_data):
             news.attachments.filter(pk=attachment_id).update(order=idx)
+        # update() bypasses the signals in core.signals
+        ModelVersion.objects.bump('news.NewsAttachment')
 
         return Response({'detail': 'Attachments reordered.'})
 
@@ -357,17 +363,12 @@ class NewsAttachmentView(APIView):
             order=max_order + 1
         )
 
-        # Generate thumbnail for images
+        # Thumbnails for images are generated in the background
         if file.content_type.startswith('image/'):
-            thumbnail = generate_thumbnail(file)
-            if thumbnail:
-                attachment.thumbnail.save(
-                    f'thumb_{file.name}.jpg',
-                    thumbnail,
-                    save=False
-                )
+            attachment.processing_status = NewsAttachment.ProcessingStatus.PENDING
 
         attachment.save()
+        schedule_thumbnails([attachment])
 
         return Response(
             NewsAttachmentSerializer(attachment).data,
@@ -394,22 +395,68 @@ class NewsAttachmentView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        attachment.file.delete()
+        # Blob-backed files are shared and removed by core.collect_orphan_blobs
+        if not attachment.blob_id:
+            delete_renditions(attachment.file.name)
+            attachment.file.delete()
         attachment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+def attach_reply_tree(roots, replies):
+    """Set ``thread_replies`` on every comment under ``roots`` from a flat list of replies."""
+    children = defaultdict(list)
+    for reply in replies:
+        children[reply.parent_id].append(reply)
+
+    stack = list(roots)
+    while stack:
+        comment = stack.pop()
+        comment.thread_replies = children.get(comment.pk, [])
+        stack.extend(comment.thread_replies)
+
+
 class CommentViewSet(ModelViewSet):
-    """CRUD for comments on news."""
+    """
+    CRUD for comments on news.
+
+    The list returns top-level threads with their whole reply tree: threads
+    (with annotated reply counts) and all replies are loaded with one query
+    each and linked in memory. Threads are paginated when the client passes
+    ``page`` or ``page_size``; then only the page's trees are loaded, one
+    query per reply level.
+    """
     permission_classes = [IsAuthenticated]
-    pagination_class = None  # Comments don't need pagination
+    pagination_class = OptInPagination
 
     def get_queryset(self):
         news_id = self.kwargs.get('news_id')
-        return Comment.objects.filter(
-            news_id=news_id,
-            parent__isnull=True  # Only top-level comments
-        ).select_related('author').prefetch_related('replies')
+        return Comment.objects.filter(news_id=news_id).select_related('author')
+
+    def list(self, request, *args, **kwargs):
+        comments = self.get_queryset()
+        threads = comments.filter(parent__isnull=True).annotate(
+            replies_count=Count('replies')
+        ).order_by('created_at', 'id')
+
+        page = self.paginate_queryset(threads)
+        roots = list(threads if page is None else page)
+        if roots and page is None:
+            replies = comments.filter(parent__isnull=False).order_by('created_at', 'id')
+            attach_reply_tree(roots, replies)
+        elif roots:
+            replies = []
+            parent_ids = [root.pk for root in roots]
+            while parent_ids:
+                level = list(comments.filter(parent_id__in=parent_ids).order_by('created_at', 'id'))
+                replies.extend(level)
+                parent_ids = [reply.pk for reply in level]
+            attach_reply_tree(roots, replies)
+
+        serializer = self.get_serializer(roots, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -423,51 +470,32 @@ class CommentViewSet(ModelViewSet):
             author=self.request.user
         )
 
-        # Track notified users to avoid duplicates
         news = comment.news
-        notified_users = set()
-
-        # Notify news author
-        if news.author and news.author != self.request.user:
-            Notification.objects.create(
-                user=news.author,
+        actor = self.request.user
+        actor_name = actor.get_full_name()
+        # One notification per user - the first reason wins (author, parent author, mention)
+        notifications = {}
+
+        def notify(user, title, message):
+            if user is None or user.pk == actor.pk or user.pk in notifications:
+                return
+            notifications[user.pk] = Notification(
+                user=user,
                 type=Notification.NotificationType.COMMENT,
-                title="Новый комментарий",
-                message=f"{self.request.user.get_full_name()} прокомментировал вашу новость",
+                title=title,
+                message=message,
                 link=f"/news/{news.id}",
                 related_object_type='Comment',
                 related_object_id=comment.id
             )
-            notified_users.add(news.author.id)
-
-        # If reply, notify parent comment author
-        if comment.parent and comment.parent.author and comment.parent.author != self.request.user:
-            if comment.parent.author.id not in notified_users:
-                Notification.objects.create(
-                    user=comment.parent.author,
-                    type=Notification.NotificationType.COMMENT,
-                    title="Ответ на комментарий",
-                    message=f"{self.request.user.get_full_name()} ответил на ваш комментарий",
-                    link=f"/news/{news.id}",
-                    related_object_type='Comment',
-                    related_object_id=comment.id
-                )
-                notified_users.add(comment.parent.author.id)
-
-        # Notify mentioned users
-        mentioned_users = comment.get_mentioned_users()
-        for user in mentioned_users:
-            if user != self.request.user and user.id not in notified_users:
-                Notification.objects.create(
-                    user=user,
-                    type=Notification.NotificationType.COMMENT,
-                    title="Упоминание в комментарии",
-                    message=f"{self.request.user.get_full_name()} упомянул вас в комментарии",
-                    link=f"/news/{news.id}",
-                    related_object_type='Comment',
-                    related_object_id=comment.id
-                )
-                notified_users.add(user.id)
+
+        notify(news.author, "Новый комментарий", f"{actor_name} прокомментировал вашу новость")
+        if comment.parent:
+            notify(comment.parent.author, "Ответ на комментарий", f"{actor_name} ответил на ваш комментарий")
+        for user in comment.get_mentioned_users():
+            notify(user, "Упоминание в комментарии", f"{actor_name} упомянул вас в комментарии")
+
+        Notification.objects.bulk_create(notifications.values())
 
     def destroy(self, request, *args, **kwargs):
         comment = self.get_object()
@@ -53,6 +53,8 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['user', 'created_at']),
+            # Keyset pagination (core.pagination.KeysetPagination)
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_id_idx'),
         ]
 
     def __str__(self):
@@ -7,10 +7,13 @@ from datetime import date, timedelta
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
+from core.replicas import use_replica
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +22,10 @@ def send_birthday_notifications():
     """
     Send notifications about upcoming birthdays.
     Runs daily to notify about birthdays happening today and tomorrow.
+
+    Users are scanned on a read replica; the check for notifications already
+    sent today reads the primary, since the replica may lag behind a previous
+    run or retry.
     """
     from apps.accounts.models import User
     from apps.notifications.models import Notification, NotificationSettings
@@ -26,27 +33,28 @@ def send_birthday_notifications():
     today = date.today()
     tomorrow = today + timedelta(days=1)
 
-    # Find users with birthdays today or tomorrow
-    birthday_users = User.objects.filter(
-        is_active=True,
-        is_archived=False,
-        birth_date__isnull=False
-    ).filter(
-        Q(birth_date__month=today.month, birth_date__day=today.day) |
-        Q(birth_date__month=tomorrow.month, birth_date__day=tomorrow.day)
-    )
-
-    if not birthday_users.exists():
-        logger.info("No birthdays today or tomorrow")
-        return 0
-
-    # Get all active users who want birthday notifications
-    recipients = User.objects.filter(
-        is_active=True,
-        is_archived=False
-    ).exclude(
-        pk__in=birthday_users.values_list('pk', flat=True)
-    )
+    with use_replica():  # daily read-heavy scan
+        # Find users with birthdays today or tomorrow
+        birthday_users = list(User.objects.filter(
+            is_active=True,
+            is_archived=False,
+            birth_date__isnull=False
+        ).filter(
+            Q(birth_date__month=today.month, birth_date__day=today.day) |
+            Q(birth_date__month=tomorrow.month, birth_date__day=tomorrow.day)
+        ))
+
+        if not birthday_users:
+            logger.info("No birthdays today or tomorrow")
+            return 0
+
+        # Get all active users who want birthday notifications
+        recipients = list(User.objects.filter(
+            is_active=True,
+            is_archived=False
+        ).exclude(
+            pk__in=[user.pk for user in birthday_users]
+        ).select_related('notification_settings'))
 
     notifications_created = 0
 
@@ -63,6 +71,14 @@ def send_birthday_notifications():
             title = f"🎂 Завтра день рождения!"
             message = f"Завтра день рождения у {birthday_user.get_full_name()}. Подготовьте поздравление!"
 
+        # Recipients already notified today (primary - see above)
+        notified = set(Notification.objects.using(DEFAULT_DB_ALIAS).filter(
+            type=Notification.NotificationType.BIRTHDAY,
+            related_object_type='User',
+            related_object_id=birthday_user.pk,
+            created_at__date=today
+        ).values_list('user_id', flat=True))
+
         for recipient in recipients:
             # Check if user wants birthday notifications
             try:
@@ -72,16 +88,7 @@ def send_birthday_notifications():
             except NotificationSettings.DoesNotExist:
                 pass  # Default is enabled
 
-            # Check if notification already exists for today
-            existing = Notification.objects.filter(
-                user=recipient,
-                type=Notification.NotificationType.BIRTHDAY,
-                related_object_type='User',
-                related_object_id=birthday_user.pk,
-                created_at__date=today
-            ).exists()
-
-            if existing:
+            if recipient.pk in notified:
                 continue
 
             Notification.objects.create(
@@ -201,6 +208,35 @@ def create_notification(
     return notification
 
 
+def create_notifications(
+    users,
+    notification_type: str,
+    title: str,
+    message: str,
+    link: str = '',
+    related_object_type: str = '',
+    related_object_id: int = None,
+):
+    """
+    Create the same notification for several users with one INSERT.
+    No emails are sent.
+    """
+    from apps.notifications.models import Notification
+
+    return Notification.objects.bulk_create([
+        Notification(
+            user=user,
+            type=notification_type,
+            title=title,
+            message=message,
+            link=link,
+            related_object_type=related_object_type,
+            related_object_id=related_object_id
+        )
+        for user in users
+    ])
+
+
 @shared_task(name='notifications.notify_achievement_awarded')
 def notify_achievement_awarded(award_id: int):
     """
@@ -115,6 +115,52 @@ class TestNotificationsAPI:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] >= 3
 
+    def test_unread_stream_wsgi(self, authenticated_client, notification):
+        """Under WSGI the stream sends the current count and closes."""
+        response = authenticated_client.get(
+            '/api/v1/notifications/stream/', HTTP_ACCEPT='text/event-stream',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        body = b''.join(response.streaming_content).decode()
+        assert 'event: unread\ndata: {"count": 1}\n\n' in body
+
+    def test_unread_stream_asgi(self, authenticated_client, notification, settings):
+        """Under ASGI the stream is async; EventSource passes a stream ticket in the query."""
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        settings.NOTIFICATION_STREAM_MAX_DURATION = 0
+        response = authenticated_client.post('/api/v1/notifications/stream/ticket/')
+        assert response.data['expires_in'] == settings.NOTIFICATION_STREAM_TICKET_LIFETIME
+        ticket = response.data['ticket']
+
+        async def read_stream():
+            response = await AsyncClient().get(
+                '/api/v1/notifications/stream/', {'ticket': ticket}, headers={'accept': 'text/event-stream'},
+            )
+            return response.status_code, [chunk async for chunk in response.streaming_content]
+
+        status_code, chunks = async_to_sync(read_stream)()
+        assert status_code == status.HTTP_200_OK
+        assert b''.join(chunks).decode().endswith('event: unread\ndata: {"count": 1}\n\n')
+
+    def test_unread_stream_requires_auth(self, api_client):
+        response = api_client.get('/api/v1/notifications/stream/', {'ticket': 'invalid'})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_stream_ticket_is_single_purpose(self, api_client, user):
+        """Access tokens aren't accepted as tickets, nor tickets as access tokens."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        from core.authentication import StreamTicket
+
+        response = api_client.get('/api/v1/notifications/stream/', {'ticket': str(AccessToken.for_user(user))})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {StreamTicket.for_user(user)}')
+        response = api_client.get('/api/v1/notifications/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
     def test_mark_as_read(self, authenticated_client, notification):
         """Test marking notification as read."""
         response = authenticated_client.post(
@@ -168,3 +214,58 @@ class TestNotificationsAPI:
         api_client.force_authenticate(user=other_user)
         response = api_client.get(f'/api/v1/notifications/{notification.id}/')
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestNotificationsCursorPagination:
+    """Tests for opt-in keyset pagination of the notifications list."""
+
+    def test_default_is_page_number(self, authenticated_client, notification):
+        """Clients that don't opt in keep count/page responses."""
+        response = authenticated_client.get('/api/v1/notifications/')
+        assert response.data['count'] == 1
+
+    def test_cursor_walks_all_pages_without_duplicates(self, authenticated_client, user):
+        """Following next links returns every row once, newest first."""
+        Notification.objects.bulk_create([
+            Notification(user=user, type=Notification.NotificationType.NEWS, title=f'N{i}', message='')
+            for i in range(25)
+        ])
+        expected = list(
+            Notification.objects.filter(user=user).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+        seen = []
+        response = authenticated_client.get('/api/v1/notifications/', {'pagination': 'cursor'})
+        assert 'count' not in response.data
+        while True:
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = authenticated_client.get(response.data['next'])
+
+        assert seen == expected
+
+    def test_invalid_cursor_is_404(self, authenticated_client):
+        response = authenticated_client.get('/api/v1/notifications/', {'cursor': 'garbage'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_birthday_notifications_sent_once(user, django_assert_max_num_queries):
+    """A second run on the same day doesn't notify again."""
+    from datetime import date
+    from apps.notifications.tasks import send_birthday_notifications
+
+    User.objects.create_user(
+        email='birthday@example.com', password='testpass123',
+        first_name='Анна', last_name='Смирнова', birth_date=date.today().replace(year=1992),  # leap year
+    )
+    NotificationSettings.objects.create(user=User.objects.create_user(
+        email='muted@example.com', password='testpass123', first_name='Олег', last_name='Орлов',
+    ), birthdays_enabled=False)
+
+    assert send_birthday_notifications() == 1
+    with django_assert_max_num_queries(3):
+        assert send_birthday_notifications() == 0
+    assert Notification.objects.filter(user=user, type=Notification.NotificationType.BIRTHDAY).count() == 1
@@ -6,6 +6,8 @@ from django.urls import path
 from apps.notifications.views import (
     NotificationListView,
     UnreadCountView,
+    NotificationStreamView,
+    NotificationStreamTicketView,
     MarkAsReadView,
     MarkAllAsReadView,
     NotificationSettingsView,
@@ -14,6 +16,8 @@ from apps.notifications.views import (
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notifications-list'),
     path('unread-count/', UnreadCountView.as_view(), name='notifications-unread-count'),
+    path('stream/', NotificationStreamView.as_view(), name='notifications-stream'),
+    path('stream/ticket/', NotificationStreamTicketView.as_view(), name='notifications-stream-ticket'),
     path('<int:pk>/read/', MarkAsReadView.as_view(), name='notification-read'),
     path('read-all/', MarkAllAsReadView.as_view(), name='notifications-read-all'),
     path('settings/', NotificationSettingsView.as_view(), name='notification-settings'),
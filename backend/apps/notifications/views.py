@@ -1,13 +1,21 @@
 """
 Views for notifications app.
 """
+import asyncio
+import json
+
+from django.conf import settings as django_settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView
+from rest_framework.settings import api_settings
 
-from core.pagination import SmallPagination
+from core.async_views import AsyncAPIView, is_asgi_request
+from core.authentication import StreamTicket, StreamTicketAuthentication
+from core.pagination import SmallFeedPagination
 from .models import Notification, NotificationSettings
 from .serializers import NotificationSerializer, NotificationSettingsSerializer
 
@@ -16,24 +24,90 @@ class NotificationListView(ListAPIView):
     """List user's notifications."""
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = SmallPagination
+    pagination_class = SmallFeedPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
 
 
-class UnreadCountView(APIView):
+def unread_notifications(user_id):
+    return Notification.objects.filter(user_id=user_id, is_read=False)
+
+
+class UnreadCountView(AsyncAPIView):
     """Get count of unread notifications."""
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
+    async def get(self, request):
+        count = await unread_notifications(request.user.pk).acount()
         return Response({'count': count})
 
 
+class NotificationStreamTicketView(APIView):
+    """Issue a ticket for opening the notification stream (``?ticket=``)."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ticket = StreamTicket.for_user(request.user)
+        return Response({'ticket': str(ticket), 'expires_in': int(ticket.lifetime.total_seconds())})
+
+
+def format_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+class NotificationStreamView(AsyncAPIView):
+    """
+    Server-sent events with the unread notification count.
+
+    Sends ``event: unread`` on connect and whenever the count changes, with
+    keep-alive comments in between, and closes after
+    NOTIFICATION_STREAM_MAX_DURATION seconds (EventSource reconnects by itself).
+    EventSource can't send headers, so it authenticates with a short-lived
+    ``?ticket=`` from NotificationStreamTicketView - the access token never
+    appears in a URL. Under WSGI only the initial event is sent - a held-open
+    stream would block a sync worker - and the client reconnects after
+    ``retry``.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [StreamTicketAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/event-stream matches no renderer; errors still render as JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    async def get(self, request):
+        interval = django_settings.NOTIFICATION_STREAM_POLL_INTERVAL
+        retry = f'retry: {interval * 1000}\n\n'
+        if is_asgi_request(request):
+            events = self.unread_events(request.user.pk, interval, retry)
+        else:
+            count = await unread_notifications(request.user.pk).acount()
+            events = iter([retry, format_event('unread', {'count': count})])
+
+        response = StreamingHttpResponse(events, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx must not buffer the stream
+        return response
+
+    async def unread_events(self, user_id, interval, retry):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + django_settings.NOTIFICATION_STREAM_MAX_DURATION
+        yield retry
+        last_count = None
+        while True:
+            count = await unread_notifications(user_id).acount()
+            if count != last_count:
+                yield format_event('unread', {'count': count})
+                last_count = count
+            else:
+                yield ': keep-alive\n\n'
+            if loop.time() >= deadline:
+                return
+            await asyncio.sleep(interval)
+
+
 class MarkAsReadView(APIView):
     """Mark notification as read."""
     permission_classes = [IsAuthenticated]
@@ -5,3 +5,7 @@ class OkrConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.okr'
     verbose_name = 'OKR'
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        import apps.okr.signals  # noqa
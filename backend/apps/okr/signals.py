@@ -0,0 +1,50 @@
+"""
+Signal handlers keeping cached OKR statistics fresh.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import CheckIn, KeyResult, Objective
+from .stats import invalidate
+
+
+def invalidate_owner_stats(owner_id, company):
+    """Refresh stats of an owner and their manager (team stats) after commit."""
+    from apps.accounts.models import User
+
+    manager_id = User.objects.filter(pk=owner_id).values_list('manager_id', flat=True).first()
+    transaction.on_commit(lambda: invalidate([owner_id, manager_id], company=company))
+
+
+@receiver(pre_save, sender=Objective)
+def remember_objective_scope(sender, instance, raw=False, **kwargs):
+    """Keep the stored owner and level, whose stats change too when they are edited."""
+    instance._previous_scope = None
+    if instance.pk and not raw:
+        instance._previous_scope = Objective.objects.filter(pk=instance.pk).values_list('owner_id', 'level').first()
+
+
+@receiver([post_save, post_delete], sender=Objective)
+def objective_changed(sender, instance, **kwargs):
+    # Company stats only count company objectives - bump them when the
+    # objective is or was one
+    company = instance.level == Objective.Level.COMPANY
+    previous_owner_id, previous_level = getattr(instance, '_previous_scope', None) or (instance.owner_id, instance.level)
+    company = company or previous_level == Objective.Level.COMPANY
+    invalidate_owner_stats(instance.owner_id, company=company)
+    if previous_owner_id != instance.owner_id:
+        invalidate_owner_stats(previous_owner_id, company=False)
+
+
+@receiver([post_save, post_delete], sender=KeyResult)
+def key_result_changed(sender, instance, **kwargs):
+    objective = Objective.objects.filter(pk=instance.objective_id).values('owner_id', 'level').first()
+    if objective:
+        invalidate_owner_stats(objective['owner_id'], company=objective['level'] == Objective.Level.COMPANY)
+
+
+@receiver(post_save, sender=CheckIn)
+def check_in_created(sender, instance, created, **kwargs):
+    if created:
+        key_result_changed(sender, instance.key_result)
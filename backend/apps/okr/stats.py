@@ -0,0 +1,182 @@
+"""
+OKR statistics for the dashboard (``OKRStatsView``).
+
+``compute_stats()`` builds the response from a handful of grouped queries:
+one conditional aggregate over objectives (per status, level, team and
+company), one over key results (averages, KR states), one ``Case``-bucketed
+progress distribution, plus recent check-ins and top objectives.
+
+``get_stats()`` caches the result per user and period. Cache keys embed
+version counters that are bumped when objectives, key results or check-ins
+change (see ``signals.py``): the owner's and their manager's counters for
+their own and team stats, and a shared counter for company stats. The
+counters live in the default cache, which must be shared between processes
+(Redis in production) for a bump in one worker to reach the others.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Case, Count, F, Max, Q, Sum, Value, When
+
+from .models import CheckIn, KeyResult, Objective
+
+COMPANY_VERSION_KEY = 'okr:stats:v:company'
+
+PROGRESS_BUCKETS = (
+    ('0-25', 0, 25),
+    ('25-50', 25, 50),
+    ('50-75', 50, 75),
+    ('75-100', 75, 101),
+)
+
+
+def _user_version_key(user_id):
+    return f'okr:stats:v:{user_id}'
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate(user_ids, company=False):
+    """Drop cached stats of ``user_ids`` and, with ``company``, of everyone."""
+    for user_id in set(user_ids):
+        if user_id:
+            _bump(_user_version_key(user_id))
+    if company:
+        _bump(COMPANY_VERSION_KEY)
+
+
+def get_stats(user, period_id=None):
+    versions = cache.get_many([_user_version_key(user.pk), COMPANY_VERSION_KEY])
+    key = 'okr:stats:{}:{}:{}:{}'.format(
+        user.pk, period_id or 'all',
+        versions.get(_user_version_key(user.pk), 0), versions.get(COMPANY_VERSION_KEY, 0),
+    )
+    data = cache.get(key)
+    if data is None:
+        data = compute_stats(user, period_id)
+        cache.set(key, data, settings.OKR_STATS_CACHE_TIMEOUT)
+    return data
+
+
+def compute_stats(user, period_id=None):
+    objectives = Objective.objects.all()
+    if period_id:
+        objectives = objectives.filter(period_id=period_id)
+
+    active = Q(status=Objective.Status.ACTIVE)
+    mine = Q(owner=user)
+    team = mine | Q(owner__in=user.subordinates.values('id'))
+    company = Q(level=Objective.Level.COMPANY)
+
+    counts = objectives.aggregate(
+        my_total=Count('id', filter=mine),
+        my_active=Count('id', filter=mine & active),
+        team_total=Count('id', filter=team),
+        team_active=Count('id', filter=team & active),
+        company_total=Count('id', filter=company),
+        company_active=Count('id', filter=company & active),
+        **{f'status_{value}': Count('id', filter=mine & Q(status=value)) for value in Objective.Status.values},
+        **{f'level_{value}': Count('id', filter=mine & Q(level=value)) for value in Objective.Level.values},
+    )
+
+    key_results = KeyResult.objects.filter(objective__in=objectives.filter(team | company))
+    kr_active = Q(objective__status=Objective.Status.ACTIVE)
+    kr_mine = Q(objective__owner=user)
+    kr_team = kr_mine | Q(objective__owner__in=user.subordinates.values('id'))
+    kr_stats = key_results.aggregate(
+        my_avg=Avg('progress', filter=kr_mine & kr_active),
+        team_avg=Avg('progress', filter=kr_team & kr_active),
+        company_avg=Avg('progress', filter=Q(objective__level=Objective.Level.COMPANY) & kr_active),
+        total=Count('id', filter=kr_mine),
+        completed=Count('id', filter=kr_mine & Q(progress__gte=100)),
+        in_progress=Count('id', filter=kr_mine & Q(progress__gt=0, progress__lt=100)),
+        not_started=Count('id', filter=kr_mine & Q(progress=0)),
+    )
+
+    # Active objectives having a key result in each progress bucket
+    distribution = dict.fromkeys((name for name, _, _ in PROGRESS_BUCKETS), 0)
+    buckets = (
+        KeyResult.objects.filter(objective__in=objectives.filter(mine & active))
+        .annotate(bucket=Case(
+            *(When(progress__gte=low, progress__lt=high, then=Value(name)) for name, low, high in PROGRESS_BUCKETS),
+            default=Value(''),
+        ))
+        .values('bucket')
+        .annotate(objectives=Count('objective', distinct=True))
+        .order_by()
+    )
+    for row in buckets:
+        if row['bucket']:
+            distribution[row['bucket']] = row['objectives']
+
+    recent_check_ins = (
+        CheckIn.objects.filter(key_result__objective__owner=user)
+        .select_related('key_result__objective')
+        .order_by('-created_at')[:5]
+    )
+
+    top_objectives = (
+        objectives.filter(mine & active)
+        .annotate(
+            top_progress=Max('key_results__progress'),
+            kr_count=Count('key_results'),
+            kr_progress=Sum('key_results__progress'),
+        )
+        .order_by(F('top_progress').desc(nulls_last=True), '-created_at')[:5]
+    )
+
+    return {
+        'my_stats': {
+            'total': counts['my_total'],
+            'active': counts['my_active'],
+            'avg_progress': round(kr_stats['my_avg'] or 0, 1),
+            'by_status': {value: counts[f'status_{value}'] for value in Objective.Status.values},
+            'by_level': {value: counts[f'level_{value}'] for value in Objective.Level.values},
+        },
+        'team_stats': {
+            'total': counts['team_total'],
+            'active': counts['team_active'],
+            'avg_progress': round(kr_stats['team_avg'] or 0, 1),
+        },
+        'company_stats': {
+            'total': counts['company_total'],
+            'active': counts['company_active'],
+            'avg_progress': round(kr_stats['company_avg'] or 0, 1),
+        },
+        'key_results': {
+            'total': kr_stats['total'],
+            'completed': kr_stats['completed'],
+            'in_progress': kr_stats['in_progress'],
+            'not_started': kr_stats['not_started'],
+        },
+        'progress_distribution': distribution,
+        'recent_check_ins': [
+            {
+                'id': ci.id,
+                'key_result_title': ci.key_result.title,
+                'objective_title': ci.key_result.objective.title,
+                'previous_value': float(ci.previous_value),
+                'new_value': float(ci.new_value),
+                'previous_progress': ci.previous_progress,
+                'new_progress': ci.new_progress,
+                'comment': ci.comment,
+                'created_at': ci.created_at.isoformat(),
+            }
+            for ci in recent_check_ins
+        ],
+        'top_objectives': [
+            {
+                'id': obj.id,
+                'title': obj.title,
+                'level': obj.level,
+                # Same rounding as Objective.progress
+                'progress': round(obj.kr_progress / obj.kr_count) if obj.kr_count else 0,
+                'key_results_count': obj.kr_count,
+            }
+            for obj in top_objectives
+        ],
+    }
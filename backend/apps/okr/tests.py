@@ -0,0 +1,120 @@
+"""
+Tests for okr app.
+"""
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+
+from apps.okr.models import KeyResult, Objective, OKRPeriod
+from apps.okr.stats import compute_stats, get_stats
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def okr_data(user_factory):
+    manager = user_factory(email='manager@example.com')
+    subordinate = user_factory(email='dev@example.com', manager=manager)
+    today = date.today()
+    period = OKRPeriod.objects.create(name='Q1', starts_at=today, ends_at=today + timedelta(days=90))
+
+    mine = Objective.objects.create(
+        period=period, title='Mine', owner=manager, status=Objective.Status.ACTIVE,
+    )
+    tracked = KeyResult.objects.create(objective=mine, title='KR 1', target_value=100, current_value=10)
+    KeyResult.objects.create(objective=mine, title='KR 2', type=KeyResult.ResultType.QUALITATIVE, progress=60)
+    company = Objective.objects.create(
+        period=period, title='Company', owner=manager, level=Objective.Level.COMPANY,
+    )
+    KeyResult.objects.create(objective=company, title='KR 3', type=KeyResult.ResultType.QUALITATIVE, progress=100)
+    team = Objective.objects.create(
+        period=period, title='Team', owner=subordinate, status=Objective.Status.ACTIVE,
+    )
+    KeyResult.objects.create(objective=team, title='KR 4', type=KeyResult.ResultType.QUALITATIVE, progress=30)
+    return manager, period, mine, tracked
+
+
+@pytest.mark.django_db
+class TestOKRStats:
+    """Tests for the OKR stats aggregates and their cache."""
+
+    def test_compute_stats(self, okr_data, django_assert_max_num_queries):
+        manager, period, mine, tracked = okr_data
+        with django_assert_max_num_queries(5):
+            stats = compute_stats(manager, period.id)
+
+        assert stats['my_stats'] == {
+            'total': 2,
+            'active': 1,
+            'avg_progress': 35.0,
+            'by_status': {'draft': 1, 'active': 1, 'completed': 0, 'cancelled': 0},
+            'by_level': {'company': 1, 'department': 0, 'personal': 1},
+        }
+        assert stats['team_stats'] == {'total': 3, 'active': 2, 'avg_progress': 33.3}
+        assert stats['company_stats'] == {'total': 1, 'active': 0, 'avg_progress': 0}
+        assert stats['key_results'] == {'total': 3, 'completed': 1, 'in_progress': 2, 'not_started': 0}
+        assert stats['progress_distribution'] == {'0-25': 1, '25-50': 0, '50-75': 1, '75-100': 0}
+        assert stats['top_objectives'] == [
+            {'id': mine.id, 'title': 'Mine', 'level': 'personal', 'progress': 35, 'key_results_count': 2},
+        ]
+
+    def test_snapshot_refreshed_on_check_in(
+        self, api_client, okr_data, django_assert_num_queries, django_capture_on_commit_callbacks,
+    ):
+        manager, period, mine, tracked = okr_data
+        api_client.force_authenticate(user=manager)
+        url = '/api/v1/okr/stats/'
+        response = api_client.get(url, {'period': period.id})
+        assert response.data['my_stats']['avg_progress'] == 35.0
+
+        with django_assert_num_queries(0):
+            assert get_stats(manager, str(period.id)) == response.data
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(f'/api/v1/okr/key-results/{tracked.id}/check-in/', {'new_value': 80})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = api_client.get(url, {'period': period.id})
+        assert response.data['my_stats']['avg_progress'] == 70.0
+        assert response.data['recent_check_ins'][0]['new_progress'] == 80
+
+    def test_company_version_bumped_only_for_company_objectives(
+        self, okr_data, user_factory, django_capture_on_commit_callbacks,
+    ):
+        from apps.okr.stats import COMPANY_VERSION_KEY
+
+        manager, period, mine, tracked = okr_data
+        other = user_factory(email='other@example.com')
+        get_stats(other, period.id)
+        cache.set(COMPANY_VERSION_KEY, 1, None)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            mine.title = 'Renamed'
+            mine.save()
+        assert cache.get(COMPANY_VERSION_KEY) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            mine.level = Objective.Level.COMPANY
+            mine.save()
+        assert cache.get(COMPANY_VERSION_KEY) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            mine.level = Objective.Level.PERSONAL
+            mine.save()
+        assert cache.get(COMPANY_VERSION_KEY) == 3
+
+    def test_owner_change_refreshes_previous_owner(self, okr_data, user_factory, django_capture_on_commit_callbacks):
+        manager, period, mine, tracked = okr_data
+        assert get_stats(manager, period.id)['my_stats']['total'] == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            mine.owner = user_factory(email='new-owner@example.com')
+            mine.save()
+        assert get_stats(manager, period.id)['my_stats']['total'] == 1
@@ -5,7 +5,9 @@ from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.mixins import ReplicaReadMixin
 from .models import OKRPeriod, Objective, KeyResult, CheckIn
+from .stats import get_stats
 from .serializers import (
     OKRPeriodSerializer,
     ObjectiveListSerializer, ObjectiveDetailSerializer,
@@ -247,121 +249,9 @@ class StatusesView(viewsets.ViewSet):
         return Response(statuses)
 
 
-class OKRStatsView(viewsets.ViewSet):
+class OKRStatsView(ReplicaReadMixin, viewsets.ViewSet):
     """ViewSet для статистики OKR"""
     permission_classes = [permissions.IsAuthenticated]
 
     def list(self, request):
-        from django.db.models import Avg, Count
-        from django.db.models.functions import TruncDate
-
-        user = request.user
-        period_id = request.query_params.get('period')
-
-        # Base queryset
-        objectives_qs = Objective.objects.all()
-        if period_id:
-            objectives_qs = objectives_qs.filter(period_id=period_id)
-
-        # My objectives
-        my_objectives = objectives_qs.filter(owner=user)
-        my_active = my_objectives.filter(status=Objective.Status.ACTIVE)
-
-        # Calculate average progress for my objectives
-        my_avg_progress = my_active.aggregate(avg=Avg('key_results__progress'))['avg'] or 0
-
-        # Count by status
-        my_by_status = {}
-        for status_choice in Objective.Status.choices:
-            my_by_status[status_choice[0]] = my_objectives.filter(status=status_choice[0]).count()
-
-        # Count by level
-        my_by_level = {}
-        for level_choice in Objective.Level.choices:
-            my_by_level[level_choice[0]] = my_objectives.filter(level=level_choice[0]).count()
-
-        # Team objectives (subordinates)
-        subordinates = user.subordinates.values_list('id', flat=True)
-        team_objectives = objectives_qs.filter(Q(owner=user) | Q(owner__in=subordinates))
-        team_active = team_objectives.filter(status=Objective.Status.ACTIVE)
-        team_avg_progress = team_active.aggregate(avg=Avg('key_results__progress'))['avg'] or 0
-
-        # Company objectives
-        company_objectives = objectives_qs.filter(level=Objective.Level.COMPANY)
-        company_active = company_objectives.filter(status=Objective.Status.ACTIVE)
-        company_avg_progress = company_active.aggregate(avg=Avg('key_results__progress'))['avg'] or 0
-
-        # Key Results stats
-        my_key_results = KeyResult.objects.filter(objective__in=my_objectives)
-        kr_total = my_key_results.count()
-        kr_completed = my_key_results.filter(progress__gte=100).count()
-        kr_in_progress = my_key_results.filter(progress__gt=0, progress__lt=100).count()
-        kr_not_started = my_key_results.filter(progress=0).count()
-
-        # Progress distribution for my active objectives
-        progress_distribution = {
-            '0-25': my_active.filter(key_results__progress__gte=0, key_results__progress__lt=25).distinct().count(),
-            '25-50': my_active.filter(key_results__progress__gte=25, key_results__progress__lt=50).distinct().count(),
-            '50-75': my_active.filter(key_results__progress__gte=50, key_results__progress__lt=75).distinct().count(),
-            '75-100': my_active.filter(key_results__progress__gte=75, key_results__progress__lte=100).distinct().count(),
-        }
-
-        # Recent check-ins
-        recent_check_ins = CheckIn.objects.filter(
-            key_result__objective__owner=user
-        ).order_by('-created_at')[:5]
-
-        recent_check_ins_data = []
-        for ci in recent_check_ins:
-            recent_check_ins_data.append({
-                'id': ci.id,
-                'key_result_title': ci.key_result.title,
-                'objective_title': ci.key_result.objective.title,
-                'previous_value': float(ci.previous_value),
-                'new_value': float(ci.new_value),
-                'previous_progress': ci.previous_progress,
-                'new_progress': ci.new_progress,
-                'comment': ci.comment,
-                'created_at': ci.created_at.isoformat(),
-            })
-
-        # Top objectives by progress
-        top_objectives = my_active.order_by('-key_results__progress')[:5]
-        top_objectives_data = []
-        for obj in top_objectives:
-            top_objectives_data.append({
-                'id': obj.id,
-                'title': obj.title,
-                'level': obj.level,
-                'progress': obj.progress,
-                'key_results_count': obj.key_results.count(),
-            })
-
-        return Response({
-            'my_stats': {
-                'total': my_objectives.count(),
-                'active': my_active.count(),
-                'avg_progress': round(my_avg_progress, 1),
-                'by_status': my_by_status,
-                'by_level': my_by_level,
-            },
-            'team_stats': {
-                'total': team_objectives.count(),
-                'active': team_active.count(),
-                'avg_progress': round(team_avg_progress, 1),
-            },
-            'company_stats': {
-                'total': company_objectives.count(),
-                'active': company_active.count(),
-                'avg_progress': round(company_avg_progress, 1),
-            },
-            'key_results': {
-                'total': kr_total,
-                'completed': kr_completed,
-                'in_progress': kr_in_progress,
-                'not_started': kr_not_started,
-            },
-            'progress_distribution': progress_distribution,
-            'recent_check_ins': recent_check_ins_data,
-            'top_objectives': top_objectives_data,
-        })
+        return Response(get_stats(request.user, request.query_params.get('period')))
@@ -57,6 +57,21 @@ class Department(models.Model):
             descendants.extend(child.get_descendants())
         return descendants
 
+    def get_subtree_ids(self):
+        """Ids of this department and all its descendants (one query)."""
+        children = {}
+        for department_id, parent_id in Department.objects.values_list('id', 'parent_id'):
+            children.setdefault(parent_id, []).append(department_id)
+
+        subtree = [self.pk]
+        seen = {self.pk}
+        for department_id in subtree:
+            for child_id in children.get(department_id, []):
+                if child_id not in seen:
+                    seen.add(child_id)
+                    subtree.append(child_id)
+        return subtree
+
     def get_full_path(self):
         """Get full path from root to this department."""
         ancestors = self.get_ancestors()
@@ -241,3 +241,99 @@ class TestOrganizationTree:
 
         response = authenticated_client.get('/api/v1/organization/tree/')
         assert response.status_code == status.HTTP_200_OK
+
+    def test_tree_conditional_get(self, authenticated_client, department):
+        """A matching If-None-Match gets 304 until the tree changes."""
+        url = '/api/v1/organization/tree/'
+        response = authenticated_client.get(url)
+        etag = response['ETag']
+        assert response.status_code == status.HTTP_200_OK
+        assert 'no-cache' in response['Cache-Control']
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+        department.name = 'Отдел платформы'
+        department.save()
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data[0]['name'] == 'Отдел платформы'
+
+
+@pytest.mark.django_db
+class TestDepartmentSkillsMatrix:
+    """Tests for the department skills matrix endpoint."""
+
+    @pytest.fixture
+    def matrix_data(self, user):
+        from apps.skills.models import Skill, SkillCategory, UserSkill
+
+        parent = Department.objects.create(name='IT')
+        child = Department.objects.create(name='Backend', parent=parent)
+        user.department = parent
+        user.save()
+        colleague = User.objects.create_user(
+            email='dev@example.com', password='testpass123',
+            first_name='Anna', last_name='Smirnova', department=child,
+        )
+        category = SkillCategory.objects.create(name='Dev')
+        python = Skill.objects.create(name='Python', category=category)
+        sql = Skill.objects.create(name='SQL', category=category)
+        UserSkill.objects.create(user=user, skill=python, level=UserSkill.Level.EXPERT)
+        UserSkill.objects.create(user=user, skill=sql, level=UserSkill.Level.BEGINNER)
+        UserSkill.objects.create(user=colleague, skill=python, level=UserSkill.Level.BEGINNER)
+        return parent, child, user, colleague, python, sql
+
+    def test_matrix(self, authenticated_client, matrix_data, django_assert_max_num_queries):
+        parent, child, user, colleague, python, sql = matrix_data
+        url = f'/api/v1/organization/departments/{parent.id}/skills-matrix/'
+        with django_assert_max_num_queries(4):
+            response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [u['id'] for u in response.data['users']] == [user.id]
+        skills = {s['id']: s for s in response.data['skills']}
+        assert skills[python.id]['users'] == {str(user.id): 'expert'}
+        assert skills[python.id]['stats'] == {
+            'total': 1, 'beginner': 0, 'intermediate': 0, 'advanced': 0, 'expert': 1,
+        }
+
+    def test_subtree_compact(self, authenticated_client, matrix_data):
+        parent, child, user, colleague, python, sql = matrix_data
+        response = authenticated_client.get(
+            f'/api/v1/organization/departments/{parent.id}/skills-matrix/',
+            {'subtree': 'true', 'layout': 'compact'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [u['id'] for u in response.data['users']] == [user.id, colleague.id]
+        assert {d['id'] for d in response.data['departments']} == {parent.id, child.id}
+        skills = {s['id']: s for s in response.data['skills']}
+        assert skills[python.id]['levels'] == '41'
+        assert skills[sql.id]['levels'] == '10'
+        assert response.data['levels'][4] == 'expert'
+        assert skills[python.id]['departments'] == {str(parent.id): 1, str(child.id): 1}
+        assert skills[sql.id]['departments'] == {str(parent.id): 1, str(child.id): 0}
+
+    def test_gaps(self, authenticated_client, matrix_data):
+        from apps.skills.models import Skill
+
+        parent, child, user, colleague, python, sql = matrix_data
+        docker = Skill.objects.create(name='Docker', category=python.category)
+        response = authenticated_client.get(
+            f'/api/v1/organization/departments/{parent.id}/skills-matrix/',
+            {'subtree': '1', 'mode': 'gaps', 'target': 'intermediate',
+             'skills': f'{python.id},{sql.id},{docker.id}'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        gaps = [(s['id'], s['gap']['meeting'], s['gap']['coverage']) for s in response.data['skills']]
+        assert gaps[0][1:] == (0, 0)
+        assert gaps[-1] == (python.id, 1, 0.5)
+        assert {gap[0] for gap in gaps[:2]} == {sql.id, docker.id}
+
+        response = authenticated_client.get(
+            f'/api/v1/organization/departments/{parent.id}/skills-matrix/', {'target': 'guru'},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -9,6 +9,7 @@ from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.views import APIView
 
 from apps.audit.models import AuditLog
+from core.mixins import ConditionalGetMixin, ReplicaReadMixin
 from .models import Department, Position
 from .serializers import (
     DepartmentSerializer,
@@ -121,9 +122,10 @@ class PositionViewSet(ModelViewSet):
         )
 
 
-class OrganizationTreeView(APIView):
+class OrganizationTreeView(ReplicaReadMixin, ConditionalGetMixin, APIView):
     """Get organization tree structure."""
     permission_classes = [IsAuthenticated]
+    conditional_models = ('organization.Department', 'organization.Position', 'accounts.User')
 
     def get(self, request):
         # Get root departments (no parent)
@@ -135,14 +137,26 @@ class OrganizationTreeView(APIView):
         return Response(serializer.data)
 
 
-class DepartmentSkillsMatrixView(APIView):
-    """Get skills matrix for a department."""
+class DepartmentSkillsMatrixView(ReplicaReadMixin, APIView):
+    """
+    Get skills matrix for a department.
+
+    Query params:
+        category: skill category id
+        subtree: include users of all subdepartments (adds per-department counts)
+        layout: ``compact`` returns each skill's levels as a digit string in
+            user order (0 - none, 1..4 - beginner..expert) instead of a dict
+        mode: ``gaps`` adds gap analysis against ``target`` level (default
+            intermediate) and sorts skills by coverage, lowest first
+        skills: comma-separated skill ids to restrict to (in gap mode also
+            the required skills nobody has yet)
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, department_id):
-        from apps.skills.models import UserSkill, Skill
+        from apps.skills.matrix import LEVELS, SkillsMatrix
+        from apps.skills.models import UserSkill
         from apps.accounts.models import User
-        from django.db.models import Count, Q
 
         try:
             department = Department.objects.get(id=department_id)
@@ -152,84 +166,95 @@ class DepartmentSkillsMatrixView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Get all users in this department
-        users = User.objects.filter(
-            department=department
-        ).select_related('position').order_by('last_name', 'first_name')
-
-        # Get category filter if provided
-        category_id = request.query_params.get('category')
-
-        # Get all skills that exist in this department
-        skills_query = Skill.objects.filter(
-            user_skills__user__department=department
-        ).select_related('category').distinct()
-
-        if category_id:
-            skills_query = skills_query.filter(category_id=category_id)
-
-        skills = skills_query.order_by('category__order', 'name')
-
-        # Get all UserSkills for this department
-        user_skills = UserSkill.objects.filter(
-            user__department=department
-        ).select_related('skill', 'user')
+        params = request.query_params
+        subtree = params.get('subtree', '').lower() in ('true', '1', 'yes')
+        compact = params.get('layout') == 'compact'
+        gaps = params.get('mode') == 'gaps'
+        target = params.get('target', UserSkill.Level.INTERMEDIATE)
+        if target not in UserSkill.Level.values:
+            return Response(
+                {'target': f'Must be one of: {", ".join(UserSkill.Level.values)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            skill_ids = [int(pk) for pk in params.get('skills', '').split(',') if pk]
+        except ValueError:
+            return Response({'skills': 'Must be comma-separated ids.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        department_ids = department.get_subtree_ids() if subtree else [department.id]
+
+        # Users of one department are contiguous columns in subtree mode
+        ordering = ('last_name', 'first_name')
+        if subtree:
+            ordering = ('department_id',) + ordering
+        users = list(
+            User.objects.filter(department_id__in=department_ids)
+            .select_related('position').order_by(*ordering)
+        )
 
-        if category_id:
-            user_skills = user_skills.filter(skill__category_id=category_id)
+        user_skills = UserSkill.objects.filter(user__department_id__in=department_ids)
+        if params.get('category'):
+            user_skills = user_skills.filter(skill__category_id=params['category'])
+        matrix = SkillsMatrix.build([user.id for user in users], user_skills, skill_ids)
 
-        # Build matrix: skill_id -> user_id -> level
-        matrix = {}
-        for user_skill in user_skills:
-            skill_id = user_skill.skill_id
-            user_id = user_skill.user_id
-            if skill_id not in matrix:
-                matrix[skill_id] = {}
-            matrix[skill_id][user_id] = user_skill.level
+        columns = {}
+        for index, user in enumerate(users):
+            start, _ = columns.get(user.department_id, (index, index))
+            columns[user.department_id] = (start, index + 1)
 
-        # Build response
         skills_data = []
-        for skill in skills:
-            skill_row = {
-                'id': skill.id,
-                'name': skill.name,
-                'category': skill.category.name,
-                'category_id': skill.category.id,
-                'users': {}
-            }
-
-            # Add user levels for this skill
-            for user in users:
-                user_level = matrix.get(skill.id, {}).get(user.id)
-                skill_row['users'][str(user.id)] = user_level
-
-            # Calculate statistics for this skill
-            skill_levels = matrix.get(skill.id, {}).values()
+        for index, skill in enumerate(matrix.skills):
+            histogram = matrix.histogram(index)
+            skill_row = dict(skill)
+            if compact:
+                skill_row['levels'] = matrix.compact_row(index)
+            else:
+                skill_row['users'] = matrix.user_levels(index)
             skill_row['stats'] = {
-                'total': len([l for l in skill_levels if l]),
-                'beginner': len([l for l in skill_levels if l == 'beginner']),
-                'intermediate': len([l for l in skill_levels if l == 'intermediate']),
-                'advanced': len([l for l in skill_levels if l == 'advanced']),
-                'expert': len([l for l in skill_levels if l == 'expert']),
+                'total': len(users) - histogram[0],
+                **{level: histogram[code] for code, level in enumerate(LEVELS) if level},
             }
-
+            if subtree:
+                skill_row['departments'] = {
+                    str(pk): matrix.count_with_skill(index, start, stop)
+                    for pk, (start, stop) in columns.items()
+                }
+            if gaps:
+                meeting = matrix.meeting_target(histogram, target)
+                skill_row['gap'] = {
+                    'target': target,
+                    'meeting': meeting,
+                    'below': len(users) - meeting,
+                    'coverage': round(meeting / len(users), 3) if users else 0,
+                }
             skills_data.append(skill_row)
 
+        if gaps:
+            skills_data.sort(key=lambda row: row['gap']['coverage'])
+
         users_data = [
             {
                 'id': user.id,
                 'full_name': f"{user.first_name} {user.last_name}",
                 'avatar': user.avatar.url if user.avatar else None,
                 'position': user.position.name if user.position else None,
+                'department_id': user.department_id,
             }
             for user in users
         ]
 
-        return Response({
+        data = {
             'department': {
                 'id': department.id,
                 'name': department.name,
             },
             'users': users_data,
             'skills': skills_data,
-        })
+        }
+        if compact:
+            data['levels'] = list(LEVELS)
+        if subtree:
+            data['departments'] = list(
+                Department.objects.filter(id__in=department_ids).values('id', 'name', 'parent_id')
+            )
+        return Response(data)
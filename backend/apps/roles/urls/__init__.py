@@ -5,7 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from apps.roles.views import AdminStatsView, PermissionListView, RoleViewSet
-from core.views import AdminSiteSettingsView, SiteSettingsView
+from core.views import AdminSiteSettingsView, DatabasePoolView, ProfilingReportView, SiteSettingsView
 
 router = DefaultRouter()
 router.register('roles', RoleViewSet, basename='roles')
@@ -15,5 +15,7 @@ urlpatterns = [
     path('permissions/', PermissionListView.as_view(), name='permissions-list'),
     path('settings/', AdminSiteSettingsView.as_view(), name='admin-settings-get'),
     path('settings/update/', SiteSettingsView.as_view(), name='admin-settings-update'),
+    path('profiling/', ProfilingReportView.as_view(), name='admin-profiling'),
+    path('db-pool/', DatabasePoolView.as_view(), name='admin-db-pool'),
     path('', include(router.urls)),
 ]
@@ -10,6 +10,7 @@ from rest_framework.views import APIView
 
 from apps.accounts.models import User
 from apps.audit.models import AuditLog
+from core.mixins import ReplicaReadMixin
 from .models import Permission, Role
 from .serializers import (
     PermissionSerializer,
@@ -20,7 +21,7 @@ from .serializers import (
 from .permissions import CanManageRoles
 
 
-class AdminStatsView(APIView):
+class AdminStatsView(ReplicaReadMixin, APIView):
     """Get admin dashboard statistics."""
     permission_classes = [IsAuthenticated, CanManageRoles]
 
@@ -0,0 +1,103 @@
+"""
+Users × skills level matrix for department skill reports.
+
+Levels are stored as one byte per cell (0 - no skill, 1..4 - beginner ..
+expert) in a bytearray with one row per skill, filled from a single query.
+Per-skill histograms, per-department counts and gap analysis are computed
+with ``bytes.count`` over row slices instead of Python loops over users.
+"""
+from .models import UserSkill
+
+LEVELS = (None, *UserSkill.Level.values)
+LEVEL_CODES = {level: code for code, level in enumerate(LEVELS) if level}
+# Code byte -> ASCII digit, for the compact row format
+DIGITS = bytes.maketrans(bytes(range(len(LEVELS))), ''.join(map(str, range(len(LEVELS)))).encode())
+
+
+class SkillsMatrix:
+    """
+    Level codes for ``user_ids`` (columns) × ``skills`` (rows).
+
+    ``skills`` is a list of dicts with ``id``, ``name``, ``category`` and
+    ``category_id``; ``rows`` yields ``(skill_id, user_id, level)``.
+    """
+
+    def __init__(self, user_ids, skills, rows):
+        self.user_ids = list(user_ids)
+        self.user_keys = [str(user_id) for user_id in self.user_ids]
+        self.skills = list(skills)
+        width = len(self.user_ids)
+        self.width = width
+        user_index = {user_id: index for index, user_id in enumerate(self.user_ids)}
+        skill_index = {skill['id']: index for index, skill in enumerate(self.skills)}
+
+        self.cells = bytearray(width * len(self.skills))
+        for skill_id, user_id, level in rows:
+            row = skill_index.get(skill_id)
+            column = user_index.get(user_id)
+            if row is not None and column is not None:
+                self.cells[row * width + column] = LEVEL_CODES.get(level, 0)
+
+    @classmethod
+    def build(cls, user_ids, user_skills, skill_ids=None):
+        """
+        Build the matrix from a UserSkill queryset in one query.
+
+        Skills are the ones present in ``user_skills`` plus ``skill_ids``
+        (looked up separately) even if nobody has them, ordered by category
+        order and name.
+        """
+        from .models import Skill
+
+        if skill_ids:
+            user_skills = user_skills.filter(skill_id__in=skill_ids)
+
+        skills = {}
+        rows = []
+        for skill_id, name, category_id, category_name, order, user_id, level in user_skills.values_list(
+            'skill_id', 'skill__name', 'skill__category_id', 'skill__category__name',
+            'skill__category__order', 'user_id', 'level',
+        ):
+            skills[skill_id] = (order, name, category_id, category_name)
+            rows.append((skill_id, user_id, level))
+
+        missing = set(skill_ids or ()) - skills.keys()
+        if missing:
+            for skill in Skill.objects.filter(id__in=missing).select_related('category'):
+                skills[skill.id] = (skill.category.order, skill.name, skill.category_id, skill.category.name)
+
+        ordered = sorted(skills.items(), key=lambda item: (item[1][0], item[1][1]))
+        return cls(
+            user_ids,
+            [
+                {'id': skill_id, 'name': name, 'category': category_name, 'category_id': category_id}
+                for skill_id, (_, name, category_id, category_name) in ordered
+            ],
+            rows,
+        )
+
+    def row(self, index):
+        return self.cells[index * self.width:(index + 1) * self.width]
+
+    def histogram(self, index):
+        """Counts per level code for a skill row (index 0 - users without the skill)."""
+        row = self.row(index)
+        return [row.count(code) for code in range(len(LEVELS))]
+
+    def user_levels(self, index):
+        """``{str(user_id): level or None}`` for a skill row."""
+        return dict(zip(self.user_keys, map(LEVELS.__getitem__, self.row(index))))
+
+    def compact_row(self, index):
+        """Skill row as a digit string, one character per user."""
+        return self.row(index).translate(DIGITS).decode('ascii')
+
+    def count_with_skill(self, index, start, stop):
+        """Users in columns ``start:stop`` that have the skill at any level."""
+        cells = self.cells[index * self.width + start:index * self.width + stop]
+        return len(cells) - cells.count(0)
+
+    @staticmethod
+    def meeting_target(histogram, target):
+        """Users at ``target`` level or above, from a histogram."""
+        return sum(histogram[LEVEL_CODES[target]:])
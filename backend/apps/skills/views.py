@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.views import APIView
 
+from core.mixins import ConditionalGetMixin
 from .models import SkillCategory, Skill, UserSkill, SkillEndorsement
 from .serializers import (
     SkillCategorySerializer,
@@ -20,15 +21,17 @@ from .serializers import (
 from .permissions import CanManageSkills
 
 
-class SkillCategoryViewSet(ReadOnlyModelViewSet):
+class SkillCategoryViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
     """List skill categories."""
+    conditional_models = ('skills.SkillCategory', 'skills.Skill')
     queryset = SkillCategory.objects.all()
     serializer_class = SkillCategorySerializer
     permission_classes = [IsAuthenticated]
 
 
-class SkillViewSet(ModelViewSet):
+class SkillViewSet(ConditionalGetMixin, ModelViewSet):
     """CRUD for skills."""
+    conditional_models = ('skills.Skill', 'skills.SkillCategory')
     queryset = Skill.objects.all().select_related('category')
     permission_classes = [IsAuthenticated]
 
@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils.text import slugify
 from unidecode import unidecode
 
+from core.mixins import ContentAddressedFileMixin
+
 
 class WikiSpace(models.Model):
     """Пространство знаний (раздел wiki)"""
@@ -75,6 +78,25 @@ class WikiSpace(models.Model):
             return True
         return False
 
+    def users_with_access(self, user_ids):
+        """Id пользователей из ``user_ids``, имеющих доступ (те же правила, один запрос)"""
+        from django.contrib.auth import get_user_model
+
+        user_ids = set(user_ids)
+        if self.is_public or not user_ids:
+            return user_ids
+        access = (
+            Q(is_superuser=True)
+            | Q(pk=self.owner_id)
+            | Q(department_id__in=self.allowed_departments.values('id'))
+            | Q(roles__in=self.allowed_roles.values('id'))
+        )
+        if self.department_id:
+            access |= Q(department_id=self.department_id)
+        return set(
+            get_user_model().objects.filter(access, pk__in=user_ids).values_list('pk', flat=True).distinct()
+        )
+
 
 class WikiTag(models.Model):
     """Тег для страниц wiki"""
@@ -246,8 +268,8 @@ class WikiPageVersion(models.Model):
         return f"{self.page.title} - v{self.version_number}"
 
 
-class WikiAttachment(models.Model):
-    """Вложение к странице wiki"""
+class WikiAttachment(ContentAddressedFileMixin, models.Model):
+    """Вложение к странице wiki (хранится по содержимому, см. core.FileBlob)"""
     page = models.ForeignKey(
         WikiPage,
         on_delete=models.CASCADE,
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.fields import SrcsetField
 from .models import WikiSpace, WikiPage, WikiPageVersion, WikiTag, WikiAttachment
 
 
@@ -13,10 +15,11 @@ class WikiTagSerializer(serializers.ModelSerializer):
 class WikiAttachmentSerializer(serializers.ModelSerializer):
     """Сериализатор вложений"""
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
+    srcset = SrcsetField(source='file')
 
     class Meta:
         model = WikiAttachment
-        fields = ['id', 'file', 'filename', 'size', 'mime_type', 'uploaded_by', 'uploaded_by_name', 'created_at']
+        fields = ['id', 'file', 'srcset', 'filename', 'size', 'mime_type', 'uploaded_by', 'uploaded_by_name', 'created_at']
         read_only_fields = ['filename', 'size', 'mime_type', 'uploaded_by', 'created_at']
 
 
@@ -5,6 +5,12 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
+from apps.accounts.mentions import resolve_mentions
+from apps.notifications.tasks import create_notifications
+from core.counters import wiki_page_views
+from core.mixins import ConditionalGetMixin
+from core.renditions import schedule_renditions
+
 from .models import WikiSpace, WikiPage, WikiPageVersion, WikiTag, WikiAttachment
 from .serializers import (
     WikiSpaceListSerializer, WikiSpaceDetailSerializer, WikiSpaceCreateSerializer,
@@ -15,9 +21,11 @@ from .serializers import (
 from .permissions import WikiSpacePermission, WikiPagePermission, WikiTagPermission
 
 
-class WikiSpaceViewSet(viewsets.ModelViewSet):
+class WikiSpaceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet для пространств Wiki"""
     permission_classes = [WikiSpacePermission]
+    conditional_models = ('wiki.WikiSpace', 'wiki.WikiPage', 'accounts.User')
+    conditional_actions = ('list', 'tree')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'order', 'created_at']
@@ -139,6 +147,7 @@ class WikiPageViewSet(viewsets.ModelViewSet):
         serializer = WikiPageCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         page = serializer.save()
+        self.notify_mentioned(page)
         detail_serializer = WikiPageDetailSerializer(page)
         return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -148,7 +157,10 @@ class WikiPageViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = WikiPageUpdateSerializer(instance, data=request.data, partial=partial, context={'request': request})
         serializer.is_valid(raise_exception=True)
+        # Mentions in an already published version were notified before
+        previous_text = instance.get_plain_text_content() if instance.is_published else ''
         self.perform_update(serializer)
+        self.notify_mentioned(instance, previous_text)
 
         if getattr(instance, '_prefetched_objects_cache', None):
             instance._prefetched_objects_cache = {}
@@ -161,11 +173,32 @@ class WikiPageViewSet(viewsets.ModelViewSet):
         kwargs['partial'] = True
         return self.update(request, *args, **kwargs)
 
+    def notify_mentioned(self, page, previous_text=''):
+        """Notify users newly @-mentioned in a published page who can read it."""
+        if not page.is_published or page.is_archived:
+            return
+        user = self.request.user
+        mentioned = [
+            mentioned_user for mentioned_user in resolve_mentions(page.get_plain_text_content(), previous_text)
+            if mentioned_user.pk != user.pk
+        ]
+        allowed = page.space.users_with_access(mentioned_user.pk for mentioned_user in mentioned)
+        mentioned = [mentioned_user for mentioned_user in mentioned if mentioned_user.pk in allowed]
+        create_notifications(
+            mentioned,
+            'system',
+            'Упоминание в wiki',
+            f'{user.get_full_name()} упомянул вас на странице «{page.title}»',
+            link=f'/wiki/{page.space.slug}/{page.slug}',
+            related_object_type='WikiPage',
+            related_object_id=page.pk,
+        )
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        # Увеличиваем счетчик просмотров
-        WikiPage.objects.filter(pk=instance.pk).update(view_count=instance.view_count + 1)
-        instance.refresh_from_db()
+        # Увеличиваем счетчик просмотров (запись в БД пакетами, см. core.counters)
+        wiki_page_views.hit(instance.pk)
+        instance.view_count += 1
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -195,9 +228,9 @@ class WikiPageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Увеличиваем счетчик просмотров
-        WikiPage.objects.filter(pk=page.pk).update(view_count=page.view_count + 1)
-        page.refresh_from_db()
+        # Увеличиваем счетчик просмотров (запись в БД пакетами, см. core.counters)
+        wiki_page_views.hit(page.pk)
+        page.view_count += 1
 
         serializer = WikiPageDetailSerializer(page)
         return Response(serializer.data)
@@ -390,9 +423,11 @@ class WikiAttachmentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         file = self.request.FILES.get('file')
-        serializer.save(
+        attachment = serializer.save(
             uploaded_by=self.request.user,
             filename=file.name if file else '',
             size=file.size if file else 0,
             mime_type=file.content_type if file else ''
         )
+        if attachment.mime_type.startswith('image/'):
+            schedule_renditions([attachment.file.name])
@@ -56,6 +56,41 @@ app.conf.beat_schedule = {
         'task': 'bookings.cleanup_past_bookings',
         'schedule': crontab(hour=2, minute=0),
     },
+    # Flush buffered view counters to the database every minute
+    'flush-view-counters': {
+        'task': 'core.flush_view_counters',
+        'schedule': crontab(minute='*'),
+    },
+    # Re-queue images stuck in processing (crashed worker) every 10 minutes
+    'recover-stuck-images': {
+        'task': 'core.recover_stuck_images',
+        'schedule': crontab(minute='*/10'),
+    },
+    # Recompute achievement leaderboards hourly (rolling periods move)
+    'rebuild-leaderboards': {
+        'task': 'achievements.rebuild_leaderboards',
+        'schedule': crontab(minute=5),
+    },
+    # Delete unreferenced attachment blobs daily at 4:00 AM
+    'collect-orphan-blobs': {
+        'task': 'core.collect_orphan_blobs',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    # Delete expired refresh tokens and their blacklist entries daily at 4:15 AM
+    'flush-expired-tokens': {
+        'task': 'accounts.flush_expired_tokens',
+        'schedule': crontab(hour=4, minute=15),
+    },
+    # Deactivate expired sessions and purge old ones daily at 4:30 AM
+    'expire-sessions': {
+        'task': 'accounts.expire_sessions',
+        'schedule': crontab(hour=4, minute=30),
+    },
+    # Trim per-user profile view history daily at 4:45 AM
+    'prune-view-history': {
+        'task': 'interactions.prune_view_history',
+        'schedule': crontab(hour=4, minute=45),
+    },
 }
 
 
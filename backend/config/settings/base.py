@@ -67,6 +67,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 
 MIDDLEWARE = [
+    'core.profiling.ProfilingMiddleware',  # no-op unless PROFILING_ENABLED
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -76,6 +77,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.audit.middleware.AuditMiddleware',
+    'core.replicas.ReplicaPinMiddleware',  # no-op without REPLICA_DATABASES
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -148,7 +150,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # =============================================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -162,10 +164,11 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # orjson-backed, falls back to the stock renderer if orjson is missing
+        'core.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'core.parsers.FastJSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
@@ -197,6 +200,10 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Seconds a user snapshot (row + permission codenames) is cached for read
+# requests by core.authentication.CachedJWTAuthentication; 0 disables
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', 60))
+
 
 # =============================================================================
 # CORS Settings
@@ -251,6 +258,78 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
 
+# =============================================================================
+# View Counters (write-behind, see core/counters.py)
+# =============================================================================
+# 'redis' - shared Redis hash flushed by the core.flush_view_counters task
+# 'local' - per-process buffer flushed inline every VIEW_COUNTER_FLUSH_INTERVAL seconds
+VIEW_COUNTER_BACKEND = os.environ.get('VIEW_COUNTER_BACKEND', 'redis')
+VIEW_COUNTER_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+VIEW_COUNTER_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNTER_FLUSH_INTERVAL', 60))
+
+
+# =============================================================================
+# Read Replicas (see core/replicas.py)
+# =============================================================================
+# Aliases in DATABASES that receive reads from ReplicaReadMixin views and
+# replica tasks; set from DATABASE_REPLICA_URLS in production settings
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+REPLICA_DATABASES = []
+# Clients read from the primary for this long after a write
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+
+# =============================================================================
+# Event Streams (apps/notifications/views.py NotificationStreamView)
+# =============================================================================
+# Seconds between unread-count checks on an open stream (also the client retry)
+NOTIFICATION_STREAM_POLL_INTERVAL = int(os.environ.get('NOTIFICATION_STREAM_POLL_INTERVAL', 5))
+# Streams are closed after this long and the client reconnects
+NOTIFICATION_STREAM_MAX_DURATION = int(os.environ.get('NOTIFICATION_STREAM_MAX_DURATION', 300))
+# Lifetime of the ?ticket= credential for opening a stream (seconds)
+NOTIFICATION_STREAM_TICKET_LIFETIME = int(os.environ.get('NOTIFICATION_STREAM_TICKET_LIFETIME', 10))
+
+
+# =============================================================================
+# Bulk User Operations and Import (apps/accounts/bulk.py, importer.py)
+# =============================================================================
+# Larger batches run as a background job with progress instead of inline
+BULK_USER_SYNC_LIMIT = int(os.environ.get('BULK_USER_SYNC_LIMIT', 500))
+# Users per UPDATE / audit bulk_create (and per progress report)
+BULK_USER_CHUNK_SIZE = int(os.environ.get('BULK_USER_CHUNK_SIZE', 1000))
+# Employee import from CSV/XLSX (apps/accounts/importer.py): rows per upsert
+USER_IMPORT_CHUNK_SIZE = int(os.environ.get('USER_IMPORT_CHUNK_SIZE', 500))
+USER_IMPORT_MAX_SIZE = int(os.environ.get('USER_IMPORT_MAX_SIZE', 20971520))  # 20MB
+
+
+# =============================================================================
+# Maintenance Tasks (core/maintenance.py)
+# =============================================================================
+# Rows per DELETE/UPDATE transaction in cleanup tasks
+MAINTENANCE_CHUNK_SIZE = int(os.environ.get('MAINTENANCE_CHUNK_SIZE', 1000))
+# Inactive sessions are deleted this many days after their last activity
+SESSION_RETENTION_DAYS = int(os.environ.get('SESSION_RETENTION_DAYS', 90))
+# Profile views kept per user (the history list shows the latest 20)
+VIEW_HISTORY_KEEP = int(os.environ.get('VIEW_HISTORY_KEEP', 100))
+
+
+# =============================================================================
+# OKR Statistics (apps/okr/stats.py)
+# =============================================================================
+# Cached dashboard stats are invalidated on OKR changes; the timeout bounds
+# staleness from changes that bypass signals (e.g. a new manager)
+OKR_STATS_CACHE_TIMEOUT = int(os.environ.get('OKR_STATS_CACHE_TIMEOUT', 600))
+
+
+# =============================================================================
+# Request Profiling (see core/profiling.py)
+# =============================================================================
+# Adds Server-Timing headers and hourly per-endpoint aggregates
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False').lower() in ('true', '1', 'yes')
+PROFILING_FLUSH_INTERVAL = int(os.environ.get('PROFILING_FLUSH_INTERVAL', 60))
+PROFILING_RETENTION_HOURS = int(os.environ.get('PROFILING_RETENTION_HOURS', 168))
+
+
 # =============================================================================
 # API Documentation (drf-spectacular)
 # =============================================================================
@@ -274,6 +353,20 @@ ALLOWED_AVATAR_TYPES = os.environ.get(
     'image/jpeg,image/png,image/webp'
 ).split(',')
 
+# Responsive image variant widths (see core/renditions.py)
+IMAGE_RENDITION_WIDTHS = [
+    int(w) for w in os.environ.get('IMAGE_RENDITION_WIDTHS', '64,128,400,1200').split(',')
+]
+
+# Seconds an image may stay in 'processing' before it is re-queued (see core/images.py)
+IMAGE_PROCESSING_TIMEOUT = int(os.environ.get('IMAGE_PROCESSING_TIMEOUT', 600))
+
+# Hash uploads while they stream in (used by content-addressed attachment storage)
+FILE_UPLOAD_HANDLERS = [
+    'core.uploadhandlers.HashingMemoryFileUploadHandler',
+    'core.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
 # Maximum upload size for request body
 DATA_UPLOAD_MAX_MEMORY_SIZE = 15728640  # 15MB
 
@@ -22,7 +22,7 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 # Add browsable API renderer for development
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [  # noqa: F405
-    'rest_framework.renderers.JSONRenderer',
+    'core.renderers.FastJSONRenderer',
     'rest_framework.renderers.BrowsableAPIRenderer',
 ]
 
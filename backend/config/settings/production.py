@@ -6,13 +6,48 @@ from .base import *  # noqa
 
 DEBUG = False
 
-# Database - PostgreSQL
+# Database - PostgreSQL, optionally through PgBouncer (see docker-compose.prod.yml)
 DATABASES = {
     'default': dj_database_url.config(
-        conn_max_age=600,
+        conn_max_age=int(os.environ.get('CONN_MAX_AGE', 600)),
         conn_health_checks=True,
     )
 }
+# Under ASGI sync code runs in per-request threads whose connections are
+# never reused or closed, so persistent connections would exhaust PgBouncer
+if os.environ.get('SERVER_MODE', 'wsgi').lower() == 'asgi':  # noqa: F405
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# 'transaction' when DATABASE_URL points at PgBouncer in transaction pooling mode
+DATABASE_POOL_MODE = os.environ.get('DATABASE_POOL_MODE', '')
+if DATABASE_POOL_MODE == 'transaction':
+    # A server connection is only ours for one transaction: named cursors
+    # (QuerySet.iterator()) would be lost between fetches
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Optional read replicas, comma-separated DSNs (see core/replicas.py)
+for index, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = dj_database_url.parse(
+        url.strip(), conn_max_age=DATABASES['default']['CONN_MAX_AGE'], conn_health_checks=True,
+    )
+    DATABASES[alias]['DISABLE_SERVER_SIDE_CURSORS'] = DATABASES['default'].get('DISABLE_SERVER_SIDE_CURSORS', False)
+    REPLICA_DATABASES.append(alias)
+
+# PgBouncer admin console for pool metrics (manage.py db_pool_stats, /api/v1/admin/db-pool/)
+PGBOUNCER_ADMIN_URL = os.environ.get('PGBOUNCER_ADMIN_URL', '')
+
+# Shared cache: cached auth snapshots (core.authentication), OKR stats and
+# birthdays are invalidated by version counters that every gunicorn and
+# Celery worker must see. A separate Redis database from the Celery broker,
+# since cache.clear() flushes the whole database.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/1'),  # noqa: F405
+        'KEY_PREFIX': 'fond_intra',
+    }
+}
 
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
@@ -47,7 +82,7 @@ if '*' in ALLOWED_HOSTS:  # noqa: F405
 
 # Only JSON renderer in production
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [  # noqa: F405
-    'rest_framework.renderers.JSONRenderer',
+    'core.renderers.FastJSONRenderer',
 ]
 
 # Static files
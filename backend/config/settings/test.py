@@ -45,6 +45,10 @@ class DisableMigrations:
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Write view counters straight through the in-process buffer
+VIEW_COUNTER_BACKEND = 'local'
+VIEW_COUNTER_FLUSH_INTERVAL = 0
+
 # Use console email backend for testing
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -0,0 +1,52 @@
+"""
+Async DRF views.
+
+``AsyncAPIView`` keeps the DRF request cycle (authentication, permissions,
+throttling, content negotiation, exception handling) but lets handlers be
+``async def``. Under ASGI (``SERVER_MODE=asgi``) a request waiting on the
+database or a stream doesn't hold a worker; under WSGI Django runs the view
+through ``async_to_sync`` and it behaves like a sync view.
+
+Handlers must use the async ORM (``acount()``, ``async for``) and avoid lazy
+relation access - wrap anything else in ``sync_to_async``.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.views import APIView
+
+
+def is_asgi_request(request):
+    """True when served by an ASGI server (request may be a DRF Request)."""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+class AsyncAPIView(APIView):
+    """APIView whose dispatch awaits async handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication and permission checks use the sync ORM
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,153 @@
+"""
+Authentication classes.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+# Claim holding the session key (the JTI of the refresh token issued at
+# login); copied into every access token and kept across refresh rotation
+SESSION_CLAIM = 'sid'
+
+GLOBAL_VERSION_KEY = 'auth:user:v'
+
+# User columns kept in cached auth snapshots
+SNAPSHOT_FIELDS = (
+    'id', 'email', 'first_name', 'last_name', 'patronymic', 'avatar',
+    'department_id', 'position_id', 'is_active', 'is_staff', 'is_superuser', 'is_archived',
+)
+
+
+def _user_version_key(user_id):
+    return f'auth:user:v:{user_id}'
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate_cached_users(user_ids=None):
+    """Drop cached auth snapshots of ``user_ids``, or of everyone when None."""
+    if user_ids is None:
+        _bump(GLOBAL_VERSION_KEY)
+        return
+    for user_id in set(user_ids):
+        _bump(_user_version_key(user_id))
+
+
+def snapshot_key(user_id):
+    versions = cache.get_many([_user_version_key(user_id), GLOBAL_VERSION_KEY])
+    return 'auth:user:{}:{}:{}'.format(
+        user_id, versions.get(_user_version_key(user_id), 0), versions.get(GLOBAL_VERSION_KEY, 0),
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication serving the user from a short-lived cache.
+
+    Safe requests get a snapshot of the user: the ``SNAPSHOT_FIELDS`` that
+    permission checks and views read, plus their permission codenames
+    (``User.load_permissions``), cached for ``AUTH_USER_CACHE_TIMEOUT``
+    seconds under a key holding per-user and global version counters. The
+    password hash and other columns never reach the cache; on the rebuilt
+    instance they are deferred and loaded on access. ``accounts.signals`` bumps them when users,
+    their roles or role permissions change, so a hit costs two cache reads
+    and no queries. Writes load the user from the database as before, so a
+    stale snapshot is never saved back.
+
+    The validated token is ``request.auth``; views read claims from it
+    instead of parsing the header again. Session activity is recorded in
+    ``core.counters.session_activity`` and written in batches.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            user = self.get_cached_user(validated_token)
+        else:
+            user = self.get_user(validated_token)
+
+        session_key = validated_token.get(SESSION_CLAIM)
+        if session_key:
+            from core.counters import session_activity
+
+            session_activity.touch(session_key)
+        return user, validated_token
+
+    def get_cached_user(self, validated_token):
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not timeout or user_id is None:
+            return self.get_user(validated_token)
+
+        key = snapshot_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return self.user_from_snapshot(snapshot)
+
+        # Raises for unknown and inactive users - those are never cached
+        user = self.get_user(validated_token)
+        user.load_permissions()
+        cache.set(key, self.make_snapshot(user), timeout)
+        return user
+
+    def make_snapshot(self, user):
+        fields = [field for field in user._meta.concrete_fields if field.attname in SNAPSHOT_FIELDS]
+        return {
+            'values': {field.attname: field.get_prep_value(field.value_from_object(user)) for field in fields},
+            'permissions': sorted(user._permission_codenames),
+        }
+
+    def user_from_snapshot(self, snapshot):
+        values = snapshot['values']
+        names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in values]
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+        user._permission_codenames = frozenset(snapshot['permissions'])
+        return user
+
+
+class StreamTicket(Token):
+    """
+    Single-purpose token for opening an event stream.
+
+    EventSource can't send headers, so the credential goes into the URL and
+    ends up in access logs. A ticket only lives ``NOTIFICATION_STREAM_TICKET_LIFETIME``
+    seconds and carries its own ``token_type``, so it is rejected by every
+    endpoint except those using StreamTicketAuthentication.
+    """
+    token_type = 'stream'
+    lifetime = timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_LIFETIME)
+
+
+class StreamTicketAuthentication(JWTAuthentication):
+    """StreamTicket from the ``ticket`` query parameter (EventSource endpoints only)."""
+    query_param = 'ticket'
+
+    def authenticate(self, request):
+        raw_ticket = request.query_params.get(self.query_param)
+        if not raw_ticket:
+            return None
+        try:
+            ticket = StreamTicket(raw_ticket)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        return self.get_user(ticket), ticket
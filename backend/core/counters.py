@@ -0,0 +1,322 @@
+"""
+Write-behind view counters and activity timestamps.
+
+Page views are accumulated outside the database (Redis hash or an in-process
+buffer) and flushed to the model fields in aggregated batches by the
+``core.flush_view_counters`` periodic task. A single view costs one cache
+operation instead of a read + UPDATE + refresh round trip, and concurrent
+views are never lost because increments are atomic on the buffer side and
+applied with ``F()`` expressions on the database side.
+
+Activity trackers work the same way with a set of touched keys (Redis set or
+in-process set): every row touched since the last flush gets its timestamp
+field set to the flush time in one UPDATE.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class LocalCounterBackend:
+    """
+    In-process buffer, used when Redis is not configured.
+
+    Each worker process keeps its own deltas and flushes them itself once
+    ``VIEW_COUNTER_FLUSH_INTERVAL`` seconds have passed since the last flush,
+    so no external scheduler is needed.
+    """
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffers = defaultdict(lambda: defaultdict(int))
+        self._sets = defaultdict(set)
+        self._last_flush = time.monotonic()
+
+    def incr(self, name, key, amount=1):
+        with self._lock:
+            self._buffers[name][key] += amount
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self._flush()
+
+    def _flush(self):
+        # The value is already buffered and a failed flush restores it, so
+        # the caller must not see the error and write the value through again
+        try:
+            flush_view_counters()
+        except Exception:
+            logger.exception('View counter flush failed, deltas kept for the next one')
+
+    def pop(self, name):
+        with self._lock:
+            deltas = dict(self._buffers.pop(name, {}))
+            self._last_flush = time.monotonic()
+        return deltas
+
+    def restore(self, name, deltas):
+        with self._lock:
+            for key, amount in deltas.items():
+                self._buffers[name][key] += amount
+
+    def add(self, name, member):
+        with self._lock:
+            self._sets[name].add(member)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self._flush()
+
+    def pop_members(self, name):
+        with self._lock:
+            members = self._sets.pop(name, set())
+            self._last_flush = time.monotonic()
+        return members
+
+    def restore_members(self, name, members):
+        with self._lock:
+            self._sets[name].update(members)
+
+
+class RedisCounterBackend:
+    """
+    Redis hash per counter: ``HINCRBY`` on view, ``RENAME`` + ``HGETALL`` on flush.
+
+    Renaming the hash before reading it makes the flush atomic with respect to
+    concurrent increments: views that arrive during a flush land in a fresh hash
+    and are picked up by the next run.
+    """
+
+    key_prefix = 'viewcounter'
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def _key(self, name):
+        return f'{self.key_prefix}:{name}'
+
+    def incr(self, name, key, amount=1):
+        self.client.hincrby(self._key(name), key, amount)
+
+    def _drain(self, name, read):
+        """Rename the live key away and return ``read`` of it (None if empty)."""
+        import redis
+        live_key = self._key(name)
+        flushing_key = f'{live_key}:flushing'
+        # A previous flush may have died after the rename - drain it first
+        if not self.client.exists(flushing_key):
+            try:
+                self.client.rename(live_key, flushing_key)
+            except redis.ResponseError:
+                return None
+        pipe = self.client.pipeline()
+        getattr(pipe, read)(flushing_key)
+        pipe.delete(flushing_key)
+        raw, _ = pipe.execute()
+        return raw
+
+    def pop(self, name):
+        raw = self._drain(name, 'hgetall') or {}
+        return {int(key): int(amount) for key, amount in raw.items()}
+
+    def restore(self, name, deltas):
+        pipe = self.client.pipeline()
+        for key, amount in deltas.items():
+            pipe.hincrby(self._key(name), key, amount)
+        pipe.execute()
+
+    def add(self, name, member):
+        self.client.sadd(self._key(name), member)
+
+    def pop_members(self, name):
+        return {member.decode() for member in self._drain(name, 'smembers') or ()}
+
+    def restore_members(self, name, members):
+        if members:
+            self.client.sadd(self._key(name), *members)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured counter backend (created lazily, once per process)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend = getattr(settings, 'VIEW_COUNTER_BACKEND', 'local')
+                if backend == 'redis':
+                    _backend = RedisCounterBackend(settings.VIEW_COUNTER_REDIS_URL)
+                else:
+                    _backend = LocalCounterBackend(
+                        getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 60)
+                    )
+    return _backend
+
+
+def reset_backend():
+    """Drop the cached backend (used by tests after overriding settings)."""
+    global _backend
+    _backend = None
+
+
+class ViewCounter:
+    """
+    A named counter bound to an integer model field.
+
+    Args:
+        name: unique counter name, used as the buffer key
+        model: model label, e.g. ``'wiki.WikiPage'``
+        field: integer field receiving the aggregated deltas
+        lookup: field identifying the row (``'pk'`` or e.g. ``'user_id'``)
+        timestamp_field: optional datetime field set to the flush time
+        create_missing: create rows that don't exist yet (keyed by ``lookup``)
+    """
+
+    def __init__(self, name, model, field, lookup='pk', timestamp_field=None, create_missing=False):
+        self.name = name
+        self.model_label = model
+        self.field = field
+        self.lookup = lookup
+        self.timestamp_field = timestamp_field
+        self.create_missing = create_missing
+        _registry[name] = self
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def hit(self, key, amount=1):
+        """Record ``amount`` views for the row identified by ``key``."""
+        try:
+            get_backend().incr(self.name, int(key), amount)
+        except Exception:
+            # Never fail a page view because the buffer is unavailable
+            logger.exception('View counter %s unavailable, writing through', self.name)
+            self.apply({int(key): amount})
+
+    def apply(self, deltas):
+        """Write aggregated ``{key: delta}`` to the database, one UPDATE per distinct delta."""
+        if not deltas:
+            return 0
+        model = self.model
+        lookup_in = f'{self.lookup}__in'
+
+        with transaction.atomic():
+            if self.create_missing:
+                existing = set(
+                    model.objects.filter(**{lookup_in: deltas.keys()})
+                    .values_list(self.lookup, flat=True)
+                )
+                model.objects.bulk_create(
+                    [model(**{self.lookup: key}) for key in deltas if key not in existing],
+                    ignore_conflicts=True,
+                )
+
+            by_amount = defaultdict(list)
+            for key, amount in deltas.items():
+                by_amount[amount].append(key)
+
+            updates = {}
+            if self.timestamp_field:
+                updates[self.timestamp_field] = timezone.now()
+            for amount, keys in by_amount.items():
+                model.objects.filter(**{lookup_in: keys}).update(
+                    **{self.field: F(self.field) + amount}, **updates
+                )
+        return sum(deltas.values())
+
+    def flush(self):
+        """Move buffered deltas into the database. Returns the number of views written."""
+        backend = get_backend()
+        deltas = backend.pop(self.name)
+        try:
+            return self.apply(deltas)
+        except Exception:
+            backend.restore(self.name, deltas)
+            raise
+
+
+class ActivityTracker:
+    """
+    A last-activity timestamp field written behind.
+
+    Args:
+        name: unique tracker name, used as the buffer key
+        model: model label, e.g. ``'accounts.UserSession'``
+        field: datetime field set to the flush time
+        lookup: field identifying the row (``touch`` keys are its values)
+        filters: extra filters for the UPDATE, e.g. ``{'is_active': True}``
+    """
+    chunk_size = 500
+
+    def __init__(self, name, model, field, lookup='pk', filters=None):
+        self.name = name
+        self.model_label = model
+        self.field = field
+        self.lookup = lookup
+        self.filters = filters or {}
+        _registry[name] = self
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def touch(self, key):
+        """Record activity of the row identified by ``key``."""
+        try:
+            get_backend().add(self.name, str(key))
+        except Exception:
+            logger.exception('Activity tracker %s unavailable, writing through', self.name)
+            self.apply({str(key)})
+
+    def apply(self, keys):
+        """Set the timestamp of the ``keys`` rows to now. Returns the number of rows updated."""
+        keys = list(keys)
+        now = timezone.now()
+        updated = 0
+        for start in range(0, len(keys), self.chunk_size):
+            updated += self.model.objects.filter(
+                **{f'{self.lookup}__in': keys[start:start + self.chunk_size]}, **self.filters
+            ).update(**{self.field: now})
+        return updated
+
+    def flush(self):
+        """Move touched keys into the database. Returns the number of rows updated."""
+        backend = get_backend()
+        keys = backend.pop_members(self.name)
+        try:
+            return self.apply(keys)
+        except Exception:
+            backend.restore_members(self.name, keys)
+            raise
+
+
+def flush_view_counters():
+    """Flush every registered counter and tracker. Returns ``{name: rows or views written}``."""
+    return {name: counter.flush() for name, counter in _registry.items()}
+
+
+wiki_page_views = ViewCounter('wiki_page', 'wiki.WikiPage', 'view_count')
+faq_item_views = ViewCounter('faq_item', 'faq.FAQItem', 'views_count')
+profile_views = ViewCounter(
+    'profile', 'interactions.ProfileView', 'view_count',
+    lookup='user_id', timestamp_field='last_viewed_at', create_missing=True,
+)
+session_activity = ActivityTracker(
+    'session_activity', 'accounts.UserSession', 'last_activity',
+    lookup='token_jti', filters={'is_active': True},
+)
@@ -0,0 +1,85 @@
+"""
+Connection pool metrics.
+
+In production Django and Celery connect to PostgreSQL through PgBouncer in
+transaction pooling mode (docker-compose.prod.yml). PgBouncer's admin console
+(the virtual ``pgbouncer`` database) reports pool occupancy and wait times;
+``get_pool_stats()`` reads it through ``PGBOUNCER_ADMIN_URL``.
+
+Key figures per pool:
+    pool_size            server connections PgBouncer may open
+    sv_active / sv_idle  server connections in use / ready
+    cl_active            clients holding a server connection
+    cl_waiting           clients queued for a server connection
+    maxwait_ms           how long the oldest queued client has waited
+    avg_wait_ms          average checkout latency (time spent queued)
+    avg_xact_ms          average transaction duration
+"""
+from django.conf import settings
+
+POOL_FIELDS = ('cl_active', 'cl_waiting', 'sv_active', 'sv_idle', 'sv_used', 'sv_login', 'pool_mode')
+
+
+class PoolStatsUnavailable(Exception):
+    """Raised when the PgBouncer admin console is not configured or reachable."""
+
+
+def _query(cursor, command):
+    cursor.execute(command)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_pool_stats():
+    """
+    Return ``{'pools': [...], 'settings': {...}}`` from PgBouncer, one entry per
+    database/user pool. Raises PoolStatsUnavailable without PGBOUNCER_ADMIN_URL.
+    """
+    url = getattr(settings, 'PGBOUNCER_ADMIN_URL', '')
+    if not url:
+        raise PoolStatsUnavailable('PGBOUNCER_ADMIN_URL is not set')
+
+    import psycopg2
+
+    try:
+        # The admin console only understands simple queries outside transactions
+        connection = psycopg2.connect(url, connect_timeout=3)
+        connection.autocommit = True
+    except psycopg2.Error as exc:
+        raise PoolStatsUnavailable(str(exc)) from exc
+
+    try:
+        with connection.cursor() as cursor:
+            pools = _query(cursor, 'SHOW POOLS')
+            stats = {row['database']: row for row in _query(cursor, 'SHOW STATS')}
+            databases = {row['name']: row for row in _query(cursor, 'SHOW DATABASES')}
+            config = {row['key']: row['value'] for row in _query(cursor, 'SHOW CONFIG')}
+    finally:
+        connection.close()
+
+    result = []
+    for pool in pools:
+        name = pool['database']
+        if name == 'pgbouncer':
+            continue
+        database, stat = databases.get(name, {}), stats.get(name, {})
+        entry = {'database': name, 'user': pool['user']}
+        entry.update({field: pool.get(field) for field in POOL_FIELDS})
+        entry.update({
+            'pool_size': database.get('pool_size'),
+            'max_connections': database.get('max_connections'),
+            'maxwait_ms': pool.get('maxwait', 0) * 1000 + pool.get('maxwait_us', 0) / 1000,
+            'avg_wait_ms': stat.get('avg_wait_time', 0) / 1000,
+            'avg_xact_ms': stat.get('avg_xact_time', 0) / 1000,
+            'avg_query_ms': stat.get('avg_query_time', 0) / 1000,
+            'xact_per_second': stat.get('avg_xact_count', 0),
+        })
+        result.append(entry)
+
+    return {
+        'pools': result,
+        'settings': {
+            key: config.get(key)
+            for key in ('pool_mode', 'max_client_conn', 'default_pool_size', 'reserve_pool_size')
+        },
+    }
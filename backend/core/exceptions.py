@@ -17,3 +17,10 @@ class BusinessLogicException(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = 'Business logic error.'
     default_code = 'business_logic_error'
+
+
+class NotModified(APIException):
+    """304 Not Modified - client's cached representation is still current."""
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = 'Not modified.'
+    default_code = 'not_modified'
@@ -0,0 +1,33 @@
+"""
+Common serializer fields.
+"""
+from rest_framework import serializers
+
+from .renditions import build_srcset, get_rendition_widths
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only responsive image variants for a file field.
+
+    Usage: avatar_srcset = SrcsetField(source='avatar', max_width=400)
+    Renders ``{'webp': '<url> 64w, ...', 'jpeg': '...'}`` or None for non-images.
+    Widths are the configured ``IMAGE_RENDITION_WIDTHS`` up to ``max_width``
+    (at least the smallest one), so only variants RenditionView serves are listed.
+    """
+
+    def __init__(self, max_width=None, **kwargs):
+        self.max_width = max_width
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_widths(self):
+        widths = sorted(get_rendition_widths())
+        if self.max_width is None:
+            return widths
+        return [width for width in widths if width <= self.max_width] or widths[:1]
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return build_srcset(value.name, self.get_widths())
@@ -0,0 +1,131 @@
+"""
+Background image processing.
+
+Uploads are stored immediately with ``processing_status=pending``; thumbnails
+are generated afterwards by the ``core.generate_thumbnail`` Celery task. A
+batch of images is dispatched as a Celery group, so the files are processed
+in parallel across the worker process pool instead of one after another
+inside the request.
+
+A worker that dies mid-task leaves its row in ``processing``; the periodic
+``core.recover_stuck_images`` task puts such rows back to ``pending`` once
+``IMAGE_PROCESSING_TIMEOUT`` has passed and queues them again.
+"""
+import logging
+import os
+from datetime import timedelta
+
+from celery import group
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.mixins import ImageProcessingMixin
+from core.renditions import generate_renditions
+from core.utils import generate_thumbnail
+
+logger = logging.getLogger(__name__)
+
+ProcessingStatus = ImageProcessingMixin.ProcessingStatus
+
+# model label -> (source file field, thumbnail field)
+THUMBNAIL_FIELDS = {
+    'news.NewsAttachment': ('file', 'thumbnail'),
+    'classifieds.ClassifiedImage': ('image', 'thumbnail'),
+}
+
+
+def schedule_thumbnails(instances):
+    """
+    Queue thumbnail generation for saved instances once the transaction commits.
+    Instances should already be saved with ``processing_status=pending``.
+    """
+    instances = [i for i in instances if i.processing_status == ProcessingStatus.PENDING]
+    if not instances:
+        return
+    label = instances[0]._meta.label
+    pks = [instance.pk for instance in instances]
+    transaction.on_commit(lambda: _dispatch(label, pks))
+
+
+def _dispatch(label, pks):
+    from core.tasks import generate_thumbnail as generate_thumbnail_task
+
+    try:
+        group(generate_thumbnail_task.s(label, pk) for pk in pks).apply_async()
+    except Exception:
+        # Broker unavailable - don't leave images pending forever
+        logger.exception('Could not queue thumbnails for %s %s, processing inline', label, pks)
+        for pk in pks:
+            process_thumbnail(label, pk)
+
+
+def recover_stuck_images():
+    """
+    Reset images stuck in ``processing`` longer than IMAGE_PROCESSING_TIMEOUT
+    back to ``pending`` and queue them again.
+    Returns the number of recovered images.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.IMAGE_PROCESSING_TIMEOUT)
+    recovered = 0
+    for label in THUMBNAIL_FIELDS:
+        model = apps.get_model(label)
+        # Rows claimed before processing_started_at existed have no timestamp
+        stuck = model.objects.filter(
+            Q(processing_started_at__lt=cutoff) | Q(processing_started_at__isnull=True),
+            processing_status=ProcessingStatus.PROCESSING,
+        )
+        pks = list(stuck.values_list('pk', flat=True))
+        if not pks:
+            continue
+        # Re-check the status so a row that finished meanwhile isn't reset
+        model.objects.filter(pk__in=pks, processing_status=ProcessingStatus.PROCESSING).update(
+            processing_status=ProcessingStatus.PENDING, processing_started_at=None
+        )
+        logger.warning('Recovered %d stuck %s images', len(pks), label)
+        _dispatch(label, pks)
+        recovered += len(pks)
+    return recovered
+
+
+def process_thumbnail(label, pk):
+    """
+    Generate and store the thumbnail for one instance.
+    Returns the resulting processing status, or None if there was nothing to do.
+    """
+    model = apps.get_model(label)
+    source_field, thumbnail_field = THUMBNAIL_FIELDS[label]
+
+    # Claim the row so a duplicate delivery doesn't process it twice
+    claimed = model.objects.filter(
+        pk=pk, processing_status=ProcessingStatus.PENDING
+    ).update(processing_status=ProcessingStatus.PROCESSING, processing_started_at=timezone.now())
+    if not claimed:
+        return None
+
+    instance = model.objects.get(pk=pk)
+    source = getattr(instance, source_field)
+    try:
+        with source.open('rb'):
+            thumbnail = generate_thumbnail(source)
+    except OSError:
+        thumbnail = None
+
+    if thumbnail is None:
+        instance.processing_status = ProcessingStatus.FAILED
+        instance.save(update_fields=['processing_status'])
+        return instance.processing_status
+
+    name = os.path.basename(source.name)
+    getattr(instance, thumbnail_field).save(f'thumb_{name}.jpg', thumbnail, save=False)
+    instance.processing_status = ProcessingStatus.READY
+    instance.save(update_fields=[thumbnail_field, 'processing_status'])
+
+    # Responsive variants are optional - they can still be built lazily on request
+    try:
+        generate_renditions(source.name)
+    except OSError:
+        logger.exception('Could not generate renditions for %s', source.name)
+    return instance.processing_status
@@ -0,0 +1,52 @@
+"""
+Helpers for periodic cleanup tasks.
+
+Rows are selected by primary key and changed in chunks of
+``MAINTENANCE_CHUNK_SIZE``, each in its own short transaction: locks are
+held briefly and, on PostgreSQL, autovacuum can reclaim dead rows between
+chunks instead of after one huge DELETE.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+
+def _chunks(queryset, chunk_size):
+    """Yield lists of primary keys still matching ``queryset`` until none are left."""
+    chunk_size = chunk_size or settings.MAINTENANCE_CHUNK_SIZE
+    while True:
+        ids = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+        if ids:
+            yield ids
+        if len(ids) < chunk_size:
+            return
+
+
+def delete_in_chunks(queryset, chunk_size=None):
+    """Delete the rows of ``queryset`` chunk by chunk. Returns the rows deleted, cascades included."""
+    model = queryset.model
+    deleted = 0
+    for ids in _chunks(queryset, chunk_size):
+        with transaction.atomic():
+            deleted += model.objects.filter(pk__in=ids).delete()[0]
+    return deleted
+
+
+def update_in_chunks(queryset, chunk_size=None, **values):
+    """
+    ``queryset.update(**values)`` chunk by chunk. Returns the rows updated.
+
+    The update must take the rows out of ``queryset``, otherwise it never ends.
+    """
+    model = queryset.model
+    updated = 0
+    for ids in _chunks(queryset, chunk_size):
+        with transaction.atomic():
+            updated += model.objects.filter(pk__in=ids).update(**values)
+    return updated
+
+
+def report(started, **rows):
+    """Task result: row counts plus seconds since ``started`` (``time.monotonic()``)."""
+    return {**rows, 'seconds': round(time.monotonic() - started, 3)}
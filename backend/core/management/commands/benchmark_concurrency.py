@@ -0,0 +1,147 @@
+"""
+Management command load-testing the server in WSGI and ASGI mode.
+
+Starts gunicorn from ``gunicorn.conf.py`` once per ``SERVER_MODE`` with the
+same number of workers, fires concurrent requests at I/O-bound endpoints
+(notification unread count, global search) as a generated user, and reports
+throughput and latency per mode. With ``--url`` an already running server is
+measured instead.
+
+Usage:
+    python manage.py generate_load_data
+    python manage.py benchmark_concurrency --workers 2 --concurrency 64 --requests 2000
+    python manage.py benchmark_concurrency --url http://localhost:8000
+"""
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .generate_load_data import EMAIL_DOMAIN
+
+DEFAULT_PATHS = (
+    '/api/v1/notifications/unread-count/',
+    f'/api/v1/search/?q={quote("Иван")}',
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare WSGI and ASGI throughput and latency at a fixed worker count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+        parser.add_argument('--workers', type=int, default=2, help='Gunicorn workers in both modes')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per mode')
+        parser.add_argument('--path', action='append', dest='paths', help='Endpoint to request (repeatable)')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--url', help='Measure a running server instead of starting gunicorn')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        token = self.get_token()
+
+        if options['url']:
+            results = [('server', self.run_load(options['url'].rstrip('/'), paths, token, options))]
+        else:
+            if not shutil.which('gunicorn'):
+                raise CommandError('gunicorn is not installed')
+            results = []
+            for mode in options['modes']:
+                with self.server(mode, options['workers'], options['port']) as base_url:
+                    results.append((mode, self.run_load(base_url, paths, token, options)))
+
+        self.stdout.write(
+            f'\nWorkers: {options["workers"]}, concurrency: {options["concurrency"]}, '
+            f'requests: {options["requests"]}, paths: {len(paths)}\n'
+        )
+        self.stdout.write(f'{"mode":<8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}{"errors":>8}')
+        for name, stats in results:
+            self.stdout.write(
+                f'{name:<8}{stats["rps"]:>10.1f}{stats["p50"]:>10.1f}'
+                f'{stats["p95"]:>10.1f}{stats["max"]:>10.1f}{stats["errors"]:>8}'
+            )
+
+    def get_token(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.accounts.models import User
+
+        user = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', is_active=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('No generated users - run generate_load_data first')
+        return str(AccessToken.for_user(user))
+
+    @contextmanager
+    def server(self, mode, workers, port):
+        env = {
+            **os.environ,
+            'SERVER_MODE': mode,
+            'GUNICORN_WORKERS': str(workers),
+            'GUNICORN_BIND': f'127.0.0.1:{port}',
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+        }
+        process = subprocess.Popen(
+            ['gunicorn', '--config', 'gunicorn.conf.py'],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr,
+        )
+        try:
+            self.wait_for_port(port, process)
+            self.stdout.write(f'Started gunicorn ({mode}, {workers} workers)')
+            yield f'http://127.0.0.1:{port}'
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_for_port(self, port, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'gunicorn exited with code {process.returncode}')
+            with socket.socket() as sock:
+                if sock.connect_ex(('127.0.0.1', port)) == 0:
+                    return
+            time.sleep(0.2)
+        raise CommandError(f'gunicorn did not listen on port {port} within {timeout}s')
+
+    def run_load(self, base_url, paths, token, options):
+        headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+        urls = [f'{base_url}{paths[i % len(paths)]}' for i in range(options['requests'])]
+
+        def fetch(url):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=60) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - start, ok
+
+        # Warm up connections, caches and lazily imported modules
+        for path in paths:
+            fetch(f'{base_url}{path}')
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            outcomes = list(executor.map(fetch, urls))
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(duration * 1000 for duration, _ in outcomes)
+        return {
+            'rps': len(outcomes) / elapsed,
+            'p50': statistics.median(timings),
+            'p95': timings[int(len(timings) * 0.95) - 1],
+            'max': timings[-1],
+            'errors': sum(1 for _, ok in outcomes if not ok),
+        }
@@ -0,0 +1,119 @@
+"""
+Management command timing key API endpoints and checking their query budgets.
+
+Meant to run against a large tenant built by ``generate_load_data``, locally
+on PostgreSQL. Each endpoint is requested through the full Django stack
+(middleware, authentication, serializers, rendering) as a generated user.
+Exits with an error when an endpoint issues more queries than its budget.
+
+Usage:
+    python manage.py generate_load_data
+    python manage.py benchmark_endpoints --repeat 10
+    python manage.py benchmark_endpoints --only news-list wiki-tree
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from .generate_load_data import EMAIL_DOMAIN
+
+
+def first_id(model, **filters):
+    return model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True).first()
+
+
+def build_endpoints():
+    """Return ``[(name, url, query budget)]`` for the endpoints under test."""
+    from apps.bookings.models import Resource
+    from apps.news.models import News
+    from apps.organization.models import Department
+    from apps.wiki.models import WikiSpace
+    from apps.accounts.models import User
+
+    news_id = first_id(News, status='published')
+    user_id = first_id(User, email__endswith=f'@{EMAIL_DOMAIN}')
+    space_id = first_id(WikiSpace)
+    department_id = first_id(Department, parent__isnull=True)
+    resource_id = first_id(Resource)
+
+    endpoints = [
+        ('news-list', '/api/v1/news/', 12),
+        ('news-list-cursor', '/api/v1/news/?pagination=cursor', 12),
+        ('news-detail', f'/api/v1/news/{news_id}/', 15),
+        ('users-list', '/api/v1/users/', 12),
+        ('user-detail', f'/api/v1/users/{user_id}/', 15),
+        ('organization-tree', '/api/v1/organization/tree/', 10),
+        ('departments-list', '/api/v1/organization/departments/', 10),
+        ('wiki-spaces', '/api/v1/wiki/spaces/', 10),
+        ('wiki-tree', f'/api/v1/wiki/spaces/{space_id}/tree/', 10),
+        ('bookings-list', f'/api/v1/bookings/?resource={resource_id}', 10),
+        ('notifications-list', '/api/v1/notifications/', 8),
+        ('audit-list', '/api/v1/admin/audit/', 10),
+        ('audit-list-cursor', '/api/v1/admin/audit/?pagination=cursor', 10),
+        ('global-search', '/api/v1/search/?q=Иван', 15),
+        ('okr-stats', '/api/v1/okr/stats/', 8),
+    ]
+    if department_id:
+        endpoints.append((
+            'department-skills-matrix', f'/api/v1/organization/departments/{department_id}/skills-matrix/', 10,
+        ))
+    return endpoints
+
+
+class Command(BaseCommand):
+    help = 'Time key API endpoints and assert query-count budgets (run after generate_load_data)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per endpoint (median is reported)')
+        parser.add_argument('--only', nargs='+', metavar='NAME', help='Benchmark only these endpoints')
+        parser.add_argument('--no-fail', action='store_true', help="Report budget violations but don't fail")
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User
+
+        # Superuser so admin endpoints (audit) are reachable too
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            user = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').order_by('pk').first()
+        if user is None:
+            raise CommandError('No users found - run generate_load_data first.')
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        endpoints = build_endpoints()
+        if options['only']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['only']]
+
+        self.stdout.write(f'\nAs {user.email}, {options["repeat"]} runs per endpoint\n')
+        self.stdout.write(f'{"endpoint":<28}{"status":>7}{"median ms":>11}{"max ms":>9}{"queries":>9}{"budget":>8}')
+
+        over_budget = []
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for name, url, budget in endpoints:
+                timings, queries, status_code = self.measure(client, url, options['repeat'])
+                marker = ''
+                if queries > budget:
+                    over_budget.append(name)
+                    marker = self.style.ERROR('  over budget')
+                self.stdout.write(
+                    f'{name:<28}{status_code:>7}{statistics.median(timings) * 1000:>11.1f}'
+                    f'{max(timings) * 1000:>9.1f}{queries:>9}{budget:>8}{marker}'
+                )
+
+        if over_budget and not options['no_fail']:
+            raise CommandError(f'Query budget exceeded: {", ".join(over_budget)}')
+
+    def measure(self, client, url, repeat):
+        # Warm-up request (URL resolution, imports, caches) is not measured
+        client.get(url)
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - start)
+        return timings, len(context.captured_queries), response.status_code
@@ -0,0 +1,144 @@
+"""
+Management command comparing the stock DRF JSON renderer/parser with the
+orjson-backed ones on representative payloads.
+
+Usage:
+    python manage.py benchmark_json --repeat 20
+"""
+import io
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import HAS_ORJSON, FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON render/parse time of the stock and orjson-backed DRF classes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        if not HAS_ORJSON:
+            self.stdout.write(self.style.WARNING('orjson is not installed - both columns use the stdlib encoder'))
+
+        repeat = options['repeat']
+        payloads = {
+            'org tree (200 depts)': self.org_tree(),
+            'wiki tree (5k pages)': self.wiki_tree(),
+            'news list (20 posts)': self.news_list(),
+            'user list (1000)': self.user_list(),
+        }
+
+        stock_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        stock_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(
+            f'\n{"payload":<24}{"KB":>8}{"render ms":>12}{"fast ms":>10}{"x":>6}'
+            f'{"parse ms":>11}{"fast ms":>10}{"x":>6}'
+        )
+        for name, data in payloads.items():
+            body = stock_renderer.render(data)
+            render = self.measure(lambda: stock_renderer.render(data), repeat)
+            fast_render = self.measure(lambda: fast_renderer.render(data), repeat)
+            parse = self.measure(lambda: stock_parser.parse(io.BytesIO(body)), repeat)
+            fast_parse = self.measure(lambda: fast_parser.parse(io.BytesIO(body)), repeat)
+            self.stdout.write(
+                f'{name:<24}{len(body) / 1024:>8.0f}'
+                f'{render * 1000:>12.2f}{fast_render * 1000:>10.2f}{render / fast_render:>6.1f}'
+                f'{parse * 1000:>11.2f}{fast_parse * 1000:>10.2f}{parse / fast_parse:>6.1f}'
+            )
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def user(self, index):
+        now = timezone.now()
+        return {
+            'id': index,
+            'email': f'user{index}@example.com',
+            'full_name': f'Сотрудник Номер {index}',
+            'avatar': f'/media/avatars/{uuid.uuid4().hex}.jpg',
+            'department': {'id': index % 200, 'name': f'Отдел {index % 200}'},
+            'position': {'id': index % 40, 'name': f'Должность {index % 40}', 'level': index % 10},
+            'status': _('Active'),
+            'hired_at': (now - timedelta(days=index)).date(),
+            'last_login': now - timedelta(minutes=index),
+            'rating': Decimal(index % 500) / 100,
+            'session_id': uuid.UUID(int=index),
+        }
+
+    def user_list(self):
+        return {'count': 1000, 'next': None, 'previous': None, 'results': [self.user(i) for i in range(1000)]}
+
+    def org_tree(self, depth=6, fanout=2):
+        counter = iter(range(1, 10 ** 6))
+
+        def node(level):
+            index = next(counter)
+            return {
+                'id': index,
+                'name': f'Отдел {index}',
+                'description': 'Подразделение компании ' * 4,
+                'head': index,
+                'head_name': f'Руководитель {index}',
+                'head_info': self.user(index),
+                'employees_count': index * 3 % 50,
+                'children': [node(level + 1) for _ in range(fanout)] if level < depth else [],
+            }
+
+        # ~200 departments
+        return [node(1) for _ in range(3)]
+
+    def wiki_tree(self, pages=5000, fanout=10):
+        nodes = [
+            {'id': i, 'title': f'Страница {i}', 'slug': f'page-{i}', 'order': i % fanout, 'children': []}
+            for i in range(pages)
+        ]
+        for i in range(1, pages):
+            nodes[(i - 1) // fanout]['children'].append(nodes[i])
+        return [nodes[0]]
+
+    def news_list(self):
+        now = timezone.now()
+        blocks = [
+            {'id': uuid.uuid4().hex[:10], 'type': 'paragraph', 'data': {'text': 'Текст новости с <b>разметкой</b>. ' * 20}}
+            for _ in range(30)
+        ] + [
+            {'id': uuid.uuid4().hex[:10], 'type': 'list', 'data': {'style': 'unordered', 'items': ['пункт'] * 15}},
+            {'id': uuid.uuid4().hex[:10], 'type': 'table', 'data': {'content': [['ячейка'] * 6] * 20}},
+        ]
+        return {
+            'count': 20,
+            'next': None,
+            'previous': None,
+            'results': [
+                {
+                    'id': index,
+                    'title': f'Новость {index}',
+                    'content': {'time': 1700000000000, 'blocks': blocks, 'version': '2.28.2'},
+                    'author': self.user(index),
+                    'tags': [{'id': t, 'name': f'Тег {t}', 'slug': f'tag-{t}'} for t in range(5)],
+                    'comments_count': index * 7,
+                    'reactions': {'👍': index, '❤️': index * 2},
+                    'created_at': now - timedelta(hours=index),
+                    'is_pinned': index == 0,
+                }
+                for index in range(20)
+            ],
+        }
@@ -0,0 +1,85 @@
+"""
+Management command measuring login throughput of a single worker.
+
+Logs a throwaway user in through the full Django stack (password check,
+token issuance, audit entry, session record) and reports logins per second,
+next to the cost of one password hash and of user-agent parsing with and
+without the LRU cache. Everything runs in a transaction that is rolled back.
+
+Usage:
+    python manage.py benchmark_login --repeat 50
+"""
+import statistics
+import time
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIClient
+
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Version/17.2 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Version/17.2 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+)
+EMAIL = 'benchmark-login@example.com'
+PASSWORD = 'benchmark-password-123'
+
+
+class Command(BaseCommand):
+    help = 'Measure logins per second of one worker and the cost of their parts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Number of logins')
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User, parse_device
+
+        repeat = options['repeat']
+        if repeat < 1:
+            raise CommandError('--repeat must be positive')
+
+        encoded = make_password(PASSWORD)
+        hash_time = self.measure(lambda: check_password(PASSWORD, encoded), 5)
+
+        from user_agents import parse
+        # Unique strings - ua-parser keeps a small cache of its own
+        fresh = (f'{agent} build/{index}' for index in range(10 ** 6) for agent in USER_AGENTS)
+        parse_time = self.measure(lambda: [parse(next(fresh)) for _ in USER_AGENTS], 5) / len(USER_AGENTS)
+        parse_device.cache_clear()
+        [parse_device(agent) for agent in USER_AGENTS]
+        cached_time = self.measure(lambda: [parse_device(agent) for agent in USER_AGENTS], 5) / len(USER_AGENTS)
+
+        client = APIClient()
+        timings = []
+        with transaction.atomic():
+            User.objects.create_user(email=EMAIL, password=PASSWORD, first_name='Benchmark', last_name='Login')
+            for index in range(repeat):
+                start = time.perf_counter()
+                response = client.post(
+                    '/api/v1/auth/login/', {'email': EMAIL, 'password': PASSWORD},
+                    HTTP_USER_AGENT=USER_AGENTS[index % len(USER_AGENTS)],
+                )
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise CommandError(f'Login failed with {response.status_code}: {response.data}')
+            transaction.set_rollback(True)
+
+        median = statistics.median(timings)
+        self.stdout.write(f'\n{"password hash":<28}{hash_time * 1000:>10.2f} ms')
+        self.stdout.write(f'{"user agent parse":<28}{parse_time * 1000:>10.3f} ms')
+        self.stdout.write(f'{"user agent parse (cached)":<28}{cached_time * 1000:>10.3f} ms')
+        self.stdout.write(f'{"login (median)":<28}{median * 1000:>10.2f} ms')
+        self.stdout.write(self.style.SUCCESS(f'{"logins/s per worker":<28}{1 / median:>10.1f}'))
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
@@ -0,0 +1,112 @@
+"""
+Management command comparing page-number and keyset pagination on the audit log.
+
+Usage:
+    python manage.py benchmark_pagination --create-rows 1000000 --page 500
+"""
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.pagination import KeysetPagination, StandardPagination
+
+
+class Command(BaseCommand):
+    help = 'Compare page 1 vs page N latency for page-number and keyset pagination on AuditLog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--create-rows',
+            type=int,
+            default=0,
+            help='Insert this many synthetic audit rows first (e.g. 1000000)',
+        )
+        parser.add_argument('--page', type=int, default=500, help='Deep page to measure')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        from apps.audit.models import AuditLog
+
+        if options['create_rows']:
+            self.create_rows(AuditLog, options['create_rows'])
+
+        total = AuditLog.objects.count()
+        page, page_size, repeat = options['page'], options['page_size'], options['repeat']
+        if total < page * page_size:
+            self.stdout.write(self.style.WARNING(
+                f'Only {total} audit rows - page {page} needs {page * page_size}. Use --create-rows.'
+            ))
+            return
+
+        factory = APIRequestFactory()
+        queryset = AuditLog.objects.select_related('user').order_by('-created_at', '-id')
+
+        def page_number(number):
+            paginator = StandardPagination()
+            request = Request(factory.get('/', {'page': number, 'page_size': page_size}))
+            return paginator.paginate_queryset(queryset, request)
+
+        def keyset(cursor):
+            paginator = KeysetPagination()
+            params = {'page_size': page_size}
+            if cursor:
+                params['cursor'] = cursor
+            request = Request(factory.get('/', params))
+            return paginator, paginator.paginate_queryset(queryset, request)
+
+        # Cursor pointing at the row before the deep page (same rows as page-number page N)
+        boundary = queryset[(page - 1) * page_size - 1]
+        deep_cursor = KeysetPagination().encode_cursor(boundary)
+
+        results = [
+            ('page-number', 1, self.measure(lambda: page_number(1), repeat)),
+            ('page-number', page, self.measure(lambda: page_number(page), repeat)),
+            ('keyset', 1, self.measure(lambda: keyset(None), repeat)),
+            ('keyset', page, self.measure(lambda: keyset(deep_cursor), repeat)),
+        ]
+
+        self.stdout.write(f'\nAuditLog rows: {total}, page size: {page_size}, runs: {repeat}\n')
+        self.stdout.write(f'{"pagination":<14}{"page":>8}{"median ms":>12}')
+        for name, number, elapsed in results:
+            self.stdout.write(f'{name:<14}{number:>8}{elapsed * 1000:>12.2f}')
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def create_rows(self, model, count, batch_size=10000):
+        self.stdout.write(f'Creating {count} audit rows...')
+        now = timezone.now()
+        actions = [choice for choice, _ in model.Action.choices]
+
+        # Spread timestamps over the past instead of stamping every row with now()
+        created_at = model._meta.get_field('created_at')
+        created_at.auto_now_add = False
+        try:
+            created = 0
+            while created < count:
+                size = min(batch_size, count - created)
+                model.objects.bulk_create([
+                    model(
+                        action=actions[(created + i) % len(actions)],
+                        entity_type='Benchmark',
+                        entity_id=created + i,
+                        entity_repr=f'Benchmark row {created + i}',
+                        created_at=now - timedelta(seconds=created + i),
+                    )
+                    for i in range(size)
+                ])
+                created += size
+        finally:
+            created_at.auto_now_add = True
+        self.stdout.write(self.style.SUCCESS(f'Created {count} rows'))
@@ -0,0 +1,38 @@
+"""
+Management command printing PgBouncer pool occupancy and checkout latency.
+
+Usage:
+    python manage.py db_pool_stats
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.dbpool import PoolStatsUnavailable, get_pool_stats
+
+
+class Command(BaseCommand):
+    help = 'Show connection pool size, usage and wait times (PgBouncer admin console)'
+
+    def handle(self, *args, **options):
+        database = settings.DATABASES['default']
+        self.stdout.write(
+            f'Django: CONN_MAX_AGE={database.get("CONN_MAX_AGE")}, '
+            f'pool mode={getattr(settings, "DATABASE_POOL_MODE", "") or "none"}, '
+            f'server-side cursors {"off" if database.get("DISABLE_SERVER_SIDE_CURSORS") else "on"}'
+        )
+        try:
+            stats = get_pool_stats()
+        except PoolStatsUnavailable as exc:
+            raise CommandError(f'Pool stats unavailable: {exc}')
+
+        self.stdout.write('PgBouncer: ' + ', '.join(f'{k}={v}' for k, v in stats['settings'].items()))
+        self.stdout.write(
+            f'\n{"database":<20}{"size":>6}{"sv act":>8}{"sv idle":>8}{"cl act":>8}{"cl wait":>8}'
+            f'{"maxwait ms":>12}{"avg wait ms":>13}{"avg xact ms":>13}'
+        )
+        for pool in stats['pools']:
+            self.stdout.write(
+                f'{pool["database"][:19]:<20}{pool["pool_size"] or 0:>6}{pool["sv_active"]:>8}{pool["sv_idle"]:>8}'
+                f'{pool["cl_active"]:>8}{pool["cl_waiting"]:>8}{pool["maxwait_ms"]:>12.1f}'
+                f'{pool["avg_wait_ms"]:>13.2f}{pool["avg_xact_ms"]:>13.2f}'
+            )
@@ -0,0 +1,418 @@
+"""
+Management command generating a large synthetic tenant for performance work.
+
+All rows are inserted with bulk_create in batches, so the defaults (a tenant of
+20k employees) take minutes rather than hours on PostgreSQL. Generated users
+have ``@load.test`` emails and everything generated is removed by ``--clear``.
+
+Usage:
+    python manage.py generate_load_data
+    python manage.py generate_load_data --scale 0.01      # quick smoke run
+    python manage.py generate_load_data --users 5000 --news 10000 --reactions 0
+    python manage.py generate_load_data --clear
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.signals import VERSIONED_MODELS
+
+EMAIL_DOMAIN = 'load.test'
+NAME_PREFIX = '[load]'
+PASSWORD = 'loadtest123'
+
+FIRST_NAMES = ['Иван', 'Мария', 'Алексей', 'Анна', 'Дмитрий', 'Елена', 'Сергей', 'Ольга', 'Павел', 'Наталья']
+LAST_NAMES = ['Иванов', 'Петрова', 'Смирнов', 'Кузнецова', 'Попов', 'Соколова', 'Лебедев', 'Козлова', 'Новиков']
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the given auto_now/auto_now_add values instead of stamping now()."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic tenant (users, departments, news, reactions, wiki, bookings, audit)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--departments', type=int, default=200)
+        parser.add_argument('--depth', type=int, default=6, help='Depth of the department tree')
+        parser.add_argument('--news', type=int, default=50000)
+        parser.add_argument('--reactions', type=int, default=1000000)
+        parser.add_argument('--wiki-pages', type=int, default=5000)
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--audit-rows', type=int, default=2000000)
+        parser.add_argument('--objectives', type=int, default=10000, help='OKR objectives, 3 key results each')
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every count (e.g. 0.01)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data and exit')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.clear()
+            return
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+
+        def count(name, minimum=0):
+            return max(minimum, int(options[name] * options['scale']))
+
+        started = time.perf_counter()
+        departments = self.step('departments', self.create_departments, count('departments', 1), options['depth'])
+        positions = self.step('positions', self.create_positions)
+        users = self.step('users', self.create_users, count('users', 1), departments, positions)
+        news = self.step('news', self.create_news, count('news'), users)
+        self.step('reactions', self.create_reactions, count('reactions'), news, users)
+        self.step('wiki pages', self.create_wiki, count('wiki_pages'), users, departments)
+        self.step('bookings', self.create_bookings, count('bookings'), users)
+        self.step('audit rows', self.create_audit, count('audit_rows'), users)
+        self.step('objectives', self.create_okr, count('objectives'), users)
+
+        # bulk_create bypasses signals - invalidate conditional GET validators once
+        from core.models import ModelVersion
+        for label in VERSIONED_MODELS:
+            ModelVersion.objects.bump(label)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done in {time.perf_counter() - started:.0f}s. Users log in with *@{EMAIL_DOMAIN} / {PASSWORD}'
+        ))
+
+    def step(self, label, func, *args):
+        start = time.perf_counter()
+        with transaction.atomic():
+            result = func(*args)
+        created = len(result) if isinstance(result, list) else result
+        self.stdout.write(f'  {label:<12} {created:>9}  {time.perf_counter() - start:>7.1f}s')
+        return result
+
+    def bulk_create(self, model, objects, **kwargs):
+        """Insert an iterable of unsaved objects in batches, returning the created objects."""
+        created, batch = [], []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                created.extend(model.objects.bulk_create(batch, **kwargs))
+                batch = []
+        if batch:
+            created.extend(model.objects.bulk_create(batch, **kwargs))
+        return created
+
+    def bulk_insert(self, model, objects):
+        """Like bulk_create, for large tables whose objects aren't needed afterwards."""
+        inserted, batch = 0, []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            inserted += len(batch)
+        return inserted
+
+    def past(self, max_days):
+        return self.now - timedelta(seconds=self.rng.randint(0, max_days * 86400))
+
+    def create_departments(self, total, depth):
+        from apps.organization.models import Department
+
+        # Spread departments over the levels, widening towards the leaves
+        depth = max(1, min(depth, total))
+        weights = [2 ** level for level in range(depth)]
+        per_level = [max(1, total * weight // sum(weights)) for weight in weights]
+        per_level[-1] += total - sum(per_level)
+
+        created, parents = [], [None]
+        for level, size in enumerate(per_level):
+            level_departments = self.bulk_create(Department, (
+                Department(
+                    name=f'{NAME_PREFIX} Отдел {level + 1}.{index + 1}',
+                    description='Сгенерированное подразделение',
+                    parent=parents[index % len(parents)],
+                    order=index,
+                )
+                for index in range(size)
+            ))
+            created.extend(level_departments)
+            parents = level_departments
+        return created
+
+    def create_positions(self, total=40):
+        from apps.organization.models import Position
+
+        return self.bulk_create(Position, (
+            Position(name=f'{NAME_PREFIX} Должность {index + 1}', level=index % 10 + 1)
+            for index in range(total)
+        ))
+
+    def create_users(self, total, departments, positions):
+        from apps.accounts.models import User
+
+        # Hashing once instead of per user keeps this step I/O bound
+        password = make_password(PASSWORD)
+        today = date.today()
+        users = self.bulk_create(User, (
+            User(
+                # The first one is an admin, so admin endpoints can be benchmarked too
+                email=f'admin@{EMAIL_DOMAIN}' if index == 0 else f'user{index}@{EMAIL_DOMAIN}',
+                is_staff=index == 0,
+                is_superuser=index == 0,
+                password=password,
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                department=departments[index % len(departments)],
+                position=positions[index % len(positions)],
+                birth_date=today - timedelta(days=self.rng.randint(20 * 365, 60 * 365)),
+                hire_date=today - timedelta(days=self.rng.randint(0, 10 * 365)),
+                has_completed_onboarding=True,
+            )
+            for index in range(total)
+        ))
+
+        # One head per department
+        for department, head in zip(departments, users):
+            department.head = head
+        type(departments[0]).objects.bulk_update(departments, ['head'], batch_size=self.batch_size)
+        return users
+
+    def create_news(self, total, users):
+        from apps.news.models import News, Tag
+
+        tags = [
+            Tag.objects.get_or_create(slug=f'load-tag-{index}', defaults={'name': f'{NAME_PREFIX} Тег {index}'})[0]
+            for index in range(20)
+        ]
+        content = {
+            'time': 1700000000000,
+            'version': '2.28.2',
+            'blocks': [
+                {'type': 'header', 'data': {'text': 'Заголовок', 'level': 2}},
+                {'type': 'paragraph', 'data': {'text': 'Текст сгенерированной новости. ' * 20}},
+                {'type': 'list', 'data': {'style': 'unordered', 'items': ['Пункт 1', 'Пункт 2', 'Пункт 3']}},
+            ],
+        }
+        with explicit_timestamps(News, 'created_at', 'updated_at'):
+            news = []
+            for index in range(total):
+                created_at = self.past(3 * 365)
+                news.append(News(
+                    title=f'{NAME_PREFIX} Новость {index + 1}',
+                    content=content,
+                    author=self.rng.choice(users),
+                    status=News.Status.PUBLISHED,
+                    is_pinned=index < 3,
+                    created_at=created_at,
+                    updated_at=created_at,
+                ))
+            news = self.bulk_create(News, news)
+
+        through = News.tags.through
+        self.bulk_insert(through, (
+            through(news_id=item.pk, tag_id=tag.pk)
+            for item in news
+            for tag in self.rng.sample(tags, self.rng.randint(0, 3))
+        ))
+        return news
+
+    def create_reactions(self, total, news, users):
+        from apps.news.models import Reaction
+
+        if not news or not total:
+            return 0
+        types = [choice for choice, _ in Reaction.ReactionType.choices]
+        per_news = min(len(users), max(1, total // len(news)))
+
+        def reactions():
+            remaining = total
+            for item in news:
+                if remaining <= 0:
+                    return
+                # (news, user) is unique - sample distinct users per post
+                for user in self.rng.sample(users, min(per_news, remaining)):
+                    yield Reaction(news_id=item.pk, user_id=user.pk, type=self.rng.choice(types))
+                remaining -= per_news
+
+        return self.bulk_insert(Reaction, reactions())
+
+    def create_wiki(self, total, users, departments, spaces=20):
+        from apps.wiki.models import WikiPage, WikiSpace
+
+        if not total:
+            return 0
+        wiki_spaces = self.bulk_create(WikiSpace, (
+            WikiSpace(
+                name=f'{NAME_PREFIX} Пространство {index + 1}',
+                slug=f'load-space-{index + 1}',
+                owner=self.rng.choice(users),
+                department=departments[index % len(departments)],
+                order=index,
+            )
+            for index in range(spaces)
+        ))
+
+        # Created level by level so parents have primary keys; at most 5 levels deep
+        created, previous = 0, {space.pk: [] for space in wiki_spaces}
+        per_level = [total // 15, total * 2 // 15, total * 3 // 15, total * 4 // 15]
+        per_level.append(total - sum(per_level))
+        for depth, size in enumerate(per_level):
+            pages = []
+            for index in range(size):
+                space = wiki_spaces[index % spaces]
+                candidates = previous[space.pk]
+                parent = self.rng.choice(candidates) if candidates else None
+                number = created + index + 1
+                pages.append(WikiPage(
+                    title=f'{NAME_PREFIX} Страница {number}',
+                    slug=f'load-page-{number}',
+                    content={'blocks': [{'type': 'paragraph', 'data': {'text': 'Содержимое страницы. ' * 30}}]},
+                    space=space,
+                    author=self.rng.choice(users),
+                    parent=parent,
+                    depth=parent.depth + 1 if parent else 0,
+                    order=index,
+                ))
+            pages = self.bulk_create(WikiPage, pages)
+            created += len(pages)
+            previous = {space.pk: [] for space in wiki_spaces}
+            for page in pages:
+                previous[page.space_id].append(page)
+        return created
+
+    def create_bookings(self, total, users, resources=50):
+        from apps.bookings.models import Booking, Resource, ResourceType
+
+        if not total:
+            return 0
+        resource_type, _ = ResourceType.objects.get_or_create(
+            slug='load-rooms', defaults={'name': f'{NAME_PREFIX} Переговорные'}
+        )
+        rooms = self.bulk_create(Resource, (
+            Resource(type=resource_type, name=f'{NAME_PREFIX} Комната {index + 1}', capacity=4 + index % 12)
+            for index in range(resources)
+        ))
+
+        # Hour slots on working days, newest first, so bookings on a room never overlap
+        start = (self.now + timedelta(days=30)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+        def bookings():
+            for index in range(total):
+                room = rooms[index % resources]
+                slot = index // resources
+                day, hour = divmod(slot, 8)
+                starts_at = start - timedelta(days=day) + timedelta(hours=hour)
+                yield Booking(
+                    resource=room,
+                    user=self.rng.choice(users),
+                    title=f'{NAME_PREFIX} Встреча',
+                    starts_at=starts_at,
+                    ends_at=starts_at + timedelta(minutes=self.rng.choice([30, 60])),
+                )
+
+        return self.bulk_insert(Booking, bookings())
+
+    def create_audit(self, total, users):
+        from apps.audit.models import AuditLog
+
+        actions = [choice for choice, _ in AuditLog.Action.choices]
+        entity_types = ['User', 'News', 'Department', 'WikiPage', 'Booking']
+
+        def rows():
+            for index in range(total):
+                yield AuditLog(
+                    user=self.rng.choice(users),
+                    action=self.rng.choice(actions),
+                    entity_type=self.rng.choice(entity_types),
+                    entity_id=self.rng.randint(1, 100000),
+                    entity_repr=f'{NAME_PREFIX} {index}',
+                    ip_address='10.0.0.1',
+                    created_at=self.now - timedelta(seconds=index * 15),
+                )
+
+        with explicit_timestamps(AuditLog, 'created_at'):
+            return self.bulk_insert(AuditLog, rows())
+
+    def create_okr(self, total, users):
+        from apps.okr.models import CheckIn, KeyResult, Objective, OKRPeriod
+
+        if not total:
+            return 0
+        today = date.today()
+        period = OKRPeriod.objects.create(
+            name=f'{NAME_PREFIX} Q', starts_at=today - timedelta(days=30), ends_at=today + timedelta(days=60),
+        )
+        levels = [choice for choice, _ in Objective.Level.choices]
+        statuses = [choice for choice, _ in Objective.Status.choices]
+        objectives = self.bulk_create(Objective, (
+            Objective(
+                period=period,
+                title=f'{NAME_PREFIX} Цель {index}',
+                # Every 100th belongs to the admin, so their stats aren't empty
+                owner=users[0] if index % 100 == 0 else self.rng.choice(users),
+                level=self.rng.choice(levels),
+                status=self.rng.choice(statuses),
+            )
+            for index in range(total)
+        ))
+        key_results = self.bulk_create(KeyResult, (
+            KeyResult(
+                objective=objective,
+                title=f'Результат {index + 1}',
+                type=KeyResult.ResultType.QUALITATIVE,
+                progress=self.rng.randint(0, 100),
+                order=index,
+            )
+            for objective in objectives
+            for index in range(3)
+        ))
+        self.bulk_insert(CheckIn, (
+            CheckIn(
+                key_result=key_result,
+                author=key_result.objective.owner,
+                previous_value=0,
+                new_value=key_result.progress,
+                previous_progress=0,
+                new_progress=key_result.progress,
+            )
+            for key_result in key_results[::3]
+        ))
+        return len(objectives)
+
+    def clear(self):
+        from apps.accounts.models import User
+        from apps.audit.models import AuditLog
+        from apps.bookings.models import ResourceType
+        from apps.news.models import Tag
+        from apps.okr.models import OKRPeriod
+        from apps.organization.models import Department, Position
+        from apps.wiki.models import WikiSpace
+
+        with transaction.atomic():
+            # Audit rows outlive their users (SET_NULL), so remove them explicitly
+            AuditLog.objects.filter(entity_repr__startswith=NAME_PREFIX).delete()
+            WikiSpace.objects.filter(slug__startswith='load-space-').delete()
+            ResourceType.objects.filter(slug='load-rooms').delete()
+            OKRPeriod.objects.filter(name__startswith=NAME_PREFIX).delete()
+            Tag.objects.filter(slug__startswith='load-tag-').delete()
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+            Department.objects.filter(name__startswith=NAME_PREFIX).delete()
+            Position.objects.filter(name__startswith=NAME_PREFIX).delete()
+        self.stdout.write(self.style.SUCCESS('Generated load data removed'))
@@ -0,0 +1,40 @@
+"""
+Management command printing the endpoints with the worst timings or query
+counts, as aggregated by core.profiling.ProfilingMiddleware.
+
+Usage:
+    python manage.py profiling_report --hours 24 --order-by avg_queries --limit 20
+"""
+from django.core.management.base import BaseCommand
+
+from core.profiling import REPORT_ORDERINGS, get_top_endpoints
+
+
+class Command(BaseCommand):
+    help = 'Print the top endpoints by time or query count (requires PROFILING_ENABLED)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Look back this many hours')
+        parser.add_argument('--order-by', choices=list(REPORT_ORDERINGS), default='total_time')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = get_top_endpoints(hours=options['hours'], order_by=options['order_by'], limit=options['limit'])
+        if not rows:
+            self.stdout.write(self.style.WARNING(
+                f'No profiles recorded in the last {options["hours"]}h. Is PROFILING_ENABLED set?'
+            ))
+            return
+
+        self.stdout.write(
+            f'{"endpoint":<40}{"method":<8}{"requests":>9}{"avg q":>8}{"max q":>7}'
+            f'{"avg ms":>9}{"max ms":>9}{"db %":>6}{"ser %":>7}'
+        )
+        for row in rows:
+            total = row['total_time'] or 1
+            self.stdout.write(
+                f'{row["url_name"][:39]:<40}{row["method"]:<8}{row["requests"]:>9}'
+                f'{row["avg_queries"]:>8.1f}{row["max_queries"]:>7}'
+                f'{row["avg_time"]:>9.1f}{row["max_total_time"]:>9.1f}'
+                f'{row["db_time"] / total * 100:>6.0f}{row["serializer_time"] / total * 100:>7.0f}'
+            )
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('file', models.FileField(max_length=255, upload_to='', verbose_name='file')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='size')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='reference count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'file blob',
+                'verbose_name_plural': 'file blobs',
+                'indexes': [models.Index(fields=['ref_count'], name='core_fileblob_ref_count_idx')],
+            },
+        ),
+    ]
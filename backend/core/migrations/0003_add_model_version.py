@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_add_content_addressed_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=100, unique=True, verbose_name='model label')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='version')),
+            ],
+            options={
+                'verbose_name': 'model version',
+                'verbose_name_plural': 'model versions',
+            },
+        ),
+    ]
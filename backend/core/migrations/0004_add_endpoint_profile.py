@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_add_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EndpointProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(verbose_name='hour')),
+                ('url_name', models.CharField(max_length=200, verbose_name='URL name')),
+                ('method', models.CharField(max_length=10, verbose_name='method')),
+                ('requests', models.PositiveIntegerField(default=0, verbose_name='requests')),
+                ('queries', models.PositiveBigIntegerField(default=0, verbose_name='queries')),
+                ('max_queries', models.PositiveIntegerField(default=0, verbose_name='max queries')),
+                ('db_time', models.FloatField(default=0, verbose_name='DB time')),
+                ('serializer_time', models.FloatField(default=0, verbose_name='serializer time')),
+                ('total_time', models.FloatField(default=0, verbose_name='total time')),
+                ('max_total_time', models.FloatField(default=0, verbose_name='max total time')),
+            ],
+            options={
+                'verbose_name': 'endpoint profile',
+                'verbose_name_plural': 'endpoint profiles',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='endpointprofile',
+            constraint=models.UniqueConstraint(fields=('bucket', 'url_name', 'method'), name='core_endpointprofile_unique_bucket'),
+        ),
+    ]
@@ -1,7 +1,15 @@
 """
 Common mixins for models and views.
 """
-from django.db import models
+import hashlib
+
+from django.db import models, transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.utils.translation import gettext_lazy as _
+from rest_framework.response import Response
+
+from .exceptions import NotModified
 
 
 class TimestampMixin(models.Model):
@@ -11,3 +19,176 @@ class TimestampMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ImageProcessingMixin(models.Model):
+    """
+    Adds a processing status for images whose derivatives (thumbnails)
+    are generated in the background by core.tasks.generate_thumbnail.
+    """
+
+    class ProcessingStatus(models.TextChoices):
+        PENDING = 'pending', _('Ожидает обработки')
+        PROCESSING = 'processing', _('Обрабатывается')
+        READY = 'ready', _('Готово')
+        FAILED = 'failed', _('Ошибка обработки')
+
+    processing_status = models.CharField(
+        _('Статус обработки'),
+        max_length=20,
+        choices=ProcessingStatus.choices,
+        default=ProcessingStatus.READY
+    )
+    processing_started_at = models.DateTimeField(
+        _('Начало обработки'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+
+class ContentAddressedFileMixin(models.Model):
+    """
+    Stores the model's upload (``blob_file_field``) in content-addressed
+    storage via core.FileBlob, so identical files are kept once and
+    reference-counted. The file field keeps pointing at the stored path,
+    so URLs and serializers are unchanged.
+    """
+    blob_file_field = 'file'
+
+    blob = models.ForeignKey(
+        'core.FileBlob',
+        verbose_name=_('blob'),
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        from core.models import FileBlob
+
+        field_file = getattr(self, self.blob_file_field)
+        if not field_file or field_file._committed:
+            return super().save(*args, **kwargs)
+
+        # A new upload that hasn't been written to storage yet
+        blob = FileBlob.objects.store(field_file.file, name=field_file.name)
+        previous = self.blob_id
+        self.blob = blob
+        setattr(self, self.blob_file_field, blob.file.name)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'blob'}
+        try:
+            # Savepoint, so the reference can be dropped inside an outer transaction
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except Exception:
+            # Unreferenced, the blob is left to core.collect_orphan_blobs
+            FileBlob.objects.release(blob.pk)
+            self.blob_id = previous
+            setattr(self, self.blob_file_field, field_file)
+            raise
+        if previous and previous != blob.pk:
+            FileBlob.objects.release(previous)
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (ETag / If-None-Match) for DRF views.
+
+    The ETag is derived from the request path, the user and the change
+    counters (core.ModelVersion) of ``conditional_models`` - a single small
+    query. When it matches the client's ``If-None-Match`` the view answers
+    ``304 Not Modified`` before the queryset is evaluated or serialized.
+
+    Usage:
+        class NewsViewSet(ConditionalGetMixin, ModelViewSet):
+            conditional_models = ('news.News', 'news.Comment', 'accounts.User')
+            conditional_actions = ('list', 'retrieve')
+
+    Models must be listed in core.signals.VERSIONED_MODELS. For viewsets only
+    ``conditional_actions`` are handled; plain APIViews handle every GET.
+    """
+    conditional_models = ()
+    conditional_actions = ('list', 'retrieve')
+
+    def is_conditional_request(self, request):
+        if request.method not in ('GET', 'HEAD') or not self.conditional_models:
+            return False
+        action = getattr(self, 'action', None)
+        return action is None or action in self.conditional_actions
+
+    def get_etag(self, request):
+        from core.models import ModelVersion
+
+        versions = ModelVersion.objects.get_versions(self.conditional_models)
+        parts = [request.get_full_path(), str(request.user.pk)]
+        parts.extend(f'{label}:{versions.get(label, 0)}' for label in sorted(self.conditional_models))
+        return '"%s"' % hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        self.conditional_object = None
+        if not self.is_conditional_request(request):
+            return
+        if getattr(self, 'detail', False):
+            # Object-level permissions must still be enforced before a 304;
+            # the object is kept for the handler
+            self.conditional_object = self.get_object()
+        self.etag = self.get_etag(request)
+        if self.etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            raise NotModified()
+
+    def get_object(self):
+        if getattr(self, 'conditional_object', None) is not None:
+            return self.conditional_object
+        return super().get_object()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=exc.status_code)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            # Let browsers keep the copy but revalidate it on every use
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe requests to this view from a read replica (see core.replicas).
+
+    Clients that wrote within the last REPLICA_PIN_SECONDS keep reading from
+    the primary. Only use on read-heavy views that tolerate replication lag
+    of a few seconds for other users' changes.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        from core.replicas import should_use_replica, use_replica
+
+        if not should_use_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.dispatch_on_replica(request, *args, **kwargs)
+        with use_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+    async def dispatch_on_replica(self, request, *args, **kwargs):
+        from core.replicas import use_replica
+
+        # The context variable is copied into sync_to_async threads
+        with use_replica():
+            return await super().dispatch(request, *args, **kwargs)
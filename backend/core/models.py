@@ -1,7 +1,12 @@
 """
-Core models for site-wide settings.
+Core models for site-wide settings and shared file storage.
 """
-from django.db import models
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 
 
@@ -48,3 +53,222 @@ class SiteSettings(models.Model):
         """Get or create the settings instance."""
         settings, _ = cls.objects.get_or_create(pk=1)
         return settings
+
+
+def blob_upload_path(sha256, ext=''):
+    """Content-addressed path: blobs/ab/cd/abcd....ext"""
+    return f'blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}'
+
+
+class FileBlobManager(models.Manager):
+
+    def store(self, file, name=''):
+        """
+        Store ``file`` by content and take a reference on the resulting blob.
+
+        The SHA-256 comes from the upload handler when available (computed while
+        the request body was streamed), otherwise the file is hashed in chunks.
+        Identical content is stored only once.
+        """
+        digest = getattr(file, 'sha256', None)
+        size = file.size
+        if digest is None:
+            hasher = hashlib.sha256()
+            size = 0
+            for chunk in file.chunks():
+                hasher.update(chunk)
+                size += len(chunk)
+            digest = hasher.hexdigest()
+
+        if self.filter(sha256=digest).update(ref_count=F('ref_count') + 1):
+            return self.get(sha256=digest)
+
+        ext = os.path.splitext(name or file.name or '')[1].lower()[:10]
+        path = blob_upload_path(digest, ext)
+        if not default_storage.exists(path):
+            file.seek(0)
+            path = default_storage.save(path, file)
+
+        try:
+            with transaction.atomic():
+                return self.create(sha256=digest, file=path, size=size, ref_count=1)
+        except IntegrityError:
+            # Same content stored concurrently by another request
+            self.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+            return self.get(sha256=digest)
+
+    def release(self, blob_id):
+        """Drop one reference. Unreferenced blobs are removed by core.collect_orphan_blobs."""
+        self.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+
+class FileBlob(models.Model):
+    """
+    Content-addressed stored file shared by attachments with identical content.
+    """
+    sha256 = models.CharField(_('SHA-256'), max_length=64, unique=True)
+    file = models.FileField(_('file'), max_length=255)
+    size = models.PositiveBigIntegerField(_('size'), default=0)
+    ref_count = models.PositiveIntegerField(_('reference count'), default=0)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+
+    objects = FileBlobManager()
+
+    class Meta:
+        verbose_name = _('file blob')
+        verbose_name_plural = _('file blobs')
+        indexes = [
+            models.Index(fields=['ref_count'], name='core_fileblob_ref_count_idx'),
+        ]
+
+    def __str__(self):
+        return self.sha256
+
+    def verify(self):
+        """Re-hash the stored file and compare with the recorded checksum."""
+        hasher = hashlib.sha256()
+        with self.file.open('rb') as f:
+            for chunk in f.chunks():
+                hasher.update(chunk)
+        return hasher.hexdigest() == self.sha256
+
+
+class ModelVersionManager(models.Manager):
+
+    def bump(self, label):
+        """Increment the version of a model (called from save/delete signals)."""
+        if self.filter(label=label).update(version=F('version') + 1):
+            return
+        try:
+            with transaction.atomic():
+                self.create(label=label, version=1)
+        except IntegrityError:
+            self.filter(label=label).update(version=F('version') + 1)
+
+    def get_versions(self, labels):
+        """Return ``{label: version}`` for the given model labels in one query."""
+        return dict(self.filter(label__in=labels).values_list('label', 'version'))
+
+
+class ModelVersion(models.Model):
+    """
+    Change counter per model, used as a cheap validator for conditional GET
+    (see core.mixins.ConditionalGetMixin). Bumped by core.signals whenever a
+    tracked model is saved or deleted.
+    """
+    label = models.CharField(_('model label'), max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(_('version'), default=0)
+
+    objects = ModelVersionManager()
+
+    class Meta:
+        verbose_name = _('model version')
+        verbose_name_plural = _('model versions')
+
+    def __str__(self):
+        return f'{self.label} v{self.version}'
+
+
+class EndpointProfile(models.Model):
+    """
+    Hourly aggregate of request timings per endpoint, written by
+    core.profiling.ProfilingMiddleware when PROFILING_ENABLED is set.
+    Times are stored in milliseconds.
+    """
+    bucket = models.DateTimeField(_('hour'))
+    url_name = models.CharField(_('URL name'), max_length=200)
+    method = models.CharField(_('method'), max_length=10)
+    requests = models.PositiveIntegerField(_('requests'), default=0)
+    queries = models.PositiveBigIntegerField(_('queries'), default=0)
+    max_queries = models.PositiveIntegerField(_('max queries'), default=0)
+    db_time = models.FloatField(_('DB time'), default=0)
+    serializer_time = models.FloatField(_('serializer time'), default=0)
+    total_time = models.FloatField(_('total time'), default=0)
+    max_total_time = models.FloatField(_('max total time'), default=0)
+
+    class Meta:
+        verbose_name = _('endpoint profile')
+        verbose_name_plural = _('endpoint profiles')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'url_name', 'method'], name='core_endpointprofile_unique_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.method} {self.url_name} @ {self.bucket:%Y-%m-%d %H:00}'
+
+
+class BackgroundJob(models.Model):
+    """
+    Long-running operation started from the API and executed by a Celery
+    task. Clients poll it for progress (core.views.BackgroundJobView).
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        FAILED = 'failed', _('Failed')
+
+    kind = models.CharField(_('kind'), max_length=50)
+    status = models.CharField(_('status'), max_length=20, choices=Status.choices, default=Status.PENDING)
+    params = models.JSONField(_('parameters'), default=dict, blank=True)
+    total = models.PositiveIntegerField(_('total items'), default=0)
+    processed = models.PositiveIntegerField(_('processed items'), default=0)
+    result = models.JSONField(_('result'), default=dict, blank=True)
+    error = models.TextField(_('error'), blank=True)
+    created_by = models.ForeignKey(
+        'accounts.User',
+        verbose_name=_('created by'),
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    started_at = models.DateTimeField(_('started at'), null=True, blank=True)
+    finished_at = models.DateTimeField(_('finished at'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('background job')
+        verbose_name_plural = _('background jobs')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
+
+    @property
+    def progress(self):
+        """Completion in percent."""
+        if not self.total:
+            return 100 if self.status == self.Status.SUCCEEDED else 0
+        return min(100, round(self.processed * 100 / self.total))
+
+    def report_progress(self, processed):
+        """Record processed items without touching other fields."""
+        self.processed = processed
+        type(self).objects.filter(pk=self.pk).update(processed=processed)
+
+    def run(self, func):
+        """
+        Execute ``func()`` for this job, storing its return value as the result.
+        Failures are recorded on the job and re-raised.
+        """
+        from django.utils import timezone
+
+        self.status = self.Status.RUNNING
+        self.started_at = timezone.now()
+        self.save(update_fields=['status', 'started_at'])
+        try:
+            result = func()
+        except Exception as exc:
+            self.status = self.Status.FAILED
+            self.error = str(exc)
+            self.finished_at = timezone.now()
+            self.save(update_fields=['status', 'error', 'finished_at'])
+            raise
+        self.status = self.Status.SUCCEEDED
+        self.result = result or {}
+        self.processed = self.total
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'result', 'processed', 'finished_at'])
+        return result
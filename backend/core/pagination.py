@@ -1,7 +1,16 @@
 """
 Custom pagination classes.
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
@@ -16,3 +25,169 @@ class SmallPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
+
+
+class OptInPagination(StandardPagination):
+    """
+    StandardPagination applied only when the client passes ``page`` or
+    ``page_size``; otherwise the full list is returned as a plain array, as
+    existing clients expect.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not {self.page_query_param, self.page_size_query_param} & set(request.query_params):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for append-mostly feeds.
+
+    Pages are selected with ``WHERE (created_at, id) < (last seen)`` on an
+    indexed ordering instead of ``COUNT(*)`` + ``OFFSET``, so page 500 costs
+    the same as page 1. The cursor is an opaque token holding the ordering
+    values of the last row; only forward ("load more") navigation is offered.
+
+    The ordering comes from the view's ``keyset_ordering`` attribute and must
+    end with a unique field, e.g. ``('-created_at', '-id')``.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'keyset_ordering', self.ordering))
+        self.model = queryset.model
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+
+        # One extra row tells whether there is a next page - no COUNT(*)
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_keyset_filter(self, position):
+        """
+        Lexicographic "after this row" condition over the ordering fields:
+        (a < x) OR (a = x AND b < y) OR ...
+        """
+        condition = Q()
+        equal = {}
+        for field_spec, value in zip(self.ordering, position):
+            name = field_spec.lstrip('-')
+            lookup = 'lt' if field_spec.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if len(raw) != len(self.ordering):
+                raise ValueError
+            return [
+                self.model._meta.get_field(field_spec.lstrip('-')).to_python(value)
+                for field_spec, value in zip(self.ordering, raw)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        values = [
+            self._json_value(getattr(instance, field_spec.lstrip('-')))
+            for field_spec in self.ordering
+        ]
+        raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetOptInMixin:
+    """
+    Page-number pagination by default, keyset pagination when the client asks
+    for it with ``?pagination=cursor`` (or passes a ``cursor``). Existing
+    clients keep getting ``count``/``page`` responses.
+    """
+    keyset_pagination_class = KeysetPagination
+    keyset_opt_in_param = 'pagination'
+
+    def wants_keyset(self, request):
+        return (
+            request.query_params.get(self.keyset_opt_in_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.wants_keyset(request):
+            self.keyset = self.keyset_pagination_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class FeedPagination(KeysetOptInMixin, StandardPagination):
+    """StandardPagination with opt-in keyset pagination for feeds and logs."""
+
+
+class SmallFeedPagination(KeysetOptInMixin, SmallPagination):
+    """SmallPagination with opt-in keyset pagination (notifications)."""
@@ -0,0 +1,35 @@
+"""
+Fast JSON parser.
+
+``FastJSONParser`` decodes request bodies with orjson when it is installed and
+falls back to DRF's stock ``JSONParser`` otherwise. orjson rejects ``NaN`` and
+``Infinity`` just like DRF's strict mode.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import HAS_ORJSON
+
+if HAS_ORJSON:
+    import orjson
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson (same media type and errors)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not HAS_ORJSON:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b''
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, orjson.JSONDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,237 @@
+"""
+Request profiling.
+
+``ProfilingMiddleware`` measures, for every request, the number of SQL queries,
+the time spent in the database, the time spent producing serializer ``.data``
+and the total time. The figures are sent back in a ``Server-Timing`` header
+(visible in the browser dev tools) and aggregated per resolved URL name into
+hourly ``core.EndpointProfile`` rows. Rows are written in batches from an
+in-process buffer, so profiling adds no queries to the measured requests.
+
+Enabled with ``PROFILING_ENABLED``; the top offenders are listed by
+``manage.py profiling_report`` and ``GET /api/v1/admin/profiling/``.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, transaction
+from django.db.models import F, FloatField, Max, Sum
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+# Sort keys accepted by get_top_endpoints()
+REPORT_ORDERINGS = {
+    'total_time': '-total_time',
+    'avg_time': '-avg_time',
+    'queries': '-queries',
+    'avg_queries': '-avg_queries',
+    'db_time': '-db_time',
+    'requests': '-requests',
+}
+
+
+class RequestProfile:
+    """Figures collected for a single request."""
+
+    __slots__ = ('queries', 'db_time', 'serializer_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Connection execute wrapper: count and time every query
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def profile_serializer_data(prop):
+    """Wrap a serializer ``data`` property so its evaluation time is recorded."""
+
+    def data(self):
+        profile = _current.get()
+        if profile is None:
+            return prop.fget(self)
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+
+    data._profiled = True
+    return property(data)
+
+
+def install_serializer_hooks():
+    """Time top-level ``Serializer.data`` / ``ListSerializer.data`` (nested ones use to_representation)."""
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, '_profiled', False):
+            cls.data = profile_serializer_data(cls.data)
+
+
+class ProfileBuffer:
+    """
+    In-process aggregate of request profiles, written to the database at most
+    every PROFILING_FLUSH_INTERVAL seconds with F() increments.
+    """
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, url_name, method, profile, total_time):
+        key = (url_name, method)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = defaultdict(float)
+            stats['requests'] += 1
+            stats['queries'] += profile.queries
+            stats['max_queries'] = max(stats['max_queries'], profile.queries)
+            stats['db_time'] += profile.db_time * 1000
+            stats['serializer_time'] += profile.serializer_time * 1000
+            stats['total_time'] += total_time * 1000
+            stats['max_total_time'] = max(stats['max_total_time'], total_time * 1000)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def pop(self):
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            self._last_flush = time.monotonic()
+        return stats
+
+    def flush(self):
+        """Write buffered aggregates into the current hour bucket. Returns the number of requests written."""
+        from .models import EndpointProfile
+
+        stats = self.pop()
+        if not stats:
+            return 0
+        bucket = timezone.now().replace(minute=0, second=0, microsecond=0)
+        try:
+            with transaction.atomic():
+                EndpointProfile.objects.bulk_create(
+                    [EndpointProfile(bucket=bucket, url_name=url_name, method=method) for url_name, method in stats],
+                    ignore_conflicts=True,
+                )
+                for (url_name, method), values in stats.items():
+                    EndpointProfile.objects.filter(bucket=bucket, url_name=url_name, method=method).update(
+                        requests=F('requests') + int(values['requests']),
+                        queries=F('queries') + int(values['queries']),
+                        max_queries=Greatest('max_queries', int(values['max_queries'])),
+                        db_time=F('db_time') + values['db_time'],
+                        serializer_time=F('serializer_time') + values['serializer_time'],
+                        total_time=F('total_time') + values['total_time'],
+                        max_total_time=Greatest('max_total_time', values['max_total_time']),
+                    )
+                retention = timedelta(hours=getattr(settings, 'PROFILING_RETENTION_HOURS', 168))
+                EndpointProfile.objects.filter(bucket__lt=bucket - retention).delete()
+        except Exception:
+            # Profiling must never break requests
+            logger.exception('Could not write endpoint profiles')
+            return 0
+        return sum(int(values['requests']) for values in stats.values())
+
+
+_buffer = None
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        _buffer = ProfileBuffer(getattr(settings, 'PROFILING_FLUSH_INTERVAL', 60))
+    return _buffer
+
+
+def reset_buffer():
+    """Drop the cached buffer (used by tests after overriding settings)."""
+    global _buffer
+    _buffer = None
+
+
+class ProfilingMiddleware:
+    """
+    Measure query count, DB time, serializer time and total time per request.
+    Removed from the stack at startup unless PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_serializer_hooks()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                # DRF responses are already rendered here, so rendering is included
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_time = time.perf_counter() - start
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+            f'serializer;dur={profile.serializer_time * 1000:.1f}',
+            f'total;dur={total_time * 1000:.1f}',
+        ])
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.view_name if match else None) or '<unresolved>'
+        get_buffer().add(url_name, request.method, profile, total_time)
+        return response
+
+
+def get_top_endpoints(hours=24, order_by='total_time', limit=20):
+    """
+    Aggregate the EndpointProfile rows of the last ``hours`` per endpoint and
+    return the worst ``limit`` by ``order_by`` (a key of REPORT_ORDERINGS).
+    Times are in milliseconds.
+    """
+    from .models import EndpointProfile
+
+    since = timezone.now() - timedelta(hours=hours)
+    return list(
+        EndpointProfile.objects.filter(bucket__gte=since)
+        .values('url_name', 'method')
+        .annotate(
+            requests=Sum('requests'),
+            queries=Sum('queries'),
+            max_queries=Max('max_queries'),
+            db_time=Sum('db_time'),
+            serializer_time=Sum('serializer_time'),
+            total_time=Sum('total_time'),
+            max_total_time=Max('max_total_time'),
+        )
+        .annotate(
+            avg_queries=Cast(F('queries'), FloatField()) / F('requests'),
+            avg_time=F('total_time') / F('requests'),
+        )
+        .order_by(REPORT_ORDERINGS[order_by], 'url_name')[:limit]
+    )
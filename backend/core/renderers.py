@@ -0,0 +1,41 @@
+"""
+Fast JSON renderer.
+
+``FastJSONRenderer`` encodes responses with orjson when it is installed and
+falls back to DRF's stock ``JSONRenderer`` otherwise. Types orjson doesn't
+know natively (Decimal, lazy translation strings, timedelta, querysets...)
+are converted by DRF's own ``JSONEncoder.default`` so the output matches the
+stock renderer; aware UTC datetimes are written with a ``Z`` suffix as DRF
+does. U+2028 and U+2029 are escaped like DRF does, since they end a line in
+JavaScript source.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_encoder = JSONEncoder()
+
+if HAS_ORJSON:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson (same media type and output)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not HAS_ORJSON or self.get_indent(accepted_media_type, renderer_context or {}):
+            # orjson only supports 2-space indentation - keep exact DRF output
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits - the stdlib encoder copes
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
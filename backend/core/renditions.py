@@ -0,0 +1,180 @@
+"""
+Responsive image renditions.
+
+Every uploaded image can be served as a set of named variants (several widths,
+WebP plus a JPEG fallback). Variants live at deterministic storage paths under
+``renditions/`` derived from the original file name, so serializers can build a
+``srcset`` without touching the database. Variants are generated eagerly after
+upload by the ``core.generate_renditions`` task, or lazily by ``RenditionView``
+the first time a missing one is requested. Known variants are remembered in the
+cache so repeated requests don't stat the storage.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+logger = logging.getLogger(__name__)
+
+RENDITION_ROOT = 'renditions'
+
+# format key -> (PIL format, file extension, MIME type)
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+}
+
+# Only originals under these upload folders may be rendered
+RENDITION_SOURCE_PREFIXES = (
+    'avatars/',
+    'news_attachments/',
+    'classifieds/',
+    'wiki/attachments/',
+    'blobs/',
+)
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_rendition_widths():
+    return tuple(getattr(settings, 'IMAGE_RENDITION_WIDTHS', (64, 128, 400, 1200)))
+
+
+def is_rendition_source(name):
+    """Check that ``name`` is an uploaded image that renditions may be built from."""
+    if not name or '..' in name.split('/') or name.startswith('/'):
+        return False
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    return ext in IMAGE_EXTENSIONS and name.startswith(RENDITION_SOURCE_PREFIXES)
+
+
+def rendition_name(source, width, fmt):
+    """Storage path of a variant, e.g. ``renditions/avatars/ab12_128.webp``."""
+    stem, _ = os.path.splitext(source)
+    return f'{RENDITION_ROOT}/{stem}_{width}.{RENDITION_FORMATS[fmt][1]}'
+
+
+def rendition_url(source, width, fmt):
+    """Relative URL of the lazy rendition endpoint for a variant."""
+    return reverse('image-rendition', kwargs={'width': width, 'fmt': fmt, 'source': source})
+
+
+def build_srcset(source, widths=None):
+    """
+    Build ``srcset`` strings for an original image.
+
+    Returns ``{'webp': '<url> 64w, ...', 'jpeg': '...'}`` or None when the file
+    is not an image that can be rendered.
+    """
+    if not is_rendition_source(source):
+        return None
+    widths = widths or get_rendition_widths()
+    return {
+        fmt: ', '.join(f'{rendition_url(source, width, fmt)} {width}w' for width in widths)
+        for fmt in RENDITION_FORMATS
+    }
+
+
+def _cache_key(name):
+    return f'rendition:{name}'
+
+
+def _render(img, width, fmt):
+    """Resize an opened image to ``width`` (never upscaling) and encode it."""
+    pil_format, _, _ = RENDITION_FORMATS[fmt]
+    variant = img.copy()
+    if variant.width > width:
+        height = max(1, round(variant.height * width / variant.width))
+        variant = variant.resize((width, height), Image.Resampling.LANCZOS)
+    if pil_format == 'JPEG' and variant.mode not in ('RGB', 'L'):
+        variant = variant.convert('RGB')
+    elif variant.mode == 'P':
+        variant = variant.convert('RGBA')
+
+    output = BytesIO()
+    if pil_format == 'JPEG':
+        variant.save(output, format=pil_format, quality=85, optimize=True, progressive=True)
+    else:
+        variant.save(output, format=pil_format, quality=80, method=4)
+    return ContentFile(output.getvalue())
+
+
+def generate_renditions(source, widths=None, formats=None):
+    """
+    Generate all missing variants of ``source`` in one pass (the original is decoded once).
+    Returns the storage names of the variants that exist afterwards.
+    """
+    if not HAS_PIL or not is_rendition_source(source):
+        return []
+    widths = widths or get_rendition_widths()
+    formats = formats or tuple(RENDITION_FORMATS)
+
+    wanted = {(width, fmt): rendition_name(source, width, fmt) for width in widths for fmt in formats}
+    missing = {key: name for key, name in wanted.items() if not default_storage.exists(name)}
+
+    if missing:
+        with default_storage.open(source, 'rb') as original:
+            img = Image.open(original)
+            img.load()
+        for (width, fmt), name in missing.items():
+            saved = default_storage.save(name, _render(img, width, fmt))
+            wanted[(width, fmt)] = saved
+
+    cache.set_many({_cache_key(name): True for name in wanted.values()}, CACHE_TIMEOUT)
+    return list(wanted.values())
+
+
+def get_rendition(source, width, fmt):
+    """
+    Return the storage name of a variant, generating it on first request.
+    Raises FileNotFoundError if the original doesn't exist.
+    """
+    name = rendition_name(source, width, fmt)
+    if cache.get(_cache_key(name)) or default_storage.exists(name):
+        cache.set(_cache_key(name), True, CACHE_TIMEOUT)
+        return name
+    if not default_storage.exists(source):
+        raise FileNotFoundError(source)
+    return generate_renditions(source, widths=[width], formats=[fmt])[0]
+
+
+def delete_renditions(source):
+    """Remove every variant of ``source`` (when the original is deleted)."""
+    for width in get_rendition_widths():
+        for fmt in RENDITION_FORMATS:
+            name = rendition_name(source, width, fmt)
+            default_storage.delete(name)
+            cache.delete(_cache_key(name))
+
+
+def schedule_renditions(sources):
+    """Queue eager variant generation for saved originals once the transaction commits."""
+    sources = [source for source in sources if is_rendition_source(source)]
+    if not sources:
+        return
+
+    def dispatch():
+        from core.tasks import generate_renditions as generate_renditions_task
+
+        for source in sources:
+            try:
+                generate_renditions_task.delay(source)
+            except Exception:
+                # Variants will be generated lazily on first request instead
+                logger.exception('Could not queue renditions for %s', source)
+
+    transaction.on_commit(dispatch)
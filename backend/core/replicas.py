@@ -0,0 +1,94 @@
+"""
+Read-replica routing.
+
+Replicas are optional: ``DATABASE_REPLICA_URLS`` (production settings) adds
+``replica1``, ``replica2``... aliases and lists them in ``REPLICA_DATABASES``.
+Without replicas everything keeps using ``default``.
+
+Reads only go to a replica inside ``use_replica()`` - a context manager and
+decorator used by ``ReplicaReadMixin`` for safe requests to designated views
+and by read-heavy Celery tasks. Writes always go to ``default``.
+
+Read-your-writes: after a successful unsafe request ``ReplicaPinMiddleware``
+sets a short-lived cookie and requests carrying it read from ``default``, so
+a user never sees a replica that hasn't caught up with their own change.
+"""
+import contextvars
+import random
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica = contextvars.ContextVar('read_replica', default=None)
+
+
+def get_replicas():
+    return list(getattr(settings, 'REPLICA_DATABASES', []))
+
+
+class use_replica(ContextDecorator):  # noqa: N801 - used like a function
+    """Route reads in the block to a randomly chosen replica (no-op without replicas)."""
+
+    def __enter__(self):
+        replicas = get_replicas()
+        self.token = _replica.set(random.choice(replicas) if replicas else None)
+        return self
+
+    def __exit__(self, *exc_info):
+        _replica.reset(self.token)
+        return False
+
+
+def is_pinned(request):
+    """True if the client wrote recently and must read from the primary."""
+    return PIN_COOKIE in request.COOKIES
+
+
+def should_use_replica(request):
+    return bool(get_replicas()) and request.method in SAFE_METHODS and not is_pinned(request)
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen by use_replica(); everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """
+    Pin a client to the primary for REPLICA_PIN_SECONDS after it writes.
+    Removed from the stack at startup when no replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 10),
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
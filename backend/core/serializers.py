@@ -0,0 +1,19 @@
+"""
+Serializers for core models.
+"""
+from rest_framework import serializers
+
+from .models import BackgroundJob
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    """Status and progress of a background job."""
+    progress = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = BackgroundJob
+        fields = [
+            'id', 'kind', 'status', 'total', 'processed', 'progress',
+            'result', 'error', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,80 @@
+"""
+Signals for core.
+"""
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .mixins import ContentAddressedFileMixin
+from .models import FileBlob, ModelVersion
+
+# Models whose changes invalidate conditional GET validators
+# (core.mixins.ConditionalGetMixin.conditional_models).
+VERSIONED_MODELS = {
+    'accounts.User',
+    'faq.FAQCategory',
+    'faq.FAQItem',
+    'news.Comment',
+    'news.News',
+    'news.NewsAttachment',
+    'news.Reaction',
+    'news.Tag',
+    'organization.Department',
+    'organization.Position',
+    'skills.Skill',
+    'skills.SkillCategory',
+    'wiki.WikiPage',
+    'wiki.WikiSpace',
+    'wiki.WikiTag',
+}
+
+# Saves touching only these fields don't change any cached representation
+IGNORED_UPDATE_FIELDS = {
+    'accounts.User': {'last_login'},
+}
+
+
+def release_file_blob(sender, instance, **kwargs):
+    """Drop the blob reference held by a deleted content-addressed attachment."""
+    if instance.blob_id:
+        FileBlob.objects.release(instance.blob_id)
+
+
+def bump_version_on_save(sender, update_fields=None, raw=False, **kwargs):
+    label = sender._meta.label
+    if raw:
+        return
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS.get(label, set()):
+        return
+    ModelVersion.objects.bump(label)
+
+
+def bump_version_on_delete(sender, **kwargs):
+    ModelVersion.objects.bump(sender._meta.label)
+
+
+def connect_signals():
+    """
+    Connect per-model receivers; called from CoreConfig.ready().
+
+    Receivers are connected only to the models that need them: a
+    post_delete listener for a model disables Collector.can_fast_delete, so
+    every QuerySet.delete() of it would load rows and send a signal per row,
+    and unrelated saves skip the dispatch.
+    """
+    for model in apps.get_models():
+        if issubclass(model, ContentAddressedFileMixin):
+            post_delete.connect(release_file_blob, sender=model)
+        if model._meta.label in VERSIONED_MODELS:
+            post_save.connect(bump_version_on_save, sender=model)
+            post_delete.connect(bump_version_on_delete, sender=model)
+        for field in model._meta.local_many_to_many:
+            if {model._meta.label, field.related_model._meta.label} & VERSIONED_MODELS:
+                m2m_changed.connect(bump_version_on_m2m_change, sender=field.remote_field.through)
+
+
+def bump_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # Both sides of the relation render the change
+    for label in {instance._meta.label, model._meta.label} & VERSIONED_MODELS:
+        ModelVersion.objects.bump(label)
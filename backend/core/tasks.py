@@ -0,0 +1,110 @@
+"""
+Celery tasks for core.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='core.flush_view_counters')
+def flush_view_counters():
+    """
+    Flush buffered view counters and session activity to the database.
+    Runs every minute.
+    """
+    from core.counters import flush_view_counters as flush
+
+    written = flush()
+    logger.info(f"Flushed view counters: {written}")
+    return written
+
+
+@shared_task(name='core.generate_thumbnail')
+def generate_thumbnail(model_label, pk):
+    """
+    Generate the thumbnail for an uploaded image.
+    Queued by core.images.schedule_thumbnails after upload.
+    """
+    from core.images import process_thumbnail
+
+    result = process_thumbnail(model_label, pk)
+    logger.info(f"Thumbnail for {model_label} #{pk}: {result}")
+    return result
+
+
+@shared_task(name='core.recover_stuck_images')
+def recover_stuck_images():
+    """
+    Re-queue images left in processing by a crashed worker.
+    Runs every 10 minutes.
+    """
+    from core.images import recover_stuck_images as recover
+
+    recovered = recover()
+    logger.info(f"Recovered stuck images: {recovered}")
+    return recovered
+
+
+@shared_task(name='core.generate_renditions')
+def generate_renditions(source):
+    """
+    Generate responsive variants (widths x WebP/JPEG) for an uploaded image.
+    Queued by core.renditions.schedule_renditions after upload.
+    """
+    from core.renditions import generate_renditions as generate
+
+    names = generate(source)
+    logger.info(f"Generated {len(names)} renditions for {source}")
+    return len(names)
+
+
+@shared_task(name='core.collect_orphan_blobs')
+def collect_orphan_blobs(grace_hours=1):
+    """
+    Delete content-addressed blobs that no attachment references anymore.
+    Runs daily. Blobs younger than grace_hours are kept so an upload that
+    is still being attached isn't collected.
+    """
+    from datetime import timedelta
+
+    from django.apps import apps
+    from django.db import transaction
+    from django.utils import timezone
+
+    from core.mixins import ContentAddressedFileMixin
+    from core.models import FileBlob
+    from core.renditions import delete_renditions
+
+    referencing_models = [
+        model for model in apps.get_models() if issubclass(model, ContentAddressedFileMixin)
+    ]
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    candidate_ids = list(
+        FileBlob.objects.filter(ref_count=0, created_at__lt=cutoff).values_list('id', flat=True)[:1000]
+    )
+
+    # Don't trust the counter alone - skip anything still referenced
+    referenced = set()
+    for model in referencing_models:
+        referenced.update(
+            model.objects.filter(blob_id__in=candidate_ids).values_list('blob_id', flat=True)
+        )
+
+    deleted = 0
+    for blob_id in candidate_ids:
+        if blob_id in referenced:
+            continue
+        with transaction.atomic():
+            # Lock so a concurrent store() either re-references it first or waits
+            blob = FileBlob.objects.select_for_update().filter(pk=blob_id, ref_count=0).first()
+            if blob is None:
+                continue
+            delete_renditions(blob.file.name)
+            blob.file.delete(save=False)
+            blob.delete()
+            deleted += 1
+
+    logger.info(f"Collected {deleted} orphan blobs")
+    return deleted
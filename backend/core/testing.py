@@ -0,0 +1,60 @@
+"""
+Test helpers for query-count budgets.
+
+    with query_budget(5):
+        client.get('/api/v1/news/')
+
+    @query_budget(5, label='news list')
+    def test_news_list(...):
+        ...
+
+When more queries than the budget are executed the test fails with every
+captured SQL statement, numbered, so the N+1 is visible in the report.
+"""
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block executes more queries than its budget."""
+
+
+class query_budget(ContextDecorator):  # noqa: N801 - used like a function
+    """
+    Context manager / decorator failing when more than ``max_queries`` queries run.
+
+    Args:
+        max_queries: the budget
+        using: database alias to watch
+        label: shown in the failure message (e.g. the endpoint)
+    """
+
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS, label=None):
+        self.max_queries = max_queries
+        self.using = using
+        self.label = label
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return False
+        executed = len(self.context.captured_queries)
+        if executed > self.max_queries:
+            raise QueryBudgetExceeded(self.format_failure(executed))
+        return False
+
+    def format_failure(self, executed):
+        prefix = f'{self.label}: ' if self.label else ''
+        lines = [f'{prefix}{executed} queries executed, budget is {self.max_queries}']
+        lines.extend(
+            f'{number}. {query["sql"]}'
+            for number, query in enumerate(self.context.captured_queries, start=1)
+        )
+        return '\n'.join(lines)
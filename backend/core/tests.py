@@ -0,0 +1,590 @@
+"""
+Query-count budgets for the API list and detail endpoints, read-replica routing.
+
+Every endpoint is requested with 1 and with 50 rows in the database under the
+same budget, so a per-row query (N+1) in a view or serializer fails the test
+with the captured SQL.
+"""
+from datetime import date, time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.replicas import (
+    PIN_COOKIE, ReplicaPinMiddleware, ReplicaRouter, should_use_replica, use_replica,
+)
+from core.testing import QueryBudgetExceeded, query_budget
+
+User = get_user_model()
+
+ROW_COUNTS = (1, 50)
+
+
+def make_users(n, admin):
+    from apps.organization.models import Department, Position
+
+    department = Department.objects.create(name='Отдел', head=admin)
+    position = Position.objects.create(name='Инженер')
+    users = [
+        User.objects.create_user(
+            email=f'user{index}@example.com', password='testpass123',
+            first_name='Иван', last_name=f'Петров{index}',
+            department=department, position=position, manager=admin,
+            birth_date=date(1990, 1, 1) + timedelta(days=index),
+        )
+        for index in range(n)
+    ]
+    return users[0].pk
+
+
+def make_departments(n, admin):
+    from apps.organization.models import Department
+
+    parent = None
+    for index in range(n):
+        # Alternate roots and children so the tree has several levels
+        department = Department.objects.create(name=f'Отдел {index}', parent=parent, head=admin)
+        parent = department if index % 2 == 0 else None
+        User.objects.create_user(
+            email=f'staff{index}@example.com', password='x', first_name='A', last_name='B',
+            department=department,
+        )
+    return department.pk
+
+
+def make_positions(n, admin):
+    from apps.organization.models import Position
+
+    return [Position.objects.create(name=f'Должность {index}') for index in range(n)][0].pk
+
+
+def make_skills(n, admin):
+    from apps.skills.models import Skill, SkillCategory, UserSkill
+
+    category = SkillCategory.objects.create(name='Языки')
+    skills = [Skill.objects.create(name=f'Навык {index}', category=category) for index in range(n)]
+    for skill in skills:
+        UserSkill.objects.create(user=admin, skill=skill)
+    return skills[0].pk
+
+
+def make_skill_categories(n, admin):
+    from apps.skills.models import SkillCategory
+
+    return [SkillCategory.objects.create(name=f'Категория {index}') for index in range(n)][0].pk
+
+
+def make_news(n, admin):
+    from apps.news.models import Comment, News, Reaction, Tag
+
+    tag = Tag.objects.create(name='Общее', slug='general')
+    reactor = User.objects.create_user(email='reactor@example.com', password='x', first_name='R', last_name='R')
+    news = []
+    for index in range(n):
+        item = News.objects.create(title=f'Новость {index}', author=admin, status='published')
+        item.tags.add(tag)
+        Comment.objects.create(news=item, author=reactor, content='Комментарий')
+        Reaction.objects.create(news=item, user=reactor, type='like')
+        news.append(item)
+    return news[0].pk
+
+
+def make_comments(n, admin):
+    from apps.news.models import Comment, News
+
+    news = News.objects.create(title='Обсуждаемая новость', author=admin, status='published')
+    for index in range(n):
+        thread = Comment.objects.create(news=news, author=admin, content=f'Комментарий {index}')
+        reply = Comment.objects.create(news=news, author=admin, content='Ответ', parent=thread)
+        Comment.objects.create(news=news, author=admin, content='Ответ на ответ', parent=reply)
+    return news.pk
+
+
+def make_news_tags(n, admin):
+    from apps.news.models import Tag
+
+    return [Tag.objects.create(name=f'Тег {index}', slug=f'tag-{index}') for index in range(n)][0].pk
+
+
+def make_achievement_types(n, admin):
+    from apps.achievements.models import Achievement
+
+    return [
+        Achievement.objects.create(name=f'Достижение {index}', description='Описание', created_by=admin)
+        for index in range(n)
+    ][0].pk
+
+
+def make_kudos(n, admin):
+    from apps.kudos.models import Kudos
+
+    recipient = User.objects.create_user(email='recipient@example.com', password='x', first_name='K', last_name='K')
+    return [
+        Kudos.objects.create(sender=admin, recipient=recipient, message=f'Спасибо {index}')
+        for index in range(n)
+    ][0].pk
+
+
+def make_surveys(n, admin):
+    from apps.surveys.models import Question, QuestionOption, Survey
+
+    surveys = []
+    for index in range(n):
+        survey = Survey.objects.create(title=f'Опрос {index}', author=admin, status=Survey.Status.ACTIVE)
+        question = Question.objects.create(survey=survey, text='Вопрос?', type='single_choice')
+        QuestionOption.objects.create(question=question, text='Да')
+        surveys.append(survey)
+    return surveys[0].pk
+
+
+def make_ideas(n, admin):
+    from apps.ideas.models import Idea, IdeaComment, IdeaVote
+
+    voter = User.objects.create_user(email='voter@example.com', password='x', first_name='V', last_name='V')
+    ideas = []
+    for index in range(n):
+        idea = Idea.objects.create(title=f'Идея {index}', description='Описание', author=admin)
+        IdeaVote.objects.create(idea=idea, user=voter, is_upvote=True)
+        IdeaComment.objects.create(idea=idea, author=voter, text='Поддерживаю')
+        ideas.append(idea)
+    return ideas[0].pk
+
+
+def make_faq_categories(n, admin):
+    from apps.faq.models import FAQCategory, FAQItem
+
+    categories = [FAQCategory.objects.create(name=f'Раздел {index}') for index in range(n)]
+    for category in categories:
+        FAQItem.objects.create(category=category, question='Как?', answer='Так.')
+    return categories[0].pk
+
+
+def make_faq_items(n, admin):
+    from apps.faq.models import FAQCategory, FAQItem
+
+    category = FAQCategory.objects.create(name='Раздел')
+    return [
+        FAQItem.objects.create(category=category, question=f'Вопрос {index}?', answer='Ответ.')
+        for index in range(n)
+    ][0].pk
+
+
+def make_classified_categories(n, admin):
+    from apps.classifieds.models import ClassifiedCategory
+
+    return [
+        ClassifiedCategory.objects.create(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(n)
+    ][0].pk
+
+
+def make_classifieds(n, admin):
+    from apps.classifieds.models import Classified, ClassifiedCategory
+
+    category = ClassifiedCategory.objects.create(name='Разное', slug='misc')
+    return [
+        Classified.objects.create(title=f'Объявление {index}', description='Описание', category=category, author=admin)
+        for index in range(n)
+    ][0].pk
+
+
+def make_okr_periods(n, admin):
+    from apps.okr.models import OKRPeriod
+
+    today = date.today()
+    return [
+        OKRPeriod.objects.create(name=f'Q{index}', starts_at=today, ends_at=today + timedelta(days=90))
+        for index in range(n)
+    ][0].pk
+
+
+def make_objectives(n, admin):
+    from apps.okr.models import KeyResult, Objective, OKRPeriod
+
+    today = date.today()
+    period = OKRPeriod.objects.create(name='Q1', starts_at=today, ends_at=today + timedelta(days=90))
+    objectives = []
+    for index in range(n):
+        objective = Objective.objects.create(period=period, title=f'Цель {index}', owner=admin)
+        KeyResult.objects.create(objective=objective, title='Результат')
+        objectives.append(objective)
+    return objectives[0].pk
+
+
+def make_key_results(n, admin):
+    from apps.okr.models import KeyResult, Objective, OKRPeriod
+
+    today = date.today()
+    period = OKRPeriod.objects.create(name='Q1', starts_at=today, ends_at=today + timedelta(days=90))
+    objective = Objective.objects.create(period=period, title='Цель', owner=admin)
+    return [KeyResult.objects.create(objective=objective, title=f'Результат {index}') for index in range(n)][0].pk
+
+
+def make_wiki_spaces(n, admin):
+    from apps.wiki.models import WikiPage, WikiSpace
+
+    spaces = [WikiSpace.objects.create(name=f'Пространство {index}', slug=f'space-{index}', owner=admin) for index in range(n)]
+    for space in spaces:
+        WikiPage.objects.create(title='Главная', slug='home', space=space, author=admin)
+    return spaces[0].pk
+
+
+def make_wiki_pages(n, admin):
+    from apps.wiki.models import WikiPage, WikiSpace, WikiTag
+
+    space = WikiSpace.objects.create(name='Пространство', slug='space', owner=admin)
+    tag = WikiTag.objects.create(name='Тег', slug='tag')
+    pages = []
+    for index in range(n):
+        page = WikiPage.objects.create(title=f'Страница {index}', slug=f'page-{index}', space=space, author=admin)
+        page.tags.add(tag)
+        pages.append(page)
+    return pages[0].pk
+
+
+def make_wiki_tags(n, admin):
+    from apps.wiki.models import WikiTag
+
+    return [WikiTag.objects.create(name=f'Тег {index}', slug=f'tag-{index}') for index in range(n)][0].pk
+
+
+def make_resource_types(n, admin):
+    from apps.bookings.models import ResourceType
+
+    return [ResourceType.objects.create(name=f'Тип {index}', slug=f'type-{index}') for index in range(n)][0].pk
+
+
+def make_resources(n, admin):
+    from apps.bookings.models import Resource, ResourceType
+
+    resource_type = ResourceType.objects.create(name='Переговорные', slug='rooms')
+    return [Resource.objects.create(type=resource_type, name=f'Комната {index}') for index in range(n)][0].pk
+
+
+def make_bookings(n, admin):
+    from apps.bookings.models import Booking, Resource, ResourceType
+
+    resource_type = ResourceType.objects.create(name='Переговорные', slug='rooms')
+    resource = Resource.objects.create(
+        type=resource_type, name='Комната', work_hours_start=time(9), work_hours_end=time(21),
+    )
+    start = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return [
+        Booking.objects.create(
+            resource=resource, user=admin, title=f'Встреча {index}',
+            starts_at=start + timedelta(days=index), ends_at=start + timedelta(days=index, hours=1),
+        )
+        for index in range(n)
+    ][0].pk
+
+
+def make_bookmarks(n, admin):
+    from apps.interactions.models import Bookmark
+
+    users = [
+        User.objects.create_user(email=f'saved{index}@example.com', password='x', first_name='S', last_name='S')
+        for index in range(n)
+    ]
+    return [Bookmark.objects.create(user=admin, content_type='user', object_id=user.pk) for user in users][0].pk
+
+
+def make_view_history(n, admin):
+    from apps.interactions.models import ViewHistory
+
+    users = [
+        User.objects.create_user(email=f'seen{index}@example.com', password='x', first_name='S', last_name='S')
+        for index in range(n)
+    ]
+    return [ViewHistory.objects.create(user=admin, viewed_user=user) for user in users][0].pk
+
+
+def make_roles(n, admin):
+    from apps.roles.models import Permission, Role
+
+    permission = Permission.objects.create(codename='budget.view', name='View', category='users')
+    roles = [Role.objects.create(name=f'Роль {index}') for index in range(n)]
+    for role in roles:
+        role.permissions.add(permission)
+    return roles[0].pk
+
+
+def make_notifications(n, admin):
+    from apps.notifications.models import Notification
+
+    return [
+        Notification.objects.create(user=admin, type='system', title=f'Уведомление {index}', message='Текст')
+        for index in range(n)
+    ][0].pk
+
+
+def make_audit(n, admin):
+    from apps.audit.models import AuditLog
+
+    return [
+        AuditLog.objects.create(user=admin, action='update', entity_type='User', entity_id=index, entity_repr='U')
+        for index in range(n)
+    ][0].pk
+
+
+# (name, list URL, detail URL template or None, factory, query budget)
+ENDPOINTS = [
+    ('users', '/api/v1/users/', '/api/v1/users/{pk}/', make_users, 10),
+    ('admin-users', '/api/v1/users/admin/', '/api/v1/users/admin/{pk}/', make_users, 10),
+    ('departments', '/api/v1/organization/departments/', '/api/v1/organization/departments/{pk}/', make_departments, 6),
+    ('organization-tree', '/api/v1/organization/tree/', None, make_departments, 6),
+    ('positions', '/api/v1/organization/positions/', '/api/v1/organization/positions/{pk}/', make_positions, 5),
+    ('skills', '/api/v1/skills/', '/api/v1/skills/{pk}/', make_skills, 5),
+    ('skill-categories', '/api/v1/skills/categories/', '/api/v1/skills/categories/{pk}/', make_skill_categories, 5),
+    ('news', '/api/v1/news/', '/api/v1/news/{pk}/', make_news, 12),
+    ('news-comments', '/api/v1/news/{pk}/comments/', None, make_comments, 5),
+    ('news-tags', '/api/v1/news/tags/', '/api/v1/news/tags/{pk}/', make_news_tags, 5),
+    ('achievement-types', '/api/v1/achievements/types/', '/api/v1/achievements/types/{pk}/', make_achievement_types, 6),
+    ('kudos', '/api/v1/kudos/', '/api/v1/kudos/{pk}/', make_kudos, 6),
+    ('surveys', '/api/v1/surveys/', '/api/v1/surveys/{pk}/', make_surveys, 10),
+    ('ideas', '/api/v1/ideas/', '/api/v1/ideas/{pk}/', make_ideas, 10),
+    ('faq-categories', '/api/v1/faq/categories/', '/api/v1/faq/categories/{pk}/', make_faq_categories, 5),
+    ('faq-items', '/api/v1/faq/items/', None, make_faq_items, 5),
+    ('classified-categories', '/api/v1/classifieds/categories/', None, make_classified_categories, 5),
+    ('classifieds', '/api/v1/classifieds/', '/api/v1/classifieds/{pk}/', make_classifieds, 8),
+    ('okr-periods', '/api/v1/okr/periods/', '/api/v1/okr/periods/{pk}/', make_okr_periods, 5),
+    ('okr-objectives', '/api/v1/okr/objectives/', '/api/v1/okr/objectives/{pk}/', make_objectives, 8),
+    ('okr-key-results', '/api/v1/okr/key-results/', '/api/v1/okr/key-results/{pk}/', make_key_results, 6),
+    ('wiki-spaces', '/api/v1/wiki/spaces/', '/api/v1/wiki/spaces/{pk}/', make_wiki_spaces, 10),
+    ('wiki-pages', '/api/v1/wiki/pages/', None, make_wiki_pages, 8),
+    ('wiki-tags', '/api/v1/wiki/tags/', '/api/v1/wiki/tags/{pk}/', make_wiki_tags, 5),
+    ('resource-types', '/api/v1/resource-types/', '/api/v1/resource-types/{pk}/', make_resource_types, 5),
+    ('resources', '/api/v1/resources/', '/api/v1/resources/{pk}/', make_resources, 6),
+    ('bookings', '/api/v1/bookings/', '/api/v1/bookings/{pk}/', make_bookings, 6),
+    ('bookmarks', '/api/v1/bookmarks/', None, make_bookmarks, 6),
+    ('view-history', '/api/v1/view-history/', None, make_view_history, 6),
+    ('roles', '/api/v1/admin/roles/', '/api/v1/admin/roles/{pk}/', make_roles, 6),
+    ('notifications', '/api/v1/notifications/', None, make_notifications, 5),
+    ('audit', '/api/v1/admin/audit/', '/api/v1/admin/audit/{pk}/', make_audit, 5),
+]
+
+# Endpoints that still issue queries per row. Strict xfail: once the N+1 is
+# fixed the test starts passing and the entry has to be removed.
+KNOWN_N_PLUS_ONE = {
+    'users-list': 'department head and employee count per user',
+    'admin-users-list': 'manager, awards and department head per user',
+    'departments-list': 'employee count per department',
+    'organization-tree-list': 'children, head and employee count per department',
+    'skill-categories-list': 'skill count per category',
+    'news-list': 'reaction counts and own reaction per post',
+    'surveys-list': 'own response per survey',
+    'ideas-list': 'vote counts and own vote per idea',
+    'faq-categories-list': 'item count per category',
+    'classified-categories-list': 'classified count per category',
+    'okr-objectives-list': 'period, owner and key results per objective',
+    'okr-key-results-list': 'check-ins per key result',
+    'wiki-spaces-list': 'owner and page count per space',
+    'wiki-pages-list': 'child count per page',
+    'resource-types-list': 'resource count per type',
+    'roles-list': 'user count per role',
+}
+
+
+def budget_case(name, url, factory, budget, kind, rows):
+    case_id = f'{name}-{kind}'
+    marks = []
+    if rows > 1 and case_id in KNOWN_N_PLUS_ONE:
+        marks.append(pytest.mark.xfail(
+            raises=QueryBudgetExceeded, strict=True, reason=f'N+1: {KNOWN_N_PLUS_ONE[case_id]}',
+        ))
+    return pytest.param(url, factory, budget, rows, id=f'{case_id}-{rows}', marks=marks)
+
+
+CASES = [
+    budget_case(name, url, factory, budget, 'list', rows)
+    for name, url, _, factory, budget in ENDPOINTS
+    for rows in ROW_COUNTS
+] + [
+    budget_case(name, detail, factory, budget, 'detail', rows)
+    for name, _, detail, factory, budget in ENDPOINTS if detail
+    for rows in ROW_COUNTS
+]
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = User.objects.create_superuser(
+        email='admin@example.com', password='adminpass123', first_name='Admin', last_name='User',
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client, admin
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url,factory,budget,rows', CASES)
+def test_endpoint_query_budget(admin_client, url, factory, budget, rows):
+    """The query count stays within budget regardless of the number of rows."""
+    client, admin = admin_client
+    pk = factory(rows, admin)
+    url = url.format(pk=pk)
+
+    with query_budget(budget, label=f'GET {url} with {rows} rows'):
+        response = client.get(url)
+    assert response.status_code == 200, response.content[:500]
+
+
+def test_query_budget_reports_sql(db):
+    """A failing budget lists the captured statements."""
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(1, label='two queries'):
+            User.objects.count()
+            User.objects.exists()
+    message = str(excinfo.value)
+    assert message.startswith('two queries: 2 queries executed, budget is 1')
+    assert '1. SELECT' in message and '2. SELECT' in message
+
+
+class TestReplicaRouting:
+    """Reads are routed to a replica only inside use_replica()."""
+
+    def test_reads_use_primary_without_replicas(self, settings):
+        settings.REPLICA_DATABASES = []
+        router = ReplicaRouter()
+        with use_replica():
+            assert router.db_for_read(User) is None
+
+    def test_reads_use_replica_inside_block(self, settings):
+        settings.REPLICA_DATABASES = ['default']
+        router = ReplicaRouter()
+        assert router.db_for_read(User) is None
+        with use_replica():
+            assert router.db_for_read(User) == 'default'
+            assert router.db_for_write(User) == 'default'
+        assert router.db_for_read(User) is None
+
+    def test_write_pins_client_to_primary(self, settings):
+        settings.REPLICA_DATABASES = ['default']
+        factory = RequestFactory()
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse(status=201))
+
+        response = middleware(factory.post('/api/v1/news/'))
+        assert response.cookies[PIN_COOKIE]['max-age'] == settings.REPLICA_PIN_SECONDS
+        assert PIN_COOKIE not in middleware(factory.get('/api/v1/news/')).cookies
+
+        pinned = factory.get('/api/v1/search/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        assert should_use_replica(factory.get('/api/v1/search/'))
+        assert not should_use_replica(pinned)
+        assert not should_use_replica(factory.post('/api/v1/search/'))
+
+
+@pytest.mark.parametrize('label,fast', [
+    ('audit.AuditLog', True),
+    ('interactions.ViewHistory', True),
+    ('token_blacklist.BlacklistedToken', True),
+    ('news.NewsAttachment', False),
+    ('news.News', False),
+])
+def test_delete_receivers_keep_fast_delete(label, fast):
+    from django.apps import apps
+    from django.db.models.deletion import Collector
+
+    model = apps.get_model(label)
+    assert Collector(using='default').can_fast_delete(model) is fast
+
+
+def test_srcset_widths_follow_configured_renditions(settings):
+    from core.fields import SrcsetField
+
+    field = SrcsetField(max_width=400)
+    settings.IMAGE_RENDITION_WIDTHS = [1200, 64, 200]
+    assert field.get_widths() == [64, 200]
+    settings.IMAGE_RENDITION_WIDTHS = [800, 1200]
+    assert field.get_widths() == [800]
+    assert SrcsetField().get_widths() == [800, 1200]
+
+
+@pytest.fixture
+def profiling(settings):
+    """Enable the profiling middleware with a buffer that is only flushed explicitly."""
+    from core import profiling
+
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_FLUSH_INTERVAL = 3600
+    profiling.reset_buffer()
+    yield profiling
+    profiling.reset_buffer()
+
+
+@pytest.mark.django_db
+class TestProfiling:
+    """Tests for the request profiling middleware and report."""
+
+    def test_server_timing_and_report(self, admin_client, profiling):
+        """Requests get a Server-Timing header and are aggregated per URL name."""
+        from apps.organization.models import Department
+
+        client, admin = admin_client
+        Department.objects.create(name='Отдел разработки', head=admin)
+        for _ in range(2):
+            response = client.get('/api/v1/organization/tree/')
+            assert response.status_code == 200
+            assert 'queries"' in response['Server-Timing']
+            assert 'total;dur=' in response['Server-Timing']
+
+        response = client.get('/api/v1/admin/profiling/', {'order_by': 'requests'})
+        assert response.status_code == 200
+        rows = {row['url_name']: row for row in response.data['results']}
+        tree = rows['organization-tree']
+        assert tree['method'] == 'GET'
+        assert tree['requests'] == 2
+        assert tree['max_queries'] > 0
+        assert tree['serializer_time'] > 0
+
+    def test_disabled_by_default(self, admin_client):
+        """Without PROFILING_ENABLED the middleware is not installed."""
+        client, _ = admin_client
+        response = client.get('/api/v1/organization/tree/')
+        assert 'Server-Timing' not in response
+
+
+class TestFastJSON:
+    """FastJSONRenderer/FastJSONParser match DRF's stock JSON classes."""
+
+    def test_render_matches_drf(self):
+        import uuid
+        from datetime import datetime, timezone as dt_timezone
+        from decimal import Decimal
+
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+
+        from core.renderers import FastJSONRenderer
+
+        data = {
+            'decimal': Decimal('12.50'),
+            'aware': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 5, 1, 12, 30, 15, 123456),
+            'whole_second': datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc),
+            'date': date(2024, 5, 1),
+            'time': time(9, 15, 0, 500000),
+            'duration': timedelta(hours=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Active'),
+            'separators': 'line\u2028paragraph\u2029end',
+            'unicode': 'Привет',
+            'nested': [{'id': 1, 'tags': ('a', 'b')}],
+            1: 'int key',
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_parse_and_reject_malformed(self):
+        import io
+        from rest_framework.exceptions import ParseError
+
+        from core.parsers import FastJSONParser
+
+        parser = FastJSONParser()
+        assert parser.parse(io.BytesIO('{"name": "Иван", "n": 1.5}'.encode())) == {'name': 'Иван', 'n': 1.5}
+        for body in (b'{"name": ', b'{"n": NaN}', b'\xff'):
+            with pytest.raises(ParseError):
+                parser.parse(io.BytesIO(body))
@@ -0,0 +1,38 @@
+"""
+Upload handlers that compute a SHA-256 of each file while it is streamed.
+
+The digest is attached to the uploaded file as ``sha256`` and reused by
+core.FileBlob.objects.store(), so content-addressed storage doesn't need a
+second pass over the data.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class HashingUploadMixin:
+
+    def new_file(self, *args, **kwargs):
+        # Set before super(): the memory handler raises StopFutureHandlers
+        self.hasher = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # Both handlers see chunks the memory handler passes through, which is
+        # fine - each hashes the same data and only one produces the file
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    """In-memory upload handler that records the file's SHA-256."""
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    """Temporary-file upload handler that records the file's SHA-256."""
@@ -2,10 +2,12 @@
 URL configuration for core app.
 """
 from django.urls import path
-from .views import GlobalSearchView, SiteSettingsView, AdminSiteSettingsView, RegistrationView
+from .views import BackgroundJobView, GlobalSearchView, SiteSettingsView, AdminSiteSettingsView, RegistrationView, RenditionView
 
 urlpatterns = [
     path('search/', GlobalSearchView.as_view(), name='global-search'),
     path('settings/', SiteSettingsView.as_view(), name='site-settings'),
     path('register/', RegistrationView.as_view(), name='register'),
+    path('jobs/<int:pk>/', BackgroundJobView.as_view(), name='background-job'),
+    path('images/<int:width>/<str:fmt>/<path:source>', RenditionView.as_view(), name='image-rendition'),
 ]
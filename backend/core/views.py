@@ -1,7 +1,11 @@
 """
 Global search view for unified search across all entities.
 """
+from django.conf import settings as django_settings
+from django.core.files.storage import default_storage
 from django.db.models import Q
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -14,7 +18,13 @@ from apps.achievements.models import Achievement
 from apps.skills.models import Skill
 from apps.wiki.models import WikiPage, WikiSpace
 from apps.roles.permissions import CanManageRoles
-from .models import SiteSettings
+from .models import BackgroundJob, SiteSettings
+from .async_views import AsyncAPIView
+from .dbpool import PoolStatsUnavailable, get_pool_stats
+from .mixins import ReplicaReadMixin
+from .profiling import REPORT_ORDERINGS, get_buffer, get_top_endpoints
+from .serializers import BackgroundJobSerializer
+from .renditions import RENDITION_FORMATS, get_rendition, get_rendition_widths, is_rendition_source
 
 
 def extract_plain_text_from_editorjs(content):
@@ -39,7 +49,7 @@ def extract_plain_text_from_editorjs(content):
     return ' '.join(text_parts)
 
 
-class GlobalSearchView(APIView):
+class GlobalSearchView(ReplicaReadMixin, AsyncAPIView):
     """
     Global search across Users, News, Departments, Achievements, Skills, and Wiki.
 
@@ -47,10 +57,13 @@ class GlobalSearchView(APIView):
         q: search query (min 2 chars)
         type: filter by type (users, news, departments, achievements, skills, wiki)
         limit: results per category (default 5, max 20)
+
+    Async: each category is fetched with the async ORM, so under ASGI a slow
+    ILIKE scan doesn't hold a worker.
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         query = request.query_params.get('q', '').strip()
         search_type = request.query_params.get('type', None)
 
@@ -82,6 +95,7 @@ class GlobalSearchView(APIView):
                 Q(department__name__icontains=query) |
                 Q(position__name__icontains=query)
             ).select_related('department', 'position').distinct()[:limit]
+            users = [u async for u in users]
 
             results['users'] = [{
                 'id': u.id,
@@ -104,7 +118,7 @@ class GlobalSearchView(APIView):
             ).select_related('author')[:limit]
 
             news_results = []
-            for n in news:
+            async for n in news:
                 plain_text = extract_plain_text_from_editorjs(n.content)
                 description = plain_text[:150] + '...' if len(plain_text) > 150 else plain_text
                 news_results.append({
@@ -125,6 +139,7 @@ class GlobalSearchView(APIView):
                 Q(name__icontains=query) |
                 Q(description__icontains=query)
             )[:limit]
+            departments = [d async for d in departments]
 
             results['departments'] = [{
                 'id': d.id,
@@ -143,6 +158,7 @@ class GlobalSearchView(APIView):
                 Q(name__icontains=query) |
                 Q(description__icontains=query)
             )[:limit]
+            achievements = [a async for a in achievements]
 
             results['achievements'] = [{
                 'id': a.id,
@@ -160,7 +176,8 @@ class GlobalSearchView(APIView):
             skills = Skill.objects.filter(
                 Q(name__icontains=query) |
                 Q(description__icontains=query)
-            )[:limit]
+            ).select_related('category')[:limit]
+            skills = [s async for s in skills]
 
             results['skills'] = [{
                 'id': s.id,
@@ -180,8 +197,8 @@ class GlobalSearchView(APIView):
             accessible_spaces = WikiSpace.objects.filter(
                 Q(is_public=True) |
                 Q(owner=user) |
-                Q(department=user.department) |
-                Q(allowed_departments=user.department) |
+                Q(department=user.department_id) |
+                Q(allowed_departments=user.department_id) |
                 Q(allowed_roles__in=user.roles.all())
             ).distinct() if not user.is_superuser else WikiSpace.objects.all()
 
@@ -195,7 +212,7 @@ class GlobalSearchView(APIView):
             ).select_related('space', 'author')[:limit]
 
             wiki_results = []
-            for p in wiki_pages:
+            async for p in wiki_pages:
                 wiki_results.append({
                     'id': p.id,
                     'type': 'wiki',
@@ -355,3 +372,90 @@ class RegistrationView(APIView):
         if x_forwarded_for:
             return x_forwarded_for.split(',')[0].strip()
         return request.META.get('REMOTE_ADDR')
+
+
+class RenditionView(APIView):
+    """
+    Serve a responsive image variant, generating it on first request.
+
+    Redirects to the stored variant. Public like the rest of /media/, since
+    <img srcset> requests can't carry the JWT header.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, width, fmt, source):
+        if (
+            width not in get_rendition_widths()
+            or fmt not in RENDITION_FORMATS
+            or not is_rendition_source(source)
+        ):
+            raise Http404
+
+        try:
+            name = get_rendition(source, width, fmt)
+        except (FileNotFoundError, OSError):
+            raise Http404
+
+        response = HttpResponseRedirect(default_storage.url(name))
+        # Originals have unique names, so variants never change
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 30)
+        return response
+
+
+class ProfilingReportView(APIView):
+    """
+    Top endpoints by time or query count, aggregated by ProfilingMiddleware.
+
+    Query params: hours (default 24), order_by (see REPORT_ORDERINGS), limit (default 20).
+    """
+    permission_classes = [IsAuthenticated, CanManageRoles]
+
+    def get(self, request):
+        order_by = request.query_params.get('order_by', 'total_time')
+        if order_by not in REPORT_ORDERINGS:
+            return Response(
+                {'order_by': f'Must be one of: {", ".join(REPORT_ORDERINGS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            hours = max(1, int(request.query_params.get('hours', 24)))
+            limit = min(max(1, int(request.query_params.get('limit', 20))), 100)
+        except ValueError:
+            return Response({'detail': 'hours and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Include what this process measured but hasn't written yet
+        get_buffer().flush()
+        return Response({
+            'enabled': django_settings.PROFILING_ENABLED,
+            'hours': hours,
+            'order_by': order_by,
+            'results': get_top_endpoints(hours=hours, order_by=order_by, limit=limit),
+        })
+
+
+class DatabasePoolView(APIView):
+    """Connection pool size, usage and checkout latency from PgBouncer."""
+    permission_classes = [IsAuthenticated, CanManageRoles]
+
+    def get(self, request):
+        try:
+            stats = get_pool_stats()
+        except PoolStatsUnavailable as exc:
+            return Response({'enabled': False, 'detail': str(exc)})
+        return Response({'enabled': True, **stats})
+
+
+class BackgroundJobView(APIView):
+    """Status and progress of a background job started by the current user."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        jobs = BackgroundJob.objects.all()
+        if not request.user.is_superuser:
+            jobs = jobs.filter(created_by=request.user)
+        try:
+            job = jobs.get(pk=pk)
+        except BackgroundJob.DoesNotExist:
+            raise Http404
+        return Response(BackgroundJobSerializer(job).data)
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration.
+
+SERVER_MODE selects how Django is served:
+    wsgi (default) - sync workers running config.wsgi
+    asgi           - uvicorn workers running config.asgi; async views
+                     (notification unread count and stream, global search)
+                     then wait on the database without holding a worker
+"""
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+if SERVER_MODE == 'asgi':
+    # Uvicorn workers heartbeat from their event loop, so long-lived event
+    # streams don't hit the timeout
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'